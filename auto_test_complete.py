@@ -8,12 +8,11 @@ import os
 import sys
 import time
 import json
-import threading
 import subprocess
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import socketserver
 import webbrowser
 
+from schedule_optimizer.static import start_static_server
+
 PORT = 8081
 
 class ColoredOutput:
@@ -50,16 +49,7 @@ class ColoredOutput:
 
 def start_server():
     """Start HTTP server in background"""
-    handler = SimpleHTTPRequestHandler
-    handler.log_message = lambda *args: None  # Suppress logs
-    httpd = socketserver.TCPServer(("", PORT), handler)
-    httpd.allow_reuse_address = True
-    
-    thread = threading.Thread(target=httpd.serve_forever)
-    thread.daemon = True
-    thread.start()
-    
-    return httpd
+    return start_static_server(PORT)
 
 def test_balance_persistence_selenium():
     """Test using Selenium (requires webdriver)"""
@@ -9,17 +9,12 @@ import sys
 import time
 import json
 import subprocess
-import threading
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import socketserver
+
+from schedule_optimizer.static import start_static_server
 
 # Try different ports if one is in use
 PORTS_TO_TRY = [8082, 8083, 8084, 8085, 8086]
 
-class SilentHTTPHandler(SimpleHTTPRequestHandler):
-    def log_message(self, format, *args):
-        pass  # Suppress server logs
-
 def find_available_port():
     """Find an available port"""
     import socket
@@ -35,15 +30,7 @@ def find_available_port():
 
 def start_server(port):
     """Start HTTP server on given port"""
-    handler = SilentHTTPHandler
-    httpd = socketserver.TCPServer(("", port), handler)
-    httpd.allow_reuse_address = True
-    
-    thread = threading.Thread(target=httpd.serve_forever)
-    thread.daemon = True
-    thread.start()
-    
-    return httpd
+    return start_static_server(port)
 
 def run_playwright_test(port):
     """Run test using Playwright (lighter than Selenium)"""
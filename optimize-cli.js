@@ -0,0 +1,147 @@
+#!/usr/bin/env node
+// Headless optimizer runner - no browser or HTTP server required
+//
+// Usage:
+//   node optimize-cli.js config.json        - run the config in config.json
+//   node optimize-cli.js - < config.json     - read the config from stdin
+//   node optimize-cli.js                     - default config (the $90.50 -> $490.50 month)
+//
+// Options:
+//   --progress      stream progress reports to stderr as JSON lines
+//   --runs N        run the config N times and report timing stats (benchmark)
+//   --seed N        seed the optimizer (overrides config.seed); same config + seed, same result
+//   --profile       time each phase of the evolution loop (result.profile, and in --progress)
+//   --population    include finalPopulation in the output
+//   --telemetry F   write per-generation convergence telemetry to F as NDJSON
+//                   (config.telemetrySize records, 512 unless set)
+//   --log-level L   engine log level (overrides config.logLevel): silent, error, warn, info, debug
+//   --compact       print the result as a single line
+//
+// The config has the same shape index.html builds in runOptimization(),
+// including manualConstraints, engine, selectionMode and horizon. The result
+// is printed to stdout as JSON: the stats plus the formatted schedule.
+
+const fs = require('fs');
+const path = require('path');
+const { createOptimizer, serializeResult, ConvergenceTelemetry, LOG_LEVELS } = require(path.join(__dirname, 'optimizer.js'));
+
+function parseArgs(argv) {
+    const options = { configPath: null, progress: false, runs: 1, population: false, compact: false, seed: null, profile: false,
+                      telemetry: null, logLevel: null };
+    for (let i = 0; i < argv.length; i++) {
+        const arg = argv[i];
+        if (arg === '--progress') {
+            options.progress = true;
+        } else if (arg === '--runs') {
+            options.runs = parseInt(argv[++i]);
+            if (!(options.runs >= 1)) throw new Error('--runs needs a positive integer');
+        } else if (arg === '--seed') {
+            options.seed = Number(argv[++i]);
+            if (!Number.isSafeInteger(options.seed) || options.seed < 0) {
+                throw new Error('--seed needs a non-negative integer');
+            }
+        } else if (arg === '--profile') {
+            options.profile = true;
+        } else if (arg === '--telemetry') {
+            options.telemetry = argv[++i];
+            if (!options.telemetry) throw new Error('--telemetry needs a file name');
+        } else if (arg === '--log-level') {
+            options.logLevel = argv[++i];
+            if (!LOG_LEVELS.includes(options.logLevel)) {
+                throw new Error(`--log-level needs one of: ${LOG_LEVELS.join(', ')}`);
+            }
+        } else if (arg === '--population') {
+            options.population = true;
+        } else if (arg === '--compact') {
+            options.compact = true;
+        } else if (arg === '-h' || arg === '--help') {
+            options.help = true;
+        } else if (arg.startsWith('--')) {
+            throw new Error(`Unknown option: ${arg}`);
+        } else {
+            options.configPath = arg;
+        }
+    }
+    return options;
+}
+
+function readConfig(configPath) {
+    if (!configPath) return {};
+    const text = configPath === '-' ? fs.readFileSync(0, 'utf8') : fs.readFileSync(configPath, 'utf8');
+    return text.trim() ? JSON.parse(text) : {};
+}
+
+function toJSON(key, value) {
+    // Typed arrays (genes, finalPopulation) as plain arrays
+    return ArrayBuffer.isView(value) ? Array.from(value) : value;
+}
+
+async function runOnce(config, options) {
+    // manualConstraints is modified by the optimizer - give every run its own copy
+    const optimizer = createOptimizer(JSON.parse(JSON.stringify(config)));
+    const startTime = process.hrtime.bigint();
+    const result = await optimizer.optimize(options.progress ? (progress) => {
+        process.stderr.write(JSON.stringify({ type: 'progress', ...progress }) + '\n');
+    } : null);
+    result.computationTime = Number(process.hrtime.bigint() - startTime) / 1e9;
+    return result;
+}
+
+async function main() {
+    const options = parseArgs(process.argv.slice(2));
+    if (options.help) {
+        process.stdout.write(fs.readFileSync(__filename, 'utf8').split('\n').slice(1, 23).join('\n').replace(/^\/\/ ?/gm, '') + '\n');
+        return;
+    }
+
+    // The engine's debug output goes to console.log - keep stdout for JSON
+    console.log = (...args) => console.error(...args);
+
+    const config = readConfig(options.configPath);
+    if (options.seed !== null) {
+        config.seed = options.seed;
+    }
+    if (options.profile) {
+        config.profile = true;
+    }
+    if (options.logLevel) {
+        config.logLevel = options.logLevel;
+    }
+    if (options.telemetry && config.telemetrySize === undefined) {
+        config.telemetrySize = 512;
+    }
+    const results = [];
+    for (let run = 0; run < options.runs; run++) {
+        results.push(await runOnce(config, options));
+    }
+
+    const output = serializeResult(results[results.length - 1]);
+    output.computationTime = results[results.length - 1].computationTime;
+    output.peakMemory = process.resourceUsage().maxRSS * 1024; // Bytes, over every run
+    if (!options.population) {
+        delete output.finalPopulation;
+    }
+    if (options.telemetry) {
+        fs.writeFileSync(options.telemetry, ConvergenceTelemetry.toNDJSON(output.telemetry || []));
+    }
+    delete output.telemetry; // Up to telemetrySize records - a file, not part of the summary
+    if (options.runs > 1) {
+        const times = results.map(r => r.computationTime).sort((a, b) => a - b);
+        output.benchmark = {
+            runs: times.length,
+            meanTime: times.reduce((a, b) => a + b, 0) / times.length,
+            minTime: times[0],
+            medianTime: times[Math.floor(times.length / 2)],
+            maxTime: times[times.length - 1],
+            meanFitness: results.reduce((sum, r) => sum + r.bestFitness, 0) / results.length,
+            bestFitness: Math.min(...results.map(r => r.bestFitness))
+        };
+    }
+
+    process.stdout.write(JSON.stringify(output, toJSON, options.compact ? 0 : 2) + '\n');
+}
+
+main().catch(error => {
+    process.stderr.write(`Error: ${error.message}\n`);
+    process.exit(1);
+});
@@ -0,0 +1,92 @@
+// Optimizer Web Worker - runs the optimizer (see createOptimizer) off the main thread
+//
+// Messages in:
+//   { type: 'start', config }   - start an optimization run
+//   { type: 'start-island', config, islandIndex, migrationInterval, migrationSize }
+//                               - start one island of an island-model run
+//   { type: 'immigrants', chromosomes } - top individuals from neighbouring islands
+//   { type: 'cancel' }          - stop the current run after this generation
+// Messages out:
+//   { type: 'progress', generation, progress, bestFitness, workDays, balance, violations }
+//   { type: 'migrants', islandIndex, generation, chromosomes } - island mode only
+//   { type: 'result', result }  - result without functions, plus formattedSchedule
+//   { type: 'cancelled', generation }
+//   { type: 'error', message }
+
+importScripts('optimizer.js');
+
+let optimizer = null;
+let immigrants = [];
+
+// Zero-delay yield so queued 'cancel' messages are handled between generations
+// (setTimeout is clamped to 4ms+ once nested)
+const yieldChannel = new MessageChannel();
+let yieldResolve = null;
+yieldChannel.port1.onmessage = () => yieldResolve();
+
+function yieldToEventLoop() {
+    return new Promise(resolve => {
+        yieldResolve = resolve;
+        yieldChannel.port2.postMessage(null);
+    });
+}
+
+async function runOptimization(config, island = null) {
+    // Islands sharing a seed each draw from their own random stream
+    optimizer = createOptimizer(island ? { ...config, randomStream: island.islandIndex } : config);
+    immigrants = [];
+    let lastGeneration = 0;
+    let migration = null;
+
+    if (island) {
+        // Asynchronous migration: send our best, absorb whatever has arrived
+        migration = {
+            interval: island.migrationInterval,
+            exchange: async (population, generation) => {
+                self.postMessage({
+                    type: 'migrants',
+                    islandIndex: island.islandIndex,
+                    generation,
+                    chromosomes: population.slice(0, island.migrationSize).map(ind => ind.chromosome)
+                });
+                await yieldToEventLoop();
+                optimizer.acceptImmigrants(population, immigrants);
+                immigrants = [];
+            }
+        };
+    }
+
+    const result = await optimizer.optimize(async (progress) => {
+        lastGeneration = progress.generation;
+        self.postMessage({ type: 'progress', ...progress });
+        await yieldToEventLoop();
+    }, migration);
+
+    if (result.cancelled) {
+        self.postMessage({ type: 'cancelled', generation: lastGeneration });
+    } else {
+        self.postMessage({ type: 'result', result: serializeResult(result) });
+    }
+    optimizer = null;
+}
+
+self.onmessage = async (event) => {
+    const message = event.data;
+
+    if (message.type === 'start' || message.type === 'start-island') {
+        try {
+            await runOptimization(message.config, message.type === 'start-island' ? message : null);
+        } catch (error) {
+            optimizer = null;
+            self.postMessage({ type: 'error', message: error.message });
+        }
+    } else if (message.type === 'immigrants') {
+        if (optimizer) {
+            immigrants.push(...message.chromosomes);
+        }
+    } else if (message.type === 'cancel') {
+        if (optimizer) {
+            optimizer.cancel();
+        }
+    }
+};
@@ -0,0 +1,2638 @@
+// Monthly Financial Schedule Optimizer - genetic algorithm engine
+// Loaded by index.html via <script src>, by optimizer-worker.js via importScripts()
+// and by Node (optimize-cli.js) via require()
+
+// Gene alphabet - one small integer per day instead of a shift string.
+// Combinations are canonical (small < medium < large), so
+// 'large+medium' and 'medium+large' share the same code.
+const GENE = {
+    OFF: 0,
+    SMALL: 1,
+    MEDIUM: 2,
+    LARGE: 3,
+    SMALL_SMALL: 4,
+    SMALL_MEDIUM: 5,
+    SMALL_LARGE: 6,
+    MEDIUM_MEDIUM: 7,
+    MEDIUM_LARGE: 8,
+    LARGE_LARGE: 9
+};
+const GENE_COUNT = 10;
+const GENE_NAMES = [
+    null,              // Day off
+    'small',           // Single small shift
+    'medium',          // Single medium shift
+    'large',           // Single large shift
+    'small+small',     // Double small shifts
+    'small+medium',    // Small + medium shifts
+    'small+large',     // Small + large shifts
+    'medium+medium',   // Double medium shifts
+    'medium+large',    // Medium + large shifts
+    'large+large'      // Double large shifts
+];
+// GENE_PAIRS[a][b] - combined gene for two single-shift genes a and b
+const GENE_PAIRS = [
+    [GENE.OFF, GENE.SMALL, GENE.MEDIUM, GENE.LARGE],
+    [GENE.SMALL, GENE.SMALL_SMALL, GENE.SMALL_MEDIUM, GENE.SMALL_LARGE],
+    [GENE.MEDIUM, GENE.SMALL_MEDIUM, GENE.MEDIUM_MEDIUM, GENE.MEDIUM_LARGE],
+    [GENE.LARGE, GENE.SMALL_LARGE, GENE.MEDIUM_LARGE, GENE.LARGE_LARGE]
+];
+const SINGLE_GENES = { small: GENE.SMALL, medium: GENE.MEDIUM, large: GENE.LARGE };
+
+// Zobrist keys - one random 32-bit key per (day, gene). A chromosome's hash is
+// the XOR of its keys, so changing one gene updates the hash in O(1).
+// Fixed seed so every worker/island computes identical hashes. The key stream
+// only ever grows, so a day's keys are the same for every horizon length.
+let zobristTable = new Uint32Array(0);
+let zobristState = 0x9E3779B9;
+
+function zobristKeys(dayCount) {
+    // Keys for days 0..dayCount-1, indexed day * GENE_COUNT + gene
+    const length = dayCount * GENE_COUNT;
+    if (zobristTable.length < length) {
+        const keys = new Uint32Array(length);
+        keys.set(zobristTable);
+        for (let i = zobristTable.length; i < length; i++) {
+            // xorshift32
+            zobristState ^= zobristState << 13;
+            zobristState ^= zobristState >>> 17;
+            zobristState ^= zobristState << 5;
+            keys[i] = zobristState >>> 0;
+        }
+        zobristTable = keys;
+    }
+    return zobristTable;
+}
+
+// Seedable generator behind every random choice the optimizer makes -
+// xoshiro128** (Blackman & Vigna): 128 bits of state, period 2^128 - 1.
+// The seed is expanded with splitmix32; stream n starts n jumps of 2^64
+// draws in, so workers and islands sharing a seed never overlap.
+// The same seed and stream always give the same sequence.
+const XOSHIRO_JUMP = [0x8764000b, 0xf542d2d3, 0x6fa035c3, 0x77f2db5b];
+
+class SeededRandom {
+    constructor(seed, stream = 0) {
+        if (!Number.isSafeInteger(seed) || seed < 0) {
+            throw new Error(`seed must be a non-negative integer, got ${seed}`);
+        }
+        // splitmix32 over both halves of the seed
+        let x = (seed >>> 0) ^ Math.imul(Math.floor(seed / 4294967296), 0x85ebca6b);
+        const words = [];
+        for (let i = 0; i < 4; i++) {
+            x = (x + 0x9e3779b9) | 0;
+            let z = x;
+            z = Math.imul(z ^ (z >>> 16), 0x21f0aaad);
+            z = Math.imul(z ^ (z >>> 15), 0x735a2d97);
+            words.push(z ^ (z >>> 15)); // int32 - the state stays in small-integer fields
+        }
+        [this.s0, this.s1, this.s2, this.s3] = words;
+        for (let i = 0; i < stream; i++) {
+            this.jump();
+        }
+    }
+
+    nextUint32() {
+        const s1 = this.s1;
+        const scaled = Math.imul(s1, 5);
+        const result = Math.imul((scaled << 7) | (scaled >>> 25), 9) >>> 0;
+        const t = s1 << 9;
+        this.s2 ^= this.s0;
+        this.s3 ^= s1;
+        this.s1 ^= this.s2;
+        this.s0 ^= this.s3;
+        this.s2 ^= t;
+        this.s3 = (this.s3 << 11) | (this.s3 >>> 21);
+        return result;
+    }
+
+    next() {
+        // Uniform in [0, 1) - drop-in for Math.random()
+        return this.nextUint32() / 4294967296;
+    }
+
+    jump() {
+        // Advance 2^64 draws
+        let s0 = 0, s1 = 0, s2 = 0, s3 = 0;
+        for (const word of XOSHIRO_JUMP) {
+            for (let bit = 0; bit < 32; bit++) {
+                if (word & (1 << bit)) {
+                    s0 ^= this.s0;
+                    s1 ^= this.s1;
+                    s2 ^= this.s2;
+                    s3 ^= this.s3;
+                }
+                this.nextUint32();
+            }
+        }
+        this.s0 = s0;
+        this.s1 = s1;
+        this.s2 = s2;
+        this.s3 = s3;
+    }
+}
+
+// Where optimize() spends its time, for config.profile. Per-individual
+// operators are timed by wrapping the methods on one optimizer instance, so
+// an unprofiled run executes exactly the code it always has. Phases nest:
+// 'strategy' is inside 'evaluateFitness', which also runs inside 'init'.
+const PROFILE_PHASES = ['init', 'sort', 'selection', 'crossover', 'mutation', 'evaluateFitness', 'strategy', 'progress'];
+
+class PhaseProfiler {
+    constructor() {
+        this.calls = {};
+        this.totals = {};
+        for (const phase of PROFILE_PHASES) {
+            this.calls[phase] = 0;
+            this.totals[phase] = 0;
+        }
+    }
+
+    add(phase, start) {
+        this.calls[phase]++;
+        this.totals[phase] += performance.now() - start;
+    }
+
+    wrap(target, method, phase) {
+        const original = target[method];
+        const profiler = this;
+        target[method] = function (...args) {
+            const start = performance.now();
+            const result = original.apply(this, args);
+            profiler.add(phase, start);
+            return result;
+        };
+    }
+
+    report() {
+        // { phase: { calls, totalMs, meanMs } }
+        const report = {};
+        for (const phase of PROFILE_PHASES) {
+            const calls = this.calls[phase];
+            const totalMs = this.totals[phase];
+            report[phase] = { calls, totalMs, meanMs: calls > 0 ? totalMs / calls : 0 };
+        }
+        return report;
+    }
+}
+
+// Reorder values so values[k] is the k-th smallest, smaller ones before it
+// and larger ones after (Hoare partition, as selectFittest() uses)
+function selectKth(values, k) {
+    let lo = 0;
+    let hi = values.length - 1;
+    while (lo < hi) {
+        const pivot = values[(lo + hi) >> 1];
+        let i = lo;
+        let j = hi;
+        while (i <= j) {
+            while (values[i] < pivot) i++;
+            while (values[j] > pivot) j--;
+            if (i <= j) {
+                const tmp = values[i];
+                values[i] = values[j];
+                values[j] = tmp;
+                i++;
+                j--;
+            }
+        }
+        if (k <= j) {
+            hi = j;
+        } else if (k >= i) {
+            lo = i;
+        } else {
+            break;
+        }
+    }
+}
+
+// Per-generation convergence telemetry in a fixed number of slots
+// (config.telemetrySize; off unless set). Every stride-th generation is
+// recorded; when the slots fill up every other record is dropped and the
+// stride doubles, so a run of any length keeps between capacity/2 and
+// capacity evenly spaced generations in the memory allocated up front.
+// Diversity is the mean pairwise Hamming distance over the optimizable days,
+// as a fraction: 0 when every chromosome is the same, near 1 when random.
+const TELEMETRY_FIELDS = ['generation', 'best', 'median', 'worst', 'diversity', 'evaluations', 'cacheHits'];
+
+class ConvergenceTelemetry {
+    constructor(capacity = 512) {
+        this.capacity = Math.max(2, capacity);
+        this.columns = {};
+        for (const field of TELEMETRY_FIELDS) {
+            this.columns[field] = new Float64Array(this.capacity);
+        }
+        this.length = 0;
+        this.stride = 1;
+        this.fitnessValues = new Float64Array(0); // Scratch for the median
+        this.geneCounts = new Uint32Array(0);     // Per day and gene, for diversity
+    }
+
+    record(generation, population, firstDay, lastDay, evaluations, cacheHits) {
+        if (generation % this.stride !== 0) return;
+        if (this.length === this.capacity) {
+            this.downsample();
+            if (generation % this.stride !== 0) return;
+        }
+
+        // Best and worst in one pass, the median by quickselect - no sort
+        const n = population.length;
+        if (this.fitnessValues.length !== n) this.fitnessValues = new Float64Array(n);
+        const values = this.fitnessValues;
+        let best = Infinity;
+        let worst = -Infinity;
+        for (let i = 0; i < n; i++) {
+            const fitness = population[i].fitness.fitness;
+            values[i] = fitness;
+            if (fitness < best) best = fitness;
+            if (fitness > worst) worst = fitness;
+        }
+        const mid = n >> 1;
+        selectKth(values, mid);
+        let median = values[mid];
+        if (n % 2 === 0) {
+            // The other middle value is the largest of the lower half
+            let lower = values[0];
+            for (let i = 1; i < mid; i++) {
+                if (values[i] > lower) lower = values[i];
+            }
+            median = (lower + median) / 2;
+        }
+
+        const slot = this.length++;
+        const columns = this.columns;
+        columns.generation[slot] = generation;
+        columns.best[slot] = best;
+        columns.median[slot] = median;
+        columns.worst[slot] = worst;
+        columns.diversity[slot] = this.diversity(population, firstDay, lastDay);
+        columns.evaluations[slot] = evaluations;
+        columns.cacheHits[slot] = cacheHits === null ? NaN : cacheHits;
+    }
+
+    diversity(population, firstDay, lastDay) {
+        // Pairs that differ on a day, from the gene counts: n^2 - sum(count^2) ordered pairs.
+        // Counted one chromosome at a time, reading each one's genes in order.
+        const n = population.length;
+        if (n < 2 || lastDay < firstDay) return 0;
+        const size = (lastDay + 1) * GENE_COUNT;
+        if (this.geneCounts.length !== size) this.geneCounts = new Uint32Array(size);
+        const counts = this.geneCounts;
+        counts.fill(0);
+        for (let i = 0; i < n; i++) {
+            const chromosome = population[i].chromosome;
+            for (let day = firstDay; day <= lastDay; day++) {
+                counts[day * GENE_COUNT + chromosome[day]]++;
+            }
+        }
+        let same = 0;
+        for (let slot = firstDay * GENE_COUNT; slot < size; slot++) {
+            same += counts[slot] * counts[slot];
+        }
+        const days = lastDay - firstDay + 1;
+        return (n * n * days - same) / (n * (n - 1) * days);
+    }
+
+    downsample() {
+        // Keep records 0, 2, 4, ... - the generations that are multiples of the doubled stride
+        for (const field of TELEMETRY_FIELDS) {
+            const column = this.columns[field];
+            for (let i = 0; 2 * i < this.length; i++) {
+                column[i] = column[2 * i];
+            }
+        }
+        this.length = Math.ceil(this.length / 2);
+        this.stride *= 2;
+    }
+
+    toArray() {
+        // [{ generation, best, median, worst, diversity, evaluations, cacheHits }], oldest first
+        const records = [];
+        for (let i = 0; i < this.length; i++) {
+            const record = {};
+            for (const field of TELEMETRY_FIELDS) {
+                const value = this.columns[field][i];
+                record[field] = Number.isNaN(value) ? null : value;
+            }
+            records.push(record);
+        }
+        return records;
+    }
+
+    static toNDJSON(records) {
+        // One JSON object per line - result.telemetry as written by --telemetry and the browser export
+        return records.map(record => JSON.stringify(record) + '\n').join('');
+    }
+}
+
+// Leveled logger, chosen once per run from config.logLevel ('silent', 'error',
+// 'warn' - the default - 'info' or 'debug'). Records are structured: an event
+// name and a plain object of fields, handed to config.logSink(level, event,
+// fields) or printed as one line each. Disabled levels are a shared no-op,
+// and callers wrap anything costly to build in `if (logger.debugEnabled)`, so
+// a quiet run pays for neither the message nor the console.
+const LOG_LEVELS = ['silent', 'error', 'warn', 'info', 'debug'];
+
+function consoleLogSink(level, event, fields) {
+    const line = fields === undefined ? `[${level}] ${event}` : `[${level}] ${event} ${JSON.stringify(fields)}`;
+    if (level === 'error') {
+        console.error(line);
+    } else if (level === 'warn') {
+        console.warn(line);
+    } else {
+        console.log(line);
+    }
+}
+
+function ignoreLog() {}
+
+class Logger {
+    constructor(level = 'warn', sink = consoleLogSink) {
+        const rank = LOG_LEVELS.indexOf(level);
+        if (rank < 0) {
+            throw new Error(`Unknown log level: ${level}`);
+        }
+        this.level = level;
+        this.sink = sink;
+        this.debugEnabled = rank >= LOG_LEVELS.indexOf('debug');
+        this.error = rank >= 1 ? (event, fields) => sink('error', event, fields) : ignoreLog;
+        this.warn = rank >= 2 ? (event, fields) => sink('warn', event, fields) : ignoreLog;
+        this.info = rank >= 3 ? (event, fields) => sink('info', event, fields) : ignoreLog;
+        this.debug = rank >= 4 ? (event, fields) => sink('debug', event, fields) : ignoreLog;
+    }
+}
+
+// Fitness validation (config.fitnessValidation): 'all' checks every
+// evaluation, 'sampled' every nth, 'first' only the first n, 'off' none.
+// Either a mode name or { mode, n }.
+const VALIDATION_MODES = { all: 1, sampled: 100, first: 1000, off: 0 };
+
+// Calendar months for config.horizon = { start: 'YYYY-MM', months }. Without a
+// horizon the planner works on a single 30-day month, as it always has.
+// Days are numbered 1..days across the whole horizon.
+function buildCalendar(horizon) {
+    const months = [];
+    if (!horizon) {
+        months.push({ label: null, firstDay: 1, length: 30 });
+    } else {
+        const [year, month] = String(horizon.start).split('-').map(Number);
+        if (!year || !month || month < 1 || month > 12) {
+            throw new Error(`Invalid horizon start: ${horizon.start} (expected 'YYYY-MM')`);
+        }
+        const count = horizon.months || 1;
+        let firstDay = 1;
+        for (let i = 0; i < count; i++) {
+            const y = year + Math.floor((month - 1 + i) / 12);
+            const m = (month - 1 + i) % 12 + 1;
+            const length = new Date(Date.UTC(y, m, 0)).getUTCDate();
+            months.push({ label: `${y}-${String(m).padStart(2, '0')}`, firstDay, length });
+            firstDay += length;
+        }
+    }
+    
+    const last = months[months.length - 1];
+    return { months, days: last.firstDay + last.length - 1 };
+}
+
+// Bounded LRU fitness cache keyed by Zobrist hash.
+// Set-associative: a hash maps to one set of CACHE_WAYS slots and a miss
+// evicts the least recently used slot of that set. Everything lives in
+// preallocated typed arrays, so lookups allocate nothing and the cache never
+// grows past its capacity.
+const CACHE_WAYS = 4;
+
+class FitnessCache {
+    constructor(capacity, geneLength = 31) {
+        // Round up to a power-of-two number of sets so (hash & setMask) picks a set
+        let sets = 1;
+        while (sets * CACHE_WAYS < capacity) sets <<= 1;
+        this.setMask = sets - 1;
+        this.capacity = sets * CACHE_WAYS;
+        this.geneLength = geneLength;
+        this.keys = new Uint32Array(this.capacity);
+        this.lastUsed = new Float64Array(this.capacity); // 0 = empty slot
+        this.genes = new Uint8Array(this.capacity * geneLength); // Copy of each cached chromosome
+        this.records = new Array(this.capacity).fill(null);
+        this.clock = 0;
+        this.size = 0;
+        this.hits = 0;
+        this.misses = 0;
+        this.evictions = 0;
+    }
+    
+    get(hash, chromosome) {
+        const base = (hash & this.setMask) * CACHE_WAYS;
+        for (let slot = base; slot < base + CACHE_WAYS; slot++) {
+            if (this.lastUsed[slot] !== 0 && this.keys[slot] === hash && this.sameGenes(slot, chromosome)) {
+                this.lastUsed[slot] = ++this.clock;
+                this.hits++;
+                return this.records[slot];
+            }
+        }
+        this.misses++;
+        return undefined;
+    }
+    
+    set(hash, chromosome, fitness) {
+        const base = (hash & this.setMask) * CACHE_WAYS;
+        let victim = base;
+        for (let slot = base + 1; slot < base + CACHE_WAYS; slot++) {
+            if (this.lastUsed[slot] < this.lastUsed[victim]) victim = slot;
+        }
+        
+        if (this.lastUsed[victim] === 0) {
+            this.size++;
+        } else {
+            this.evictions++;
+        }
+        
+        this.keys[victim] = hash;
+        this.lastUsed[victim] = ++this.clock;
+        this.genes.set(chromosome, victim * this.geneLength);
+        this.records[victim] = fitness;
+    }
+    
+    sameGenes(slot, chromosome) {
+        // Guards against hash collisions
+        const offset = slot * this.geneLength;
+        for (let i = 0; i < this.geneLength; i++) {
+            if (this.genes[offset + i] !== chromosome[i]) return false;
+        }
+        return true;
+    }
+    
+    getStats() {
+        const lookups = this.hits + this.misses;
+        return {
+            hits: this.hits,
+            misses: this.misses,
+            evictions: this.evictions,
+            size: this.size,
+            capacity: this.capacity,
+            hitRate: lookups > 0 ? this.hits / lookups : 0
+        };
+    }
+}
+
+function toCents(amount) {
+    return Math.round(amount * 100);
+}
+
+// Min-prefix segment tree over the daily net cash flow (in cents) of the
+// optimizable days. Each node stores the sum of its days and the lowest
+// running balance reached inside them, so changing one day is O(log n), the
+// minimum balance is read from the root, and days below a threshold are
+// counted by descending only into subtrees whose minimum is below it.
+class BalanceTree {
+    constructor(leafCount, nodes = null) {
+        let size = 1;
+        while (size < leafCount) size <<= 1;
+        this.size = size;
+        this.leafCount = leafCount;
+        // One buffer per tree keeps clone() to a single copy: node sums in
+        // [0, 2*size), minimum prefixes in [2*size, 4*size). A plain array of
+        // doubles, because V8 copies those far faster than a Float64Array.
+        this.minOffset = 2 * size;
+        if (nodes) {
+            this.nodes = nodes;
+        } else {
+            this.nodes = new Array(4 * size).fill(0);
+            this.nodes.fill(Infinity, this.minOffset); // Padding leaves never reach a minimum
+        }
+    }
+    
+    setLeaf(index, flow) {
+        const leaf = this.size + index;
+        this.nodes[leaf] = flow;
+        this.nodes[this.minOffset + leaf] = flow;
+    }
+    
+    build() {
+        for (let node = this.size - 1; node >= 1; node--) {
+            this.pull(node);
+        }
+    }
+    
+    update(index, flow) {
+        this.setLeaf(index, flow);
+        for (let node = (this.size + index) >> 1; node >= 1; node >>= 1) {
+            this.pull(node);
+        }
+    }
+    
+    updateMany(indices, count) {
+        // Batched update() for leaves whose flows were already set with
+        // setLeaf(). `indices` (ascending, overwritten) - each dirty ancestor
+        // is pulled once, so the cost never exceeds a full build().
+        for (let i = 0; i < count; i++) {
+            indices[i] += this.size;
+        }
+        while (count > 0 && indices[0] > 1) {
+            let parents = 0;
+            for (let i = 0; i < count; i++) {
+                const parent = indices[i] >> 1;
+                if (parents === 0 || indices[parents - 1] !== parent) {
+                    indices[parents++] = parent;
+                    this.pull(parent);
+                }
+            }
+            count = parents;
+        }
+    }
+    
+    pull(node) {
+        const nodes = this.nodes;
+        const left = node << 1;
+        const right = left | 1;
+        nodes[node] = nodes[left] + nodes[right];
+        nodes[this.minOffset + node] = Math.min(nodes[this.minOffset + left], nodes[left] + nodes[this.minOffset + right]);
+    }
+    
+    total() {
+        return this.nodes[1];
+    }
+    
+    min() {
+        return this.nodes[this.minOffset + 1];
+    }
+    
+    prefixSum(index) {
+        // Running balance change at the end of leaf `index`
+        let sum = 0;
+        let node = 1;
+        let lo = 0;
+        let hi = this.size - 1;
+        while (node < this.size) {
+            const mid = (lo + hi) >> 1;
+            if (index <= mid) {
+                node = node << 1;
+                hi = mid;
+            } else {
+                sum += this.nodes[node << 1];
+                node = (node << 1) | 1;
+                lo = mid + 1;
+            }
+        }
+        return sum + this.nodes[node];
+    }
+    
+    countBelow(threshold, node = 1, offset = 0) {
+        // Number of days whose running balance change is below threshold
+        if (offset + this.nodes[this.minOffset + node] >= threshold) return 0;
+        if (node >= this.size) return 1;
+        const left = node << 1;
+        return this.countBelow(threshold, left, offset) +
+               this.countBelow(threshold, left | 1, offset + this.nodes[left]);
+    }
+    
+    clone() {
+        return new BalanceTree(this.leafCount, this.nodes.slice());
+    }
+}
+
+// Parent selection modes for config.selectionMode
+const SELECTION_MODES = ['tournament', 'sus', 'rank'];
+const RANK_SELECTION_PRESSURE = 1.5; // Best rank is picked 1.5x as often as the median
+
+function byFitness(a, b) {
+    return a.fitness.fitness - b.fitness.fitness;
+}
+
+// Partial selection: rearranges population in place so its first k entries
+// are the k fittest individuals, in order, and everything after them is no
+// fitter. Quickselect with a median-of-three pivot, then a sort of just the
+// k-prefix - O(n + k log k) instead of sorting the whole population.
+function selectFittest(population, k) {
+    k = Math.min(k, population.length);
+    let lo = 0;
+    let hi = population.length - 1;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        const a = population[lo].fitness.fitness;
+        const b = population[mid].fitness.fitness;
+        const c = population[hi].fitness.fitness;
+        const pivot = a < b ? (b < c ? b : (a < c ? c : a)) : (a < c ? a : (b < c ? c : b));
+        
+        // Hoare partition around the pivot value
+        let i = lo;
+        let j = hi;
+        while (i <= j) {
+            while (population[i].fitness.fitness < pivot) i++;
+            while (population[j].fitness.fitness > pivot) j--;
+            if (i <= j) {
+                const tmp = population[i];
+                population[i] = population[j];
+                population[j] = tmp;
+                i++;
+                j--;
+            }
+        }
+        
+        // Continue only in the side that contains the k-th boundary
+        if (k - 1 <= j) {
+            hi = j;
+        } else if (k - 1 >= i) {
+            lo = i;
+        } else {
+            break;
+        }
+    }
+    
+    const fittest = population.slice(0, k).sort(byFitness);
+    for (let i = 0; i < k; i++) {
+        population[i] = fittest[i];
+    }
+    return population;
+}
+
+// Enhanced Genetic Algorithm Implementation based on TypeScript version
+class ImprovedGeneticOptimizer {
+    constructor(config = {}) {
+        this.engine = 'genetic';
+        // A $0 balance is a real balance - only missing or blank inputs fall back
+        this.startingBalance = Number.isFinite(config.startingBalance) ? config.startingBalance : 90.50;
+        this.targetEndingBalance = Number.isFinite(config.targetEndingBalance) ? config.targetEndingBalance : 490.50;
+        this.minimumBalance = config.minimumBalance || 0;
+        this.populationSize = config.populationSize || 200;
+        this.generations = config.generations || 1000;
+        
+        // Planning horizon - chromosomes hold one gene per day, index 0 unused
+        this.calendar = buildCalendar(config.horizon);
+        this.horizonDays = this.calendar.days;
+        this.zobristKeys = zobristKeys(this.horizonDays + 1);
+        
+        this.mutationRate = 0.15;
+        this.eliteSize = Math.max(30, Math.floor(this.populationSize * 0.2)); // 20% elite to preserve good solutions
+        this.tournamentSize = 7;
+        this.selectionMode = config.selectionMode || 'tournament';
+        if (!SELECTION_MODES.includes(this.selectionMode)) {
+            throw new Error(`Unknown selection mode: ${this.selectionMode}`);
+        }
+        this.parentPool = []; // Parents drawn up front by 'sus' and ranked population for 'rank'
+        this.parentPoolIndex = 0;
+        this.cancelRequested = false;
+        
+        // Every random choice draws from this.rng, so config.seed makes a run
+        // repeatable. Unseeded runs pick a seed here and report it in the result.
+        // config.randomStream gives islands/workers sharing a seed their own stream.
+        this.seed = config.seed !== undefined && config.seed !== null ?
+            config.seed : Math.floor(Math.random() * 4294967296);
+        this.rng = new SeededRandom(this.seed, config.randomStream || 0);
+        // Logging and fitness validation are fixed for the run - see Logger and
+        // VALIDATION_MODES. config.debugFitness is the old switch for 'debug'.
+        this.logger = new Logger(config.logLevel || (config.debugFitness ? 'debug' : 'warn'), config.logSink);
+        // Run statistics for benchmarks - see createResult()
+        this.evaluations = 0;
+        this.generationsRun = 0;
+        this.firstFeasibleGeneration = null;
+        // Best/median/worst fitness, diversity and evaluations per generation, in fixed memory
+        this.telemetry = config.telemetrySize > 0 ? new ConvergenceTelemetry(config.telemetrySize) : null;
+        
+        // Warm start: chromosomes kept from a previous run (result.finalPopulation)
+        this.seedPopulation = config.seedPopulation || null;
+        this.retainedPopulationSize = config.retainedPopulationSize !== undefined ?
+            config.retainedPopulationSize : this.eliteSize;
+        
+        // Fitness memoization - set fitnessCacheSize to 0 to disable
+        const fitnessCacheSize = config.fitnessCacheSize !== undefined ? config.fitnessCacheSize : 4096;
+        this.fitnessCache = fitnessCacheSize > 0 ? new FitnessCache(fitnessCacheSize, this.horizonDays + 1) : null;
+        this.offspringHash = 0; // Hash of the chromosome last produced by crossover()/mutate()
+        
+        // Initialize Strategy Pattern fitness manager
+        this.fitnessManager = new FitnessManager({ logger: this.logger, validation: config.fitnessValidation });
+        
+        // Per-phase timings (config.profile) - reported with progress and in the result
+        this.profiler = config.profile ? new PhaseProfiler() : null;
+        if (this.profiler) {
+            this.profiler.wrap(this, 'prepareSelection', 'selection');
+            this.profiler.wrap(this, 'selectParent', 'selection');
+            this.profiler.wrap(this, 'crossover', 'crossover');
+            this.profiler.wrap(this, 'mutate', 'mutation');
+            this.profiler.wrap(this, 'evaluateFitness', 'evaluateFitness');
+            this.profiler.wrap(this.fitnessManager, 'evaluateChromosome', 'strategy');
+        }
+        
+        // Manual constraints for regeneration
+        this.manualConstraints = config.manualConstraints || {};
+        
+        // Balance edit handling
+        this.balanceEditDay = this.manualConstraints.balanceEditDay || null;
+        this.newStartingBalance = this.manualConstraints.newStartingBalance || null;
+        
+        // If there's a balance edit, we're only optimizing from the day AFTER the edit
+        if (this.balanceEditDay) {
+            this.startDay = this.balanceEditDay + 1;  // Start AFTER the balance edit day
+            this.effectiveStartingBalance = this.newStartingBalance;
+            // Balance edit mode configured
+        } else {
+            this.startDay = 1;
+            this.effectiveStartingBalance = this.startingBalance;
+        }
+        
+        // Define shifts
+        this.shifts = {
+            large: { gross: 94.50, net: 86.50 },
+            medium: { gross: 75.50, net: 67.50 },
+            small: { gross: 64.00, net: 56.00 }
+        };
+
+        // Precompute per-gene earnings so the hot loops never touch strings
+        this.geneNet = new Float64Array(GENE_COUNT);
+        this.geneGross = new Float64Array(GENE_COUNT);
+        this.geneShiftLists = GENE_NAMES.map(name => name ? name.split('+') : []);
+        for (let gene = 0; gene < GENE_COUNT; gene++) {
+            for (let shift of this.geneShiftLists[gene]) {
+                this.geneNet[gene] += this.shifts[shift].net;
+                this.geneGross[gene] += this.shifts[shift].gross;
+            }
+        }
+
+        // Define all expenses
+        this.expenses = [
+            { day: 1, name: "Auto Insurance", amount: 177 },
+            { day: 2, name: "YouTube Premium", amount: 8 },
+            { day: 5, name: "Groceries", amount: 112.50 },
+            { day: 5, name: "Weed", amount: 20 },
+            { day: 8, name: "Paramount Plus", amount: 12 },
+            { day: 8, name: "iPad AppleCare", amount: 8.49 },
+            { day: 10, name: "Streaming Services", amount: 230 },
+            { day: 11, name: "Cat Food", amount: 40 },
+            { day: 12, name: "Groceries", amount: 112.50 },
+            { day: 12, name: "Weed", amount: 20 },
+            { day: 14, name: "iPad AppleCare", amount: 8.49 },
+            { day: 16, name: "Cat Food", amount: 40 },
+            { day: 17, name: "Car Payment", amount: 463 },
+            { day: 19, name: "Groceries", amount: 112.50 },
+            { day: 19, name: "Weed", amount: 20 },
+            { day: 22, name: "Cell Phone", amount: 177 },
+            { day: 23, name: "Cat Food", amount: 40 },
+            { day: 24, name: "AI Subscription", amount: 220 },
+            { day: 25, name: "Electric", amount: 139 },
+            { day: 25, name: "Ring Subscription", amount: 10 },
+            { day: 26, name: "Groceries", amount: 112.50 },
+            { day: 26, name: "Weed", amount: 20 },
+            { day: 28, name: "iPhone AppleCare", amount: 13.49 },
+            { day: 29, name: "Internet", amount: 30 },
+            { day: 29, name: "Cat Food", amount: 40 },
+            { day: 30, name: "Rent", amount: 1636 }
+        ];
+        
+        // Mom deposits
+        this.momDeposits = [
+            { day: 11, amount: 1356 },
+            { day: 25, amount: 1356 }
+        ];
+        
+        // Preprocess data - the monthly bills and deposits repeat in every
+        // month of the horizon, moved to the last day in shorter months
+        this.expensesByDay = new Array(this.horizonDays + 1).fill(0);
+        this.depositsByDay = new Array(this.horizonDays + 1).fill(0);
+        
+        for (const month of this.calendar.months) {
+            for (let exp of this.expenses) {
+                this.expensesByDay[month.firstDay + Math.min(exp.day, month.length) - 1] += exp.amount;
+            }
+            
+            for (let dep of this.momDeposits) {
+                this.depositsByDay[month.firstDay + Math.min(dep.day, month.length) - 1] = dep.amount;
+            }
+        }
+        
+        // Apply manual expense constraints
+        if (this.manualConstraints) {
+            Object.keys(this.manualConstraints).forEach(day => {
+                const dayNum = parseInt(day);
+                if (this.manualConstraints[day].fixedExpenses !== undefined) {
+                    this.expensesByDay[dayNum] = this.manualConstraints[day].fixedExpenses;
+                }
+            });
+        }
+        
+        // Process balance constraints to determine required earnings
+        this.processBalanceConstraints();
+
+        // Encode constrained shifts once (0 = off or unconstrained)
+        this.constraintGenes = new Uint8Array(this.horizonDays + 1);
+        for (let day = 1; day <= this.horizonDays; day++) {
+            if (this.manualConstraints[day] && this.manualConstraints[day].shifts) {
+                this.constraintGenes[day] = this.encodeShifts(this.manualConstraints[day].shifts);
+            }
+        }
+
+        // Calculate requirements
+        // If we have a balance edit, only calculate expenses from that day forward
+        let relevantExpenses = 0;
+        let relevantMomIncome = 0;
+        
+        if (this.balanceEditDay) {
+            // Only count expenses and income from AFTER the edit day
+            for (let d = this.balanceEditDay + 1; d <= this.horizonDays; d++) {
+                relevantExpenses += this.expensesByDay[d] || 0;
+                relevantMomIncome += this.depositsByDay[d] || 0;
+            }
+            this.requiredFlexNet = relevantExpenses + this.targetEndingBalance - this.effectiveStartingBalance - relevantMomIncome;
+            
+            // Log the calculation for debugging
+            // Balance edit calculation completed
+            
+            // Ensure we have a reasonable minimum
+            if (this.requiredFlexNet < 0) {
+                this.logger.warn('required earnings negative, using 0', { requiredFlexNet: this.requiredFlexNet });
+                this.requiredFlexNet = 0;
+            }
+        } else {
+            // Normal calculation for the full horizon
+            const totalExpenses = this.expensesByDay.reduce((sum, exp) => sum + exp, 0);
+            const totalMomIncome = this.depositsByDay.reduce((sum, dep) => sum + dep, 0);
+            this.requiredFlexNet = totalExpenses + this.targetEndingBalance - this.startingBalance - totalMomIncome;
+        }
+        
+        // Crisis classification, constraint masks and work-day requirements,
+        // shared by every operator
+        this.plan = this.compilePlan();
+        
+        // Cash-flow tables for evaluateFitness(), in integer cents so the
+        // incremental and from-scratch paths agree exactly
+        this.minimumBalanceCents = this.minimumBalance * 100;
+        this.geneNetCents = new Float64Array(GENE_COUNT);
+        for (let gene = 0; gene < GENE_COUNT; gene++) {
+            this.geneNetCents[gene] = toCents(this.geneNet[gene]);
+        }
+        this.baseFlowCents = new Float64Array(this.horizonDays + 1);
+        this.freeBalanceConstraints = [];
+        for (let day = this.startDay; day <= this.horizonDays; day++) {
+            this.baseFlowCents[day] = toCents(this.depositsByDay[day] || 0) - toCents(this.expensesByDay[day]);
+            if (this.manualConstraints[day] && this.manualConstraints[day].fixedBalance !== undefined) {
+                this.freeBalanceConstraints.push({ index: day - this.startDay, balance: this.manualConstraints[day].fixedBalance });
+            }
+        }
+        this.lockedPrefix = this.computeLockedPrefix();
+        this.changedLeaves = new Int32Array(this.horizonDays + 1); // Scratch for BalanceTree.updateMany()
+        
+        // Strategy context reused by every evaluateFitness() call; the
+        // per-run fields are set once here
+        this.fitnessContext = {
+            balance: 0,
+            workDays: 0,
+            violations: 0,
+            totalEarnings: 0,
+            minBalance: 0,
+            workDaysAfterEdit: 0,
+            consecutiveDays: 0,
+            gapMean: 0,
+            gapVariance: 0,
+            inCrisisMode: this.plan.inCrisisMode,
+            minWorkDaysNeeded: this.plan.minWorkDaysNeeded,
+            targetEndingBalance: this.targetEndingBalance,
+            minimumBalance: this.minimumBalance,
+            requiredFlexNet: this.requiredFlexNet,
+            balanceEditDay: this.balanceEditDay
+        };
+        
+        // ImprovedGeneticOptimizer initialized
+    }
+    
+    processBalanceConstraints() {
+        if (!this.manualConstraints) return;
+        
+        // Find days with fixed balance constraints
+        const balanceConstraints = [];
+        Object.keys(this.manualConstraints).forEach(day => {
+            const dayNum = parseInt(day);
+            if (this.manualConstraints[day].fixedBalance !== undefined) {
+                balanceConstraints.push({
+                    day: dayNum,
+                    balance: this.manualConstraints[day].fixedBalance
+                });
+            }
+        });
+        
+        // Sort by day
+        balanceConstraints.sort((a, b) => a.day - b.day);
+        
+        // One pass over the days: at each balance constraint, derive the
+        // earnings needed from the running balance of the days before it
+        let prevBalance = this.startingBalance;
+        let next = 0;
+        for (let d = 1; d <= this.horizonDays && next < balanceConstraints.length; d++) {
+            const constraint = this.manualConstraints[d];
+            
+            if (balanceConstraints[next].day === d) {
+                const targetBalance = balanceConstraints[next].balance;
+                next++;
+                
+                // Calculate required earnings for this day
+                const deposit = this.depositsByDay[d] || 0;
+                const expenses = this.expensesByDay[d] || 0;
+                const requiredEarnings = targetBalance - prevBalance - deposit + expenses;
+                
+                // Only set earnings constraint if we don't already have one
+                if (!constraint.shifts && constraint.fixedEarnings === undefined) {
+                    // Find the best shift combination to match required earnings
+                    if (requiredEarnings <= 0) {
+                        constraint.shifts = null; // Day off
+                    } else if (Math.abs(requiredEarnings - 56) < 5) {
+                        constraint.shifts = 'small';
+                    } else if (Math.abs(requiredEarnings - 67.5) < 5) {
+                        constraint.shifts = 'medium';
+                    } else if (Math.abs(requiredEarnings - 86.5) < 5) {
+                        constraint.shifts = 'large';
+                    } else if (Math.abs(requiredEarnings - 112) < 5) {
+                        constraint.shifts = 'small+small';
+                    } else if (Math.abs(requiredEarnings - 123.5) < 5) {
+                        constraint.shifts = 'small+medium';
+                    } else if (Math.abs(requiredEarnings - 135) < 5) {
+                        constraint.shifts = 'medium+medium';
+                    } else {
+                        // Use fixed earnings if no shift matches well
+                        constraint.fixedEarnings = requiredEarnings;
+                    }
+                }
+            }
+            
+            // Add any existing shifts (if already constrained)
+            if (constraint && constraint.shifts) {
+                prevBalance += this.geneNet[this.encodeShifts(constraint.shifts)];
+            } else if (constraint && constraint.fixedEarnings !== undefined) {
+                prevBalance += constraint.fixedEarnings;
+            }
+            
+            // Add deposits and subtract expenses
+            prevBalance += this.depositsByDay[d] || 0;
+            prevBalance -= this.expensesByDay[d] || 0;
+        }
+    }
+
+    encodeShifts(shifts) {
+        // 'medium+large', 'large+medium', 'Large' -> canonical gene code
+        if (!shifts) return GENE.OFF;
+        let gene = GENE.OFF;
+        for (let shift of shifts.toLowerCase().split('+')) {
+            const single = SINGLE_GENES[shift.trim()];
+            if (single === undefined || gene > GENE.LARGE) {
+                throw new Error(`Unsupported shift combination: ${shifts}`);
+            }
+            gene = GENE_PAIRS[gene][single];
+        }
+        return gene;
+    }
+
+    decodeGene(gene) {
+        return GENE_NAMES[gene];
+    }
+
+    decodeChromosome(chromosome) {
+        const schedule = new Array(this.horizonDays + 1).fill(null);
+        for (let day = 1; day <= this.horizonDays; day++) {
+            schedule[day] = GENE_NAMES[chromosome[day]];
+        }
+        return schedule;
+    }
+
+    compilePlan() {
+        // Everything the operators need that depends only on the config,
+        // computed once per run instead of per chromosome, gene or evaluation
+        const startDay = this.startDay;
+        const days = this.horizonDays;
+        const availableDays = days + 1 - startDay;
+        
+        // Per-day masks (index = day)
+        const lockedMask = new Uint8Array(days + 1);     // Before startDay - comes from constraints, not the chromosome
+        const constraintMask = new Uint8Array(days + 1); // Any manual constraint - never mutated
+        const presetMask = new Uint8Array(days + 1);     // Gene fixed by 'shifts' or 'fixedEarnings'
+        const presetGenes = new Uint8Array(days + 1);
+        const mutableDays = [];
+        for (let day = 1; day <= days; day++) {
+            const constraint = this.manualConstraints[day];
+            if (day < startDay) lockedMask[day] = 1;
+            if (constraint) {
+                constraintMask[day] = 1;
+                if (constraint.shifts !== undefined) {
+                    presetGenes[day] = this.constraintGenes[day];
+                    presetMask[day] = 1;
+                } else if (constraint.fixedEarnings !== undefined) {
+                    presetGenes[day] = this.geneForEarnings(constraint.fixedEarnings);
+                    presetMask[day] = 1;
+                }
+            } else if (day >= startDay) {
+                mutableDays.push(day);
+            }
+        }
+        
+        // Crisis mode - when a large shift on every available day isn't enough
+        const inCrisisMode = this.requiredFlexNet > availableDays * this.shifts.large.net;
+        const impossibleTarget = this.requiredFlexNet > availableDays * this.geneNet[GENE.LARGE_LARGE];
+        
+        // Work days needed to cover requiredFlexNet
+        const avgDoubleShiftEarnings = (this.geneNet[GENE.LARGE_LARGE] + this.geneNet[GENE.MEDIUM_LARGE] +
+                                        this.geneNet[GENE.MEDIUM_MEDIUM]) / 3;
+        const doubleShiftDaysNeeded = Math.ceil(this.requiredFlexNet / avgDoubleShiftEarnings);
+        let minWorkDaysNeeded;
+        if (inCrisisMode) {
+            // Work 90% of days minimum in crisis, never more than are available
+            minWorkDaysNeeded = Math.min(availableDays, Math.max(Math.floor(availableDays * 0.9), doubleShiftDaysNeeded));
+        } else {
+            minWorkDaysNeeded = Math.ceil(this.requiredFlexNet / this.shifts.large.net);
+        }
+        
+        // Work probability for randomly generated normal-mode chromosomes
+        const avgEarnings = (this.shifts.large.net + this.shifts.medium.net + this.shifts.small.net) / 3;
+        const estimatedWorkDays = Math.ceil(this.requiredFlexNet / avgEarnings);
+        
+        return Object.freeze({
+            startDay,
+            availableDays,
+            lockedMask,
+            constraintMask,
+            presetMask,
+            presetGenes,
+            mutableDays: Uint16Array.from(mutableDays),
+            inCrisisMode,
+            impossibleTarget,
+            minWorkDaysNeeded,
+            seedMinWorkDays: Math.max(Math.floor(availableDays * 0.95), doubleShiftDaysNeeded), // generateHighWorkChromosome()
+            baseWorkProbability: Math.min(0.9, (estimatedWorkDays / availableDays) * 1.2),
+            criticalDays: this.identifyCriticalDays()
+        });
+    }
+    
+    geneForEarnings(earnings) {
+        // Match fixed earnings to the shift combination that pays them
+        if (earnings === 0) return GENE.OFF;
+        if (Math.abs(earnings - 56) < 1) return GENE.SMALL;
+        if (Math.abs(earnings - 67.5) < 1) return GENE.MEDIUM;
+        if (Math.abs(earnings - 86.5) < 1) return GENE.LARGE;
+        if (Math.abs(earnings - 112) < 1) return GENE.SMALL_SMALL;
+        if (Math.abs(earnings - 123.5) < 1) return GENE.SMALL_MEDIUM;
+        if (Math.abs(earnings - 135) < 1) return GENE.MEDIUM_MEDIUM;
+        return GENE.MEDIUM; // Custom earnings - default to medium
+    }
+
+    identifyCriticalDays() {
+        const criticalDays = [];
+        let runningBalance = this.effectiveStartingBalance;
+        
+        for (let day = this.startDay; day <= this.horizonDays; day++) {
+            runningBalance += this.depositsByDay[day] || 0;
+            runningBalance -= this.expensesByDay[day] || 0;
+            
+            // Mark days where balance would be low without work
+            if (runningBalance < this.minimumBalance + 200) {
+                criticalDays.push(day);
+            }
+        }
+        
+        return criticalDays;
+    }
+    
+    generateChromosome(forceAggressive = false) {
+        const plan = this.plan;
+        
+        // Apply manual constraints first
+        const chromosome = plan.presetGenes.slice();
+        const assigned = plan.presetMask.slice();
+        
+        const inCrisisMode = plan.inCrisisMode;
+        const startDay = plan.startDay;
+        
+        // First, try to cover critical days with appropriate shifts
+        for (const criticalDay of plan.criticalDays) {
+            const workDay = Math.max(startDay, criticalDay - 3); // Work a few days before, but not before balance edit
+            if (workDay <= this.horizonDays && !chromosome[workDay]) {
+                if (inCrisisMode) {
+                    // In crisis mode, use highest-earning double shifts for critical days
+                    const rand = this.rng.next();
+                    if (rand < 0.4) {
+                        chromosome[workDay] = GENE.LARGE_LARGE;     // $173
+                    } else if (rand < 0.8) {
+                        chromosome[workDay] = GENE.MEDIUM_LARGE;    // $154
+                    } else {
+                        chromosome[workDay] = GENE.MEDIUM_MEDIUM;   // $135
+                    }
+                } else {
+                    // Normal mode: prefer larger single shifts for critical days
+                    const shiftType = this.rng.next() < 0.6 ? GENE.LARGE : 
+                                    this.rng.next() < 0.8 ? GENE.MEDIUM : GENE.SMALL;
+                    chromosome[workDay] = shiftType;
+                }
+                assigned[workDay] = 1;
+            }
+        }
+        
+        const minWorkDaysNeeded = plan.minWorkDaysNeeded;
+        
+        // Count work days already scheduled
+        let scheduledWorkDays = 0;
+        for (let d = startDay; d <= this.horizonDays; d++) {
+            if (chromosome[d]) scheduledWorkDays++;
+        }
+        
+        // Fill remaining days (only from startDay onward)
+        for (let day = startDay; day <= this.horizonDays; day++) {
+            if (assigned[day]) continue; // Skip if already set by constraints
+            
+            // Force work if we haven't met minimum
+            const remainingDays = this.horizonDays - day + 1;
+            const remainingWorkDaysNeeded = minWorkDaysNeeded - scheduledWorkDays;
+            const mustWork = remainingWorkDaysNeeded >= remainingDays;
+            
+            // In crisis mode, be much more aggressive about working
+            let workProbability;
+            if (mustWork) {
+                workProbability = 1.0; // Must work to meet minimum
+            } else if (inCrisisMode) {
+                workProbability = 0.95; // Very high probability in crisis mode
+            } else {
+                // Add variance for population diversity in normal mode
+                const variance = (this.rng.next() - 0.5) * 0.3;
+                workProbability = Math.max(0.1, Math.min(0.95, plan.baseWorkProbability + variance));
+            }
+            
+            if (this.rng.next() < workProbability) {
+                scheduledWorkDays++;
+                
+                if (inCrisisMode) {
+                    // Force high-earning double shifts in crisis mode
+                    const rand = this.rng.next();
+                    if (rand < 0.3) {
+                        chromosome[day] = GENE.LARGE_LARGE;     // $173
+                    } else if (rand < 0.7) {
+                        chromosome[day] = GENE.MEDIUM_LARGE;    // $154
+                    } else {
+                        chromosome[day] = GENE.MEDIUM_MEDIUM;   // $135
+                    }
+                } else {
+                    // Normal mode: Choose shift type with preference for medium shifts
+                    const rand = this.rng.next();
+                    if (rand < 0.2) {
+                        chromosome[day] = GENE.SMALL;
+                    } else if (rand < 0.7) {
+                        chromosome[day] = GENE.MEDIUM;
+                    } else {
+                        chromosome[day] = GENE.LARGE;
+                    }
+                    
+                    // Sometimes use double shifts for efficiency
+                    const doubleShiftProbability = 0.3;
+                    if (this.rng.next() < doubleShiftProbability && chromosome[day] !== GENE.LARGE) {
+                        const secondShift = this.rng.next() < 0.5 ? GENE.SMALL : GENE.MEDIUM;
+                        chromosome[day] = GENE_PAIRS[chromosome[day]][secondShift];
+                    }
+                }
+            }
+        }
+        
+        // Final validation: ensure minimum work days are met in crisis mode
+        if (inCrisisMode) {
+            let actualWorkDays = 0;
+            for (let d = startDay; d <= this.horizonDays; d++) {
+                if (chromosome[d]) actualWorkDays++;
+            }
+            
+            // If we still don't have enough work days, force additional work days
+            if (actualWorkDays < minWorkDaysNeeded) {
+                const workDaysToAdd = minWorkDaysNeeded - actualWorkDays;
+                const availableDaysToWork = [];
+                
+                // Find days that aren't working
+                for (let d = startDay; d <= this.horizonDays; d++) {
+                    if (!chromosome[d] && !plan.constraintMask[d]) {
+                        availableDaysToWork.push(d);
+                    }
+                }
+                
+                // Add work days starting from the earliest available days
+                for (let i = 0; i < workDaysToAdd && i < availableDaysToWork.length; i++) {
+                    const day = availableDaysToWork[i];
+                    // Use high-earning double shifts
+                    const rand = this.rng.next();
+                    if (rand < 0.4) {
+                        chromosome[day] = GENE.LARGE_LARGE;
+                    } else if (rand < 0.8) {
+                        chromosome[day] = GENE.MEDIUM_LARGE;
+                    } else {
+                        chromosome[day] = GENE.MEDIUM_MEDIUM;
+                    }
+                }
+                
+                // Chromosome repair completed for crisis mode
+            }
+        }
+        
+        return chromosome;
+    }
+    
+    generateHighWorkChromosome() {
+        const plan = this.plan;
+        
+        // Apply manual constraints first
+        const chromosome = plan.presetGenes.slice();
+        const startDay = plan.startDay;
+        
+        // Minimum work days for seeded crisis-mode chromosomes
+        const minWorkDaysNeeded = plan.seedMinWorkDays;
+        
+        // Force work on most days with high-earning double shifts
+        let workDaysScheduled = 0;
+        for (let day = startDay; day <= this.horizonDays; day++) {
+            if (chromosome[day] !== GENE.OFF) {
+                workDaysScheduled++; // Count existing work days
+                continue; // Skip if already set by constraints
+            }
+            
+            if (workDaysScheduled < minWorkDaysNeeded) {
+                // Force high-earning double shifts
+                const rand = this.rng.next();
+                if (rand < 0.5) {
+                    chromosome[day] = GENE.LARGE_LARGE;     // $173
+                } else if (rand < 0.8) {
+                    chromosome[day] = GENE.MEDIUM_LARGE;    // $154
+                } else {
+                    chromosome[day] = GENE.MEDIUM_MEDIUM;   // $135
+                }
+                workDaysScheduled++;
+            } else {
+                // Allow some days off for the remaining days
+                if (this.rng.next() < 0.2) {
+                    chromosome[day] = GENE.OFF; // 20% chance of day off
+                } else {
+                    chromosome[day] = GENE.MEDIUM_MEDIUM; // Still work most remaining days
+                    workDaysScheduled++;
+                }
+            }
+        }
+        
+        return chromosome;
+    }
+    
+    calculateNormalFitness(chromosome, balance, workDays, violations, totalEarnings, minBalance, workDaysList) {
+        // Normal mode: Minimize work days, hit target exactly, avoid consecutive work
+        const finalBalanceDiff = Math.abs(balance - this.targetEndingBalance);
+        const workDayPenalty = workDays * 30; // Minimize work days
+        
+        // Calculate consecutive work penalty
+        const gaps = [];
+        for (let i = 1; i < workDaysList.length; i++) {
+            gaps.push(workDaysList[i] - workDaysList[i-1]);
+        }
+        const consecutiveDays = gaps.filter(g => g === 1).length;
+        const consecutivePenalty = consecutiveDays * 75; // Avoid consecutive work
+        
+        // Calculate work distribution variance
+        let gapVariance = 0;
+        if (gaps.length > 0) {
+            const avgGap = gaps.reduce((a, b) => a + b, 0) / gaps.length;
+            gapVariance = gaps.reduce((sum, gap) => sum + Math.pow(gap - avgGap, 2), 0) / gaps.length;
+        }
+        
+        // Manual constraint violations
+        let balanceConstraintViolations = 0;
+        if (this.manualConstraints) {
+            for (const day in this.manualConstraints) {
+                if (this.manualConstraints[day].fixedBalance !== undefined) {
+                    // This will be calculated in the main evaluation loop
+                }
+            }
+        }
+        
+        return violations * 5000 +                     // Safety: minimum balance violations
+               finalBalanceDiff * 20 +                 // Precision: hit target exactly
+               workDayPenalty +                        // Efficiency: minimize work
+               consecutivePenalty +                    // Wellness: avoid burnout
+               Math.sqrt(gapVariance) * 50 +           // Distribution: even spacing
+               (minBalance < this.minimumBalance ? 
+                   Math.abs(minBalance - this.minimumBalance) * 100 : 0); // Minimum balance safety
+    }
+    
+    calculateCrisisFitness(chromosome, balance, workDays, violations, totalEarnings, minBalance, workDaysList) {
+        // Crisis mode: Guarantee survival, overshoot acceptable, maximize work
+        const belowTargetPenalty = balance < this.targetEndingBalance ? 
+            (this.targetEndingBalance - balance) * 1000 : 0; // Heavy penalty for insufficient funds
+        const aboveTargetPenalty = balance > this.targetEndingBalance ?
+            (balance - this.targetEndingBalance) * 0.1 : 0;  // Tiny penalty for overshoot - overshoot is OK!
+        
+        // Penalty for insufficient earnings
+        const earningsShortfall = Math.max(0, this.requiredFlexNet - totalEarnings);
+        
+        // Penalty for insufficient work days in crisis
+        const actualWorkDaysAfterEdit = workDaysList.filter(d => d >= this.plan.startDay).length;
+        const workDayDeficit = Math.max(0, this.plan.minWorkDaysNeeded - actualWorkDaysAfterEdit);
+        
+        return violations * 10000 +                    // Safety: critical minimum balance violations  
+               belowTargetPenalty +                    // Survival: must meet minimum target
+               aboveTargetPenalty +                    // Overshoot: minimal penalty (overshoot OK)
+               earningsShortfall * 100 +               // Earnings: must earn enough
+               workDayDeficit * 1000 +                 // Work: must work enough days
+               (minBalance < this.minimumBalance ? 
+                   Math.abs(minBalance - this.minimumBalance) * 200 : 0); // Enhanced minimum balance safety
+    }
+    
+    computeLockedPrefix() {
+        // Days before startDay come from the constraints, not the chromosome, so
+        // their contribution to every evaluation is computed once per run (in cents)
+        const prefix = {
+            balanceCents: toCents(this.startingBalance), // Always start from the original balance
+            minBalanceCents: toCents(this.startingBalance),
+            workDays: 0,
+            earningsCents: 0,
+            violations: 0,
+            balanceConstraintViolations: 0,
+            // Gap statistics between consecutive work days
+            lastWorkDay: 0,
+            gapCount: 0,
+            gapSum: 0,
+            gapSumSquares: 0,
+            consecutiveDays: 0
+        };
+        
+        for (let day = 1; day < this.startDay; day++) {
+            const gene = this.constraintGenes[day];
+            if (gene !== GENE.OFF) {
+                prefix.earningsCents += this.geneNetCents[gene];
+                prefix.workDays++;
+                if (prefix.lastWorkDay) {
+                    const gap = day - prefix.lastWorkDay;
+                    prefix.gapCount++;
+                    prefix.gapSum += gap;
+                    prefix.gapSumSquares += gap * gap;
+                    if (gap === 1) prefix.consecutiveDays++;
+                }
+                prefix.lastWorkDay = day;
+            }
+            prefix.balanceCents += this.geneNetCents[gene] + toCents(this.depositsByDay[day] || 0) - toCents(this.expensesByDay[day]);
+            
+            // Handle balance edit override
+            if (this.balanceEditDay && day === this.balanceEditDay) {
+                prefix.balanceCents = toCents(this.newStartingBalance);
+            }
+            
+            // Check balance constraints
+            if (this.manualConstraints[day] && this.manualConstraints[day].fixedBalance !== undefined) {
+                const balanceDiff = Math.abs(prefix.balanceCents / 100 - this.manualConstraints[day].fixedBalance);
+                if (balanceDiff > 0.01) {
+                    prefix.balanceConstraintViolations += balanceDiff * 1000; // Heavy penalty
+                }
+            }
+            
+            // Track violations and minimum balance
+            if (prefix.balanceCents < this.minimumBalanceCents) {
+                prefix.violations++;
+            }
+            prefix.minBalanceCents = Math.min(prefix.minBalanceCents, prefix.balanceCents);
+        }
+        
+        return prefix;
+    }
+    
+    evaluateFitness(chromosome, parent = null) {
+        // Balances of the free days live in a min-prefix segment tree. A child
+        // evaluated against its parent only updates the days that differ, in
+        // O(log n) each; everything else is scored from scratch.
+        const prefix = this.lockedPrefix;
+        let tree;
+        if (parent && parent.fitness.balanceTree) {
+            tree = parent.fitness.balanceTree.clone();
+            const parentChromosome = parent.chromosome;
+            const changed = this.changedLeaves;
+            let changedCount = 0;
+            for (let day = this.startDay; day <= this.horizonDays; day++) {
+                if (chromosome[day] !== parentChromosome[day]) {
+                    tree.setLeaf(day - this.startDay, this.baseFlowCents[day] + this.geneNetCents[chromosome[day]]);
+                    changed[changedCount++] = day - this.startDay;
+                }
+            }
+            tree.updateMany(changed, changedCount);
+        } else {
+            tree = new BalanceTree(this.horizonDays + 1 - this.startDay);
+            for (let day = this.startDay; day <= this.horizonDays; day++) {
+                tree.setLeaf(day - this.startDay, this.baseFlowCents[day] + this.geneNetCents[chromosome[day]]);
+            }
+            tree.build();
+        }
+        
+        // One streaming pass for work days, earnings and gap statistics,
+        // continuing from the locked prefix - no intermediate arrays
+        let workDays = prefix.workDays;
+        let earningsCents = prefix.earningsCents;
+        let lastWorkDay = prefix.lastWorkDay;
+        let gapCount = prefix.gapCount;
+        let gapSum = prefix.gapSum;
+        let gapSumSquares = prefix.gapSumSquares;
+        let consecutiveDays = prefix.consecutiveDays;
+        for (let day = this.startDay; day <= this.horizonDays; day++) {
+            const gene = chromosome[day];
+            if (gene !== GENE.OFF) {
+                earningsCents += this.geneNetCents[gene];
+                workDays++;
+                if (lastWorkDay) {
+                    const gap = day - lastWorkDay;
+                    gapCount++;
+                    gapSum += gap;
+                    gapSumSquares += gap * gap;
+                    if (gap === 1) consecutiveDays++;
+                }
+                lastWorkDay = day;
+            }
+        }
+        const gapMean = gapCount > 0 ? gapSum / gapCount : 0;
+        const gapVariance = gapCount > 0 ? Math.max(0, gapSumSquares / gapCount - gapMean * gapMean) : 0;
+        
+        const initialCents = prefix.balanceCents;
+        const balance = (initialCents + tree.total()) / 100;
+        const totalEarnings = earningsCents / 100;
+        const minBalance = Math.min(prefix.minBalanceCents, initialCents + tree.min()) / 100;
+        const violations = prefix.violations + tree.countBelow(this.minimumBalanceCents - initialCents);
+        
+        // Check balance constraints on free days
+        let balanceConstraintViolations = prefix.balanceConstraintViolations;
+        for (const constraint of this.freeBalanceConstraints) {
+            const dayBalance = (initialCents + tree.prefixSum(constraint.index)) / 100;
+            const balanceDiff = Math.abs(dayBalance - constraint.balance);
+            if (balanceDiff > 0.01) {
+                balanceConstraintViolations += balanceDiff * 1000; // Heavy penalty
+            }
+        }
+        
+        const inCrisisMode = this.plan.inCrisisMode;
+        
+        // Reused context for the strategy pattern - strategies must not keep it
+        const fitnessContext = this.fitnessContext;
+        fitnessContext.balance = balance;
+        fitnessContext.workDays = workDays;
+        fitnessContext.violations = violations;
+        fitnessContext.totalEarnings = totalEarnings;
+        fitnessContext.minBalance = minBalance;
+        fitnessContext.workDaysAfterEdit = workDays - prefix.workDays;
+        fitnessContext.consecutiveDays = consecutiveDays;
+        fitnessContext.gapMean = gapMean;
+        fitnessContext.gapVariance = gapVariance;
+        
+        // Calculate fitness using Strategy Pattern + balance constraint penalties
+        const strategyFitness = this.fitnessManager.evaluateChromosome(chromosome, fitnessContext);
+        const constraintPenaltyMultiplier = inCrisisMode ? 0.01 : 10000; // Crisis-aware constraint penalty
+        const fitness = strategyFitness + balanceConstraintViolations * constraintPenaltyMultiplier;
+        
+        return {
+            fitness: fitness,
+            balance: balance,
+            workDays: workDays,
+            violations: violations,
+            totalEarnings: totalEarnings,
+            minBalance: minBalance,
+            balanceTree: tree
+        };
+    }
+    
+    prepareSelection(population, parentCount) {
+        // Once per generation, before the first selectParent() call
+        if (this.selectionMode === 'sus') {
+            this.parentPool = this.stochasticUniversalSample(population, parentCount);
+        } else if (this.selectionMode === 'rank') {
+            this.parentPool = population.slice().sort(byFitness);
+        }
+        this.parentPoolIndex = 0;
+    }
+    
+    selectParent(population) {
+        if (this.selectionMode === 'sus') {
+            // Wrap around if more parents are requested than were sampled
+            const parent = this.parentPool[this.parentPoolIndex % this.parentPool.length];
+            this.parentPoolIndex++;
+            return parent;
+        }
+        if (this.selectionMode === 'rank') {
+            return this.rankSelect(this.parentPool);
+        }
+        return this.tournamentSelect(population);
+    }
+    
+    tournamentSelect(population) {
+        // Fittest of tournamentSize random individuals - a linear scan, no sort
+        let winner = population[Math.floor(this.rng.next() * population.length)];
+        for (let i = 1; i < this.tournamentSize; i++) {
+            const contender = population[Math.floor(this.rng.next() * population.length)];
+            if (contender.fitness.fitness < winner.fitness.fitness) {
+                winner = contender;
+            }
+        }
+        return winner;
+    }
+    
+    rankSelect(ranked) {
+        // Linear ranking over a population sorted best-first, sampled by
+        // inverting the ranking CDF so each pick is O(1)
+        const s = RANK_SELECTION_PRESSURE;
+        const u = this.rng.next();
+        const x = (s - Math.sqrt(s * s - 4 * (s - 1) * u)) / (2 * (s - 1));
+        return ranked[Math.min(ranked.length - 1, Math.floor(x * ranked.length))];
+    }
+    
+    stochasticUniversalSample(population, count) {
+        // One spin of a wheel with `count` evenly spaced pointers. Fitness is
+        // minimized, so each slot is sized by how far it is from the worst.
+        let best = Infinity;
+        let worst = -Infinity;
+        for (const individual of population) {
+            best = Math.min(best, individual.fitness.fitness);
+            worst = Math.max(worst, individual.fitness.fitness);
+        }
+        const span = worst - best;
+        const floor = span > 0 ? span / population.length : 1; // Keeps the worst individuals selectable
+        
+        let total = 0;
+        for (const individual of population) {
+            total += worst - individual.fitness.fitness + floor;
+        }
+        
+        const step = total / count;
+        let pointer = this.rng.next() * step;
+        let cumulative = 0;
+        const selected = [];
+        for (const individual of population) {
+            cumulative += worst - individual.fitness.fitness + floor;
+            while (pointer < cumulative && selected.length < count) {
+                selected.push(individual);
+                pointer += step;
+            }
+        }
+        
+        // Shuffle so consecutive picks don't pair near-identical parents
+        for (let i = selected.length - 1; i > 0; i--) {
+            const j = Math.floor(this.rng.next() * (i + 1));
+            const tmp = selected[i];
+            selected[i] = selected[j];
+            selected[j] = tmp;
+        }
+        return selected;
+    }
+    
+    crossover(parent1, parent2) {
+        // Two-point crossover
+        const point1 = Math.floor(this.rng.next() * this.horizonDays) + 1;
+        const point2 = Math.floor(this.rng.next() * this.horizonDays) + 1;
+        const start = Math.min(point1, point2);
+        const end = Math.max(point1, point2);
+        
+        const child = parent1.chromosome.slice();
+        child.set(parent2.chromosome.subarray(start, end + 1), start);
+        
+        // Derive the child's hash from parent1's by swapping in the copied segment
+        let hash = parent1.hash !== undefined ? parent1.hash : this.hashChromosome(parent1.chromosome);
+        for (let day = start; day <= end; day++) {
+            const from = parent1.chromosome[day];
+            const to = child[day];
+            if (from !== to) {
+                hash ^= this.zobristKeys[day * GENE_COUNT + from] ^ this.zobristKeys[day * GENE_COUNT + to];
+            }
+        }
+        this.offspringHash = hash >>> 0;
+        
+        return child;
+    }
+    
+    mutate(chromosome, hash = this.hashChromosome(chromosome)) {
+        const mutated = chromosome.slice();
+        const plan = this.plan;
+        const isExtremeDeficit = plan.inCrisisMode;
+        
+        // Work days among the mutable days, kept current as genes change
+        let currentWorkDays = 0;
+        if (isExtremeDeficit) {
+            for (const day of plan.mutableDays) {
+                if (mutated[day]) currentWorkDays++;
+            }
+        }
+        
+        // Days with manual constraints or before the balance edit are never
+        // mutated. Each mutable day mutates with probability mutationRate; the
+        // gap to the next mutated day is drawn geometrically, so long horizons
+        // cost one random draw per mutation rather than one per day.
+        const mutableDays = plan.mutableDays;
+        for (let i = this.mutationGap(); i < mutableDays.length; i += 1 + this.mutationGap()) {
+            const day = mutableDays[i];
+            const previousGene = mutated[day];
+            
+            if (isExtremeDeficit) {
+                // Crisis-aware mutation: heavily favor work days and high earnings
+                const currentValue = mutated[day];
+                const isCurrentlyWorking = currentValue !== GENE.OFF;
+                
+                const needMoreWorkDays = currentWorkDays < plan.minWorkDaysNeeded;
+                
+                if (!isCurrentlyWorking && needMoreWorkDays) {
+                    // Force this day to work if we need more work days
+                    const rand = this.rng.next();
+                    if (rand < 0.4) {
+                        mutated[day] = GENE.LARGE_LARGE; // 40% highest earning
+                    } else if (rand < 0.8) {
+                        mutated[day] = GENE.MEDIUM_LARGE; // 40% second highest
+                    } else {
+                        mutated[day] = GENE.MEDIUM_MEDIUM; // 20% third highest
+                    }
+                } else if (isCurrentlyWorking) {
+                    // Already working - potentially upgrade to higher earnings
+                    const rand = this.rng.next();
+                    if (rand < 0.1) {
+                        mutated[day] = GENE.OFF; // 10% chance to take day off
+                    } else if (rand < 0.3) {
+                        mutated[day] = GENE.LARGE_LARGE; // 20% upgrade to highest
+                    } else if (rand < 0.6) {
+                        mutated[day] = GENE.MEDIUM_LARGE; // 30% second highest
+                    } else if (rand < 0.8) {
+                        mutated[day] = GENE.MEDIUM_MEDIUM; // 20% medium double
+                    } else {
+                        // Keep current value 20% of the time
+                    }
+                } else {
+                    // Day off and we have enough work days - small chance to add work
+                    const rand = this.rng.next();
+                    if (rand < 0.3) {
+                        mutated[day] = GENE.MEDIUM_MEDIUM; // 30% chance to add work anyway
+                    }
+                }
+            } else {
+                // Conservative mutation for normal scenarios
+                const rand = this.rng.next();
+                if (rand < 0.2) {
+                    mutated[day] = GENE.OFF; // Day off
+                } else if (rand < 0.5) {
+                    mutated[day] = GENE.MEDIUM;
+                } else if (rand < 0.7) {
+                    mutated[day] = GENE.MEDIUM_MEDIUM;
+                } else if (rand < 0.85) {
+                    mutated[day] = GENE.LARGE;
+                } else {
+                    mutated[day] = Math.floor(this.rng.next() * GENE_COUNT); // Any shift combination
+                }
+            }
+            
+            if (mutated[day] !== previousGene) {
+                currentWorkDays += (mutated[day] !== GENE.OFF) - (previousGene !== GENE.OFF);
+                hash ^= this.zobristKeys[day * GENE_COUNT + previousGene] ^ this.zobristKeys[day * GENE_COUNT + mutated[day]];
+            }
+        }
+        
+        this.offspringHash = hash >>> 0;
+        return mutated;
+    }
+    
+    mutationGap() {
+        // Mutable days skipped before the next mutation - geometric, p = mutationRate
+        if (this.mutationRate <= 0) return Infinity;
+        return Math.floor(Math.log(1 - this.rng.next()) / Math.log(1 - this.mutationRate));
+    }
+    
+    repairChromosome(genes) {
+        // Make a chromosome from another run valid for this one: constrained
+        // days take their preset genes, locked days (before startDay) their
+        // constraint or a day off - what formatSchedule() shows for them -
+        // and everything else is kept
+        const plan = this.plan;
+        const chromosome = new Uint8Array(this.horizonDays + 1);
+        for (let day = 1; day <= this.horizonDays; day++) {
+            const gene = genes[day];
+            if (plan.presetMask[day]) {
+                chromosome[day] = plan.presetGenes[day];
+            } else if (plan.lockedMask[day]) {
+                chromosome[day] = this.constraintGenes[day];
+            } else {
+                chromosome[day] = gene >= 0 && gene < GENE_COUNT ? gene : GENE.OFF;
+            }
+        }
+        return chromosome;
+    }
+    
+    listWorkDays(chromosome) {
+        // Days with shifts, locked days included - built only for results
+        const workDays = [];
+        for (let day = 1; day <= this.horizonDays; day++) {
+            const gene = day < this.startDay ? this.constraintGenes[day] : chromosome[day];
+            if (gene !== GENE.OFF) workDays.push(day);
+        }
+        return workDays;
+    }
+    
+    hashChromosome(chromosome) {
+        let hash = 0;
+        for (let day = 1; day <= this.horizonDays; day++) {
+            hash ^= this.zobristKeys[day * GENE_COUNT + chromosome[day]];
+        }
+        return hash >>> 0;
+    }
+    
+    scoreChromosome(chromosome, hash, parent = null) {
+        // evaluateFitness() with memoization - identical chromosomes share one record
+        if (!this.fitnessCache) {
+            this.evaluations++;
+            return this.evaluateFitness(chromosome, parent);
+        }
+        
+        let fitness = this.fitnessCache.get(hash, chromosome);
+        if (fitness === undefined) {
+            this.evaluations++;
+            fitness = this.evaluateFitness(chromosome, parent);
+            this.fitnessCache.set(hash, chromosome, fitness);
+        }
+        return fitness;
+    }
+    
+    createIndividual(chromosome) {
+        const hash = this.hashChromosome(chromosome);
+        return { chromosome, fitness: this.scoreChromosome(chromosome, hash), hash };
+    }
+    
+    debugFields(individual) {
+        // Log fields for an individual: its fitness and the days being optimized
+        const schedule = {};
+        let workDays = 0;
+        for (let day = this.startDay; day <= this.horizonDays; day++) {
+            const shifts = GENE_NAMES[individual.chromosome[day]];
+            if (shifts) workDays++;
+            schedule[day] = shifts || 'Off';
+        }
+        return {
+            fitness: individual.fitness.fitness,
+            balance: individual.fitness.balance,
+            workDays,
+            schedule
+        };
+    }
+    
+    async optimize(progressCallback, migration = null) {
+        // Starting enhanced genetic algorithm optimization
+        const profiler = this.profiler;
+        const initStart = profiler ? performance.now() : 0;
+        
+        // Initialize population
+        let population = [];
+        
+        // Check if we're in crisis mode for special population seeding
+        const availableDays = this.plan.availableDays;
+        const inCrisisMode = this.plan.inCrisisMode;
+        
+        // Warm start: previous run's survivors, repaired against the new constraints
+        if (this.seedPopulation) {
+            for (const genes of this.seedPopulation.slice(0, this.populationSize)) {
+                population.push(this.createIndividual(this.repairChromosome(genes)));
+            }
+        }
+        const warmStarted = population.length > 0;
+        
+        // Fill population with randomly generated chromosomes
+        while (population.length < this.populationSize) {
+            const chromosome = this.generateChromosome();
+            population.push(this.createIndividual(chromosome));
+        }
+        
+        const logger = this.logger;
+        if (logger.debugEnabled) {
+            logger.debug('initial population', {
+                crisisMode: inCrisisMode,
+                requiredEarnings: this.requiredFlexNet,
+                availableDays,
+                maxSingleShiftEarnings: availableDays * this.shifts.large.net,
+                firstChromosomes: population.slice(0, 3).map(ind => this.debugFields(ind))
+            });
+        }
+        
+        // In crisis mode during regeneration, seed population with high-work solutions
+        if (inCrisisMode && this.balanceEditDay) {
+            const seedCount = Math.floor(this.populationSize * 0.3); // 30% of population
+            const firstSeed = Math.min(this.seedPopulation ? this.seedPopulation.length : 0,
+                                       this.populationSize - seedCount); // Keep warm-start individuals
+            for (let i = firstSeed; i < firstSeed + seedCount; i++) {
+                const seedChromosome = this.generateHighWorkChromosome();
+                population[i] = this.createIndividual(seedChromosome); // Replace 30% of the random ones
+            }
+            
+            if (logger.debugEnabled) {
+                logger.debug('seeded high-work chromosomes', {
+                    count: seedCount, first: this.debugFields(population[firstSeed])
+                });
+            }
+        }
+        
+        if (profiler) profiler.add('init', initStart);
+        
+        let bestEverFitness = Infinity;
+        let generationsWithoutImprovement = 0;
+        // A warm-started population is already near convergence
+        const maxGenerationsWithoutImprovement = warmStarted ? 25 : 150;
+        const minGenerations = warmStarted ? 30 : 300;
+        const balanceTolerance = 5;
+        
+        // Evolution loop
+        for (let gen = 0; gen < this.generations; gen++) {
+            this.generationsRun = gen + 1;
+            
+            // Move the elite to the front, best first (lower is better)
+            const sortStart = profiler ? performance.now() : 0;
+            selectFittest(population, this.eliteSize);
+            if (profiler) profiler.add('sort', sortStart);
+            
+            // Island mode: swap top individuals with neighbouring islands
+            if (migration && gen > 0 && gen % migration.interval === 0) {
+                await migration.exchange(population, gen);
+                selectFittest(population, this.eliteSize);
+            }
+            
+            // Track convergence
+            if (this.telemetry) {
+                this.telemetry.record(gen, population, this.startDay, this.horizonDays, this.evaluations,
+                                      this.fitnessCache ? this.fitnessCache.hits : null);
+            }
+            
+            // Report progress
+            if (progressCallback && gen % 50 === 0) {
+                const best = population[0];
+                const progressStart = profiler ? performance.now() : 0;
+                await progressCallback({
+                    generation: gen,
+                    progress: (gen / this.generations) * 100,
+                    bestFitness: best.fitness.fitness,
+                    workDays: best.fitness.workDays,
+                    balance: best.fitness.balance,
+                    violations: best.fitness.violations,
+                    fitnessCache: this.fitnessCache ? this.fitnessCache.getStats() : null,
+                    profile: profiler ? profiler.report() : undefined
+                });
+                if (profiler) profiler.add('progress', progressStart);
+                
+            }
+            
+            if (logger.debugEnabled && gen % 50 === 0) {
+                logger.debug('generation best', { generation: gen, ...this.debugFields(population[0]) });
+            }
+            
+            // Stop between generations when the caller cancels the run
+            if (this.cancelRequested) {
+                break;
+            }
+            
+            // First generation whose best schedule is usable - no violations, target reached
+            const best = population[0].fitness;
+            const feasible = best.violations === 0 && best.balance >= this.targetEndingBalance - balanceTolerance;
+            if (feasible && this.firstFeasibleGeneration === null) {
+                this.firstFeasibleGeneration = gen;
+            }
+            
+            // Check for improvement
+            if (population[0].fitness.fitness < bestEverFitness * 0.99) {
+                bestEverFitness = population[0].fitness.fitness;
+                generationsWithoutImprovement = 0;
+            } else {
+                generationsWithoutImprovement++;
+            }
+            
+            // Early termination if converged with valid solution
+            if (gen > minGenerations && generationsWithoutImprovement > maxGenerationsWithoutImprovement && feasible) {
+                // Solution converged
+                break;
+            }
+            
+            // Create new population
+            const newPopulation = [];
+            
+            // Elitism: Keep best individuals
+            for (let i = 0; i < this.eliteSize && i < population.length; i++) {
+                newPopulation.push({
+                    chromosome: population[i].chromosome.slice(),
+                    fitness: population[i].fitness,
+                    hash: population[i].hash
+                });
+            }
+            
+            // Generate rest through crossover and mutation
+            this.prepareSelection(population, 2 * (this.populationSize - newPopulation.length));
+            while (newPopulation.length < this.populationSize) {
+                // Parent selection (config.selectionMode)
+                const parent1 = this.selectParent(population);
+                const parent2 = this.selectParent(population);
+                
+                // Crossover
+                let child = this.crossover(parent1, parent2);
+                
+                // Mutation (both operators keep this.offspringHash in sync)
+                child = this.mutate(child, this.offspringHash);
+                
+                // Evaluate (memoized, incremental against parent1) and add
+                const hash = this.offspringHash;
+                const fitness = this.scoreChromosome(child, hash, parent1);
+                newPopulation.push({ chromosome: child, fitness, hash });
+            }
+            
+            population = newPopulation;
+        }
+        
+        // Return best solution, keeping the top of the population for warm starts
+        selectFittest(population, this.retainedPopulationSize);
+        const result = this.createResult(population[0]);
+        result.finalPopulation = population.slice(0, this.retainedPopulationSize).map(ind => ind.chromosome);
+        return result;
+    }
+    
+    createResult(best) {
+        // Result shape shared by every engine
+        return {
+            engine: this.engine,
+            schedule: this.decodeChromosome(best.chromosome),
+            genes: best.chromosome,
+            workDays: this.listWorkDays(best.chromosome),
+            totalEarnings: best.fitness.totalEarnings,
+            finalBalance: best.fitness.balance,
+            minBalance: best.fitness.minBalance,
+            violations: best.fitness.violations,
+            bestFitness: best.fitness.fitness,
+            fitnessCache: this.fitnessCache ? this.fitnessCache.getStats() : null,
+            selectionMode: this.selectionMode,
+            seed: this.seed,
+            profile: this.profiler ? this.profiler.report() : undefined,
+            evaluations: this.evaluations,
+            generations: this.generationsRun,
+            firstFeasibleGeneration: this.firstFeasibleGeneration,
+            telemetry: this.telemetry ? this.telemetry.toArray() : undefined,
+            months: this.summarizeMonths(best.chromosome),
+            cancelled: this.cancelRequested,
+            getFormattedSchedule: () => this.formatSchedule(best.chromosome)
+        };
+    }
+    
+    acceptImmigrants(population, chromosomes) {
+        // Replace individuals behind the elite (see selectFittest), never the elite
+        const count = Math.min(chromosomes.length, population.length - this.eliteSize);
+        for (let i = 0; i < count; i++) {
+            population[population.length - 1 - i] = this.createIndividual(chromosomes[i]);
+        }
+        return count;
+    }
+    
+    cancel() {
+        // Checked once per generation by optimize()
+        this.cancelRequested = true;
+    }
+
+    summarizeMonths(chromosome) {
+        // Per-month totals; each month's ending balance carries into the next
+        const schedule = this.formatSchedule(chromosome);
+        return this.calendar.months.map(month => {
+            const days = schedule.slice(month.firstDay - 1, month.firstDay - 1 + month.length);
+            return {
+                month: month.label,
+                firstDay: month.firstDay,
+                lastDay: month.firstDay + month.length - 1,
+                startingBalance: days[0].startBalance,
+                endingBalance: days[days.length - 1].endBalance,
+                workDays: days.filter(day => day.shifts.length > 0).length,
+                earnings: days.reduce((sum, day) => sum + day.earnings, 0)
+            };
+        });
+    }
+
+    formatSchedule(chromosome) {
+        const schedule = [];
+        let balance = this.startingBalance;
+        
+        // Processing schedule format
+        
+        // If we have a balance edit, we need to include the locked days before it
+        for (let day = 1; day <= this.horizonDays; day++) {
+            const dayInfo = {
+                day: day,
+                shifts: [],
+                earnings: 0,
+                expenses: this.expensesByDay[day] || 0,
+                deposit: this.depositsByDay[day] || 0,
+                startBalance: balance,
+                endBalance: 0  // Initialize to avoid null/undefined
+            };
+            
+            balance += dayInfo.deposit;
+            
+            // Handle days based on whether they're before/after balance edit
+            if (this.balanceEditDay && day < this.balanceEditDay) {
+                // Use the locked schedule from constraints
+                const gene = this.constraintGenes[day];
+                if (gene !== GENE.OFF) {
+                    dayInfo.shifts = this.geneShiftLists[gene].slice();
+                    dayInfo.earnings = this.geneNet[gene];
+                    balance += dayInfo.earnings;
+                }
+            } else if (this.balanceEditDay && day === this.balanceEditDay) {
+                // This is the balance edit day - the ending balance should match the edited value
+                // First calculate earnings for this day if any
+                const gene = this.constraintGenes[day];
+                if (gene !== GENE.OFF) {
+                    dayInfo.shifts = this.geneShiftLists[gene].slice();
+                    dayInfo.earnings = this.geneNet[gene];
+                    balance += dayInfo.earnings;
+                }
+                // The balance at the END of this day should be the edited balance
+                // So we'll calculate it after expenses are subtracted
+            } else {
+                // Use the chromosome for this day (days after balance edit)
+                const gene = chromosome[day];
+                if (gene !== GENE.OFF) {
+                    dayInfo.shifts = this.geneShiftLists[gene].slice();
+                    dayInfo.earnings = this.geneNet[gene];
+                    balance += dayInfo.earnings;
+                }
+            }
+            
+            balance -= dayInfo.expenses;
+            
+            // If this is the balance edit day, override the ending balance
+            if (this.balanceEditDay && day === this.balanceEditDay) {
+                balance = this.newStartingBalance;
+            }
+            
+            dayInfo.endBalance = balance;
+            schedule.push(dayInfo);
+        }
+        
+        return schedule;
+    }
+}
+
+// Exact engine - dynamic programming over (day, balance) instead of evolution.
+// Reuses ImprovedGeneticOptimizer's tables, constraints and evaluateFitness(),
+// and returns the same result shape.
+//
+// The DP minimizes the separable part of the active strategy's objective:
+// per-day minimum-balance violations, fixed-balance constraint penalties,
+// work-day and consecutive-day penalties, and the final balance/earnings
+// terms. The non-separable terms (gap variance, size of the minimum balance
+// shortfall, crisis work-day deficit) are not optimized; bestFitness still
+// reports the full objective of the returned schedule.
+class ExactScheduleSolver extends ImprovedGeneticOptimizer {
+    constructor(config = {}) {
+        super({ ...config, fitnessCacheSize: 0 });
+        this.engine = 'exact';
+    }
+    
+    separableCosts() {
+        // Weights of the separable terms for the run's strategy
+        const penalties = this.fitnessManager.strategyFactory.penaltyRegistry;
+        const mode = this.plan.inCrisisMode ? 'crisis' : 'normal';
+        return {
+            violation: penalties.get(mode, 'safetyViolations'),
+            workDay: penalties.get(mode, 'workDay'),
+            consecutive: penalties.get(mode, 'consecutive'),
+            // Same multipliers as evaluateFitness()
+            balanceConstraint: 1000 * (this.plan.inCrisisMode ? 0.01 : 10000)
+        };
+    }
+    
+    terminalCost(finalBalance, totalEarnings) {
+        const penalties = this.fitnessManager.strategyFactory.penaltyRegistry;
+        if (!this.plan.inCrisisMode) {
+            return Math.abs(finalBalance - this.targetEndingBalance) * penalties.get('normal', 'targetBalance');
+        }
+        const below = Math.max(0, this.targetEndingBalance - finalBalance) * penalties.get('crisis', 'belowTarget');
+        const above = Math.max(0, finalBalance - this.targetEndingBalance) * penalties.get('crisis', 'aboveTarget');
+        const shortfall = Math.max(0, this.requiredFlexNet - totalEarnings) * penalties.get('crisis', 'earningsShortfall');
+        return below + above + shortfall;
+    }
+    
+    async optimize(progressCallback) {
+        const plan = this.plan;
+        const prefix = this.lockedPrefix;
+        const { violation: violationCost, workDay: workDayCost, consecutive: consecutiveCost,
+                balanceConstraint: balanceConstraintCost } = this.separableCosts();
+        const minimumBalanceCents = this.minimumBalanceCents;
+        
+        // Every gene pays a multiple of `unit` cents, so a day's reachable
+        // balances are its base balance plus k units of earnings
+        let unit = 0;
+        for (let gene = 1; gene < GENE_COUNT; gene++) {
+            let a = unit;
+            let b = this.geneNetCents[gene];
+            while (b) [a, b] = [b, a % b];
+            unit = a;
+        }
+        const geneUnits = Array.from(this.geneNetCents, cents => cents / unit);
+        const maxUnits = Math.max(...geneUnits);
+        
+        const fixedBalance = new Array(this.horizonDays + 1).fill(undefined);
+        for (let day = plan.startDay; day <= this.horizonDays; day++) {
+            if (this.manualConstraints[day] && this.manualConstraints[day].fixedBalance !== undefined) {
+                fixedBalance[day] = this.manualConstraints[day].fixedBalance;
+            }
+        }
+        
+        // cost[k * 2 + w]: cheapest way to have earned k units with w = worked
+        // the previous day. Back-pointers per day record the gene and previous w.
+        let width = 1;
+        let cost = new Float64Array(2).fill(Infinity);
+        cost[prefix.lastWorkDay === plan.startDay - 1 && prefix.lastWorkDay > 0 ? 1 : 0] = 0;
+        const choices = [];
+        let baseCents = prefix.balanceCents;
+        
+        for (let day = plan.startDay; day <= this.horizonDays; day++) {
+            baseCents += this.baseFlowCents[day];
+            const nextWidth = width + maxUnits;
+            const next = new Float64Array(nextWidth * 2).fill(Infinity);
+            const choice = new Int16Array(nextWidth * 2).fill(-1); // gene * 2 + previous w
+            const firstGene = plan.presetMask[day] ? plan.presetGenes[day] : 0;
+            const lastGene = plan.presetMask[day] ? plan.presetGenes[day] : GENE_COUNT - 1;
+            const target = fixedBalance[day];
+            
+            for (let k = 0; k < width; k++) {
+                const stay = cost[k * 2];
+                const worked = cost[k * 2 + 1];
+                if (stay === Infinity && worked === Infinity) continue;
+                for (let gene = firstGene; gene <= lastGene; gene++) {
+                    const nk = k + geneUnits[gene];
+                    const balanceCents = baseCents + nk * unit;
+                    
+                    // Cost of the day itself, except the consecutive-day term
+                    let dayCost = balanceCents < minimumBalanceCents ? violationCost : 0;
+                    if (target !== undefined) {
+                        const balanceDiff = Math.abs(balanceCents / 100 - target);
+                        if (balanceDiff > 0.01) dayCost += balanceDiff * balanceConstraintCost;
+                    }
+                    
+                    let state;
+                    let candidate;
+                    let previous;
+                    if (gene === GENE.OFF) {
+                        state = nk * 2;
+                        previous = stay <= worked ? 0 : 1;
+                        candidate = (previous ? worked : stay) + dayCost;
+                    } else {
+                        state = nk * 2 + 1;
+                        const afterWork = worked + consecutiveCost;
+                        previous = stay <= afterWork ? 0 : 1;
+                        candidate = (previous ? afterWork : stay) + dayCost + workDayCost;
+                    }
+                    if (candidate < next[state]) {
+                        next[state] = candidate;
+                        choice[state] = gene * 2 + previous;
+                    }
+                }
+            }
+            
+            cost = next;
+            width = nextWidth;
+            choices.push(choice);
+        }
+        
+        // Best end state including the final-balance terms
+        let bestState = -1;
+        let bestCost = Infinity;
+        for (let state = 0; state < width * 2; state++) {
+            if (cost[state] === Infinity) continue;
+            const k = state >> 1;
+            const total = cost[state] + this.terminalCost((baseCents + k * unit) / 100,
+                                                          (prefix.earningsCents + k * unit) / 100);
+            if (total < bestCost) {
+                bestCost = total;
+                bestState = state;
+            }
+        }
+        
+        // Walk the back-pointers to recover the schedule
+        const chromosome = plan.presetGenes.slice();
+        let state = bestState;
+        for (let day = this.horizonDays; day >= plan.startDay; day--) {
+            const picked = choices[day - plan.startDay][state];
+            const gene = picked >> 1;
+            chromosome[day] = gene;
+            state = (((state >> 1) - geneUnits[gene]) << 1) | (picked & 1);
+        }
+        
+        const best = this.createIndividual(chromosome);
+        if (progressCallback) {
+            await progressCallback({
+                generation: 0,
+                progress: 100,
+                bestFitness: best.fitness.fitness,
+                workDays: best.fitness.workDays,
+                balance: best.fitness.balance,
+                violations: best.fitness.violations,
+                fitnessCache: null
+            });
+        }
+        
+        const result = this.createResult(best);
+        result.finalPopulation = [best.chromosome];
+        result.separableCost = bestCost;
+        return result;
+    }
+}
+
+// Plain-data copy of a result for postMessage/JSON - functions can't cross
+function serializeResult(result) {
+    return {
+        engine: result.engine,
+        schedule: result.schedule,
+        genes: result.genes,
+        workDays: result.workDays,
+        totalEarnings: result.totalEarnings,
+        finalBalance: result.finalBalance,
+        minBalance: result.minBalance,
+        violations: result.violations,
+        bestFitness: result.bestFitness,
+        fitnessCache: result.fitnessCache,
+        selectionMode: result.selectionMode,
+        separableCost: result.separableCost,
+        seed: result.seed,
+        profile: result.profile,
+        evaluations: result.evaluations,
+        generations: result.generations,
+        firstFeasibleGeneration: result.firstFeasibleGeneration,
+        telemetry: result.telemetry,
+        months: result.months,
+        finalPopulation: result.finalPopulation,
+        formattedSchedule: result.getFormattedSchedule()
+    };
+}
+
+// Engine selection - config.engine is 'genetic' (default) or 'exact'
+function createOptimizer(config = {}) {
+    if (config.engine === 'exact') {
+        return new ExactScheduleSolver(config);
+    }
+    if (config.engine && config.engine !== 'genetic') {
+        throw new Error(`Unknown optimization engine: ${config.engine}`);
+    }
+    return new ImprovedGeneticOptimizer(config);
+}
+
+// Rolling multi-month planner. Optimizes the whole horizon at once (the
+// balance simply carries across month boundaries) and, when a month closes,
+// re-plans only the months that remain from the actual closing balance,
+// warm-started from the previous plan shifted past the closed month.
+class RollingHorizonPlanner {
+    constructor(config = {}) {
+        if (!config.horizon) {
+            throw new Error("RollingHorizonPlanner needs config.horizon = { start: 'YYYY-MM', months }");
+        }
+        this.config = { ...config, horizon: { ...config.horizon } };
+        this.lastResult = null;
+        this.optimizer = null;
+    }
+    
+    async plan(progressCallback) {
+        const seedPopulation = this.lastResult ? this.lastResult.finalPopulation : this.config.seedPopulation;
+        this.optimizer = createOptimizer({ ...this.config, seedPopulation });
+        const result = await this.optimizer.optimize(progressCallback);
+        this.optimizer = null;
+        this.lastResult = result;
+        return result;
+    }
+    
+    closeMonth(endingBalance, { extend = true } = {}) {
+        // Drop the first month and continue from its actual closing balance.
+        // With extend, a new month is appended so the window keeps its length.
+        const closedDays = buildCalendar(this.config.horizon).months[0].length;
+        const [year, month] = this.config.horizon.start.split('-').map(Number);
+        const nextYear = month === 12 ? year + 1 : year;
+        const nextMonth = month === 12 ? 1 : month + 1;
+        
+        const remainingMonths = this.config.horizon.months - (extend ? 0 : 1);
+        if (remainingMonths < 1) {
+            throw new Error('No months left to plan');
+        }
+        
+        this.config.horizon = { start: `${nextYear}-${String(nextMonth).padStart(2, '0')}`, months: remainingMonths };
+        this.config.startingBalance = endingBalance;
+        this.config.manualConstraints = this.shiftConstraints(this.config.manualConstraints, closedDays);
+        
+        // Shift the previous plan's survivors so day numbers line up again;
+        // repairChromosome() fills the appended month with days off
+        if (this.lastResult && this.lastResult.finalPopulation) {
+            this.lastResult.finalPopulation = this.lastResult.finalPopulation.map(genes => genes.slice(closedDays));
+        }
+    }
+    
+    shiftConstraints(constraints, closedDays) {
+        // Constraints are keyed by horizon day - renumber the ones that remain
+        if (!constraints) return constraints;
+        const shifted = {};
+        for (const key of Object.keys(constraints)) {
+            const day = parseInt(key);
+            if (!isNaN(day) && day > closedDays) {
+                shifted[day - closedDays] = constraints[key];
+            }
+        }
+        if (constraints.balanceEditDay && constraints.balanceEditDay > closedDays) {
+            shifted.balanceEditDay = constraints.balanceEditDay - closedDays;
+            shifted.newStartingBalance = constraints.newStartingBalance;
+        }
+        return shifted;
+    }
+    
+    cancel() {
+        if (this.optimizer) {
+            this.optimizer.cancel();
+        }
+    }
+}
+
+// =====================================================
+// FITNESS STRATEGY PATTERN ARCHITECTURE
+// =====================================================
+
+// Penalty Registry - Centralized penalty configuration
+class PenaltyRegistry {
+    constructor() {
+        this.penalties = {
+            normal: {
+                balanceConstraint: 10000,
+                workDay: 30,
+                consecutive: 75,
+                minBalance: 100,
+                targetBalance: 20,
+                gapVariance: 50,
+                safetyViolations: 5000
+            },
+            crisis: {
+                balanceConstraint: 0.01,  // Minimal in crisis
+                workDay: 0,               // Don't penalize work
+                belowTarget: 1000,        // Heavy penalty for shortfall
+                aboveTarget: 0.1,         // Tiny penalty for overshoot
+                earningsShortfall: 100,   // Must earn enough
+                workDayDeficit: 1000,     // Must work enough days
+                safetyViolations: 10000   // Enhanced safety
+            }
+        };
+    }
+    
+    get(mode, penaltyType) {
+        return this.penalties[mode]?.[penaltyType] || 0;
+    }
+    
+    set(mode, penaltyType, value) {
+        if (!this.penalties[mode]) this.penalties[mode] = {};
+        this.penalties[mode][penaltyType] = value;
+    }
+}
+
+// Fitness Validator - Sanity checks and conflict detection
+class FitnessValidator {
+    static validate(fitness, strategy, context, logger = new Logger()) {
+        // Detect runaway penalties
+        if (fitness > 1000000000) {
+            throw new Error(`Runaway penalty detected: ${fitness.toExponential(2)} in ${strategy.getDescription()}`);
+        }
+        
+        // Detect negative fitness (usually indicates bugs)
+        if (fitness < 0) {
+            logger.warn('negative fitness', { fitness, strategy: strategy.getDescription() });
+        }
+        
+        // Context-specific validations
+        if (context.inCrisisMode && fitness > 100000000) {
+            logger.warn('unexpectedly high crisis mode fitness', { fitness });
+        }
+        
+        return true;
+    }
+    
+    static logSuspiciousValues(breakdown, logger = new Logger()) {
+        Object.entries(breakdown).forEach(([key, value]) => {
+            if (value > 50000000) {
+                logger.warn('suspicious penalty value', { penalty: key, value });
+            }
+        });
+    }
+}
+
+// Base Strategy Interface
+class FitnessStrategy {
+    constructor(penaltyRegistry) {
+        this.penalties = penaltyRegistry;
+        this.debugMode = false;
+    }
+    
+    calculateFitness(chromosome, context) {
+        throw new Error("FitnessStrategy.calculateFitness() must be implemented");
+    }
+    
+    debugBreakdown(chromosome, context) {
+        throw new Error("FitnessStrategy.debugBreakdown() must be implemented");
+    }
+    
+    getDescription() {
+        throw new Error("FitnessStrategy.getDescription() must be implemented");
+    }
+    
+    enableDebug() {
+        this.debugMode = true;
+        return this;
+    }
+}
+
+// Normal Mode Strategy - Focus on efficiency and precision
+class NormalModeFitness extends FitnessStrategy {
+    calculateFitness(chromosome, context) {
+        const { balance, workDays, violations, minBalance, consecutiveDays, gapVariance } = context;
+        
+        // Core penalties for normal mode
+        const finalBalanceDiff = Math.abs(balance - context.targetEndingBalance);
+        const workDayPenalty = workDays * this.penalties.get('normal', 'workDay');
+        
+        // Consecutive work penalty (gap statistics come precomputed in the context)
+        const consecutivePenalty = consecutiveDays * this.penalties.get('normal', 'consecutive');
+        
+        const fitness = 
+            violations * this.penalties.get('normal', 'safetyViolations') +
+            finalBalanceDiff * this.penalties.get('normal', 'targetBalance') +
+            workDayPenalty +
+            consecutivePenalty +
+            Math.sqrt(gapVariance) * this.penalties.get('normal', 'gapVariance') +
+            (minBalance < context.minimumBalance ? 
+                Math.abs(minBalance - context.minimumBalance) * this.penalties.get('normal', 'minBalance') : 0);
+        
+        return fitness;
+    }
+    
+    debugBreakdown(chromosome, context) {
+        const { balance, workDays, violations } = context;
+        const finalBalanceDiff = Math.abs(balance - context.targetEndingBalance);
+        
+        return {
+            balanceDiffPenalty: finalBalanceDiff * this.penalties.get('normal', 'targetBalance'),
+            workDayPenalty: workDays * this.penalties.get('normal', 'workDay'),
+            safetyViolationPenalty: violations * this.penalties.get('normal', 'safetyViolations')
+        };
+    }
+    
+    getDescription() {
+        return "Normal Mode (Efficiency & Precision)";
+    }
+}
+
+// Crisis Mode Strategy - Focus on survival and meeting minimums
+class CrisisModeFitness extends FitnessStrategy {
+    calculateFitness(chromosome, context) {
+        const { balance, violations, totalEarnings, minBalance } = context;
+        
+        // Crisis mode penalties - focus on survival
+        const belowTargetPenalty = balance < context.targetEndingBalance ? 
+            (context.targetEndingBalance - balance) * this.penalties.get('crisis', 'belowTarget') : 0;
+        const aboveTargetPenalty = balance > context.targetEndingBalance ?
+            (balance - context.targetEndingBalance) * this.penalties.get('crisis', 'aboveTarget') : 0;
+        
+        // Earnings and work day requirements
+        const earningsShortfall = Math.max(0, context.requiredFlexNet - totalEarnings);
+        
+        // Calculate work day deficit (requirement comes from the optimizer's plan)
+        const workDayDeficit = Math.max(0, context.minWorkDaysNeeded - context.workDaysAfterEdit);
+        
+        const fitness = 
+            violations * this.penalties.get('crisis', 'safetyViolations') +
+            belowTargetPenalty +
+            aboveTargetPenalty +
+            earningsShortfall * this.penalties.get('crisis', 'earningsShortfall') +
+            workDayDeficit * this.penalties.get('crisis', 'workDayDeficit') +
+            (minBalance < context.minimumBalance ? 
+                Math.abs(minBalance - context.minimumBalance) * 200 : 0);
+        
+        return fitness;
+    }
+    
+    debugBreakdown(chromosome, context) {
+        const { balance, violations, totalEarnings } = context;
+        const belowTargetPenalty = balance < context.targetEndingBalance ? 
+            (context.targetEndingBalance - balance) * this.penalties.get('crisis', 'belowTarget') : 0;
+        const aboveTargetPenalty = balance > context.targetEndingBalance ?
+            (balance - context.targetEndingBalance) * this.penalties.get('crisis', 'aboveTarget') : 0;
+        const earningsShortfall = Math.max(0, context.requiredFlexNet - totalEarnings);
+        
+        return {
+            belowTargetPenalty,
+            aboveTargetPenalty, // Overshoot is OK
+            earningsShortfallPenalty: earningsShortfall * this.penalties.get('crisis', 'earningsShortfall'),
+            safetyViolationPenalty: violations * this.penalties.get('crisis', 'safetyViolations')
+        };
+    }
+    
+    getDescription() {
+        return "Crisis Mode (Survival & Requirements)";
+    }
+}
+
+// Strategy Factory - Context-aware strategy selection
+class FitnessStrategyFactory {
+    constructor() {
+        this.penaltyRegistry = new PenaltyRegistry();
+        // Shared instances for getStrategy() - strategies are stateless apart from debugMode
+        this.normalStrategy = new NormalModeFitness(this.penaltyRegistry);
+        this.crisisStrategy = new CrisisModeFitness(this.penaltyRegistry);
+    }
+    
+    getStrategy(context) {
+        return context.inCrisisMode ? this.crisisStrategy : this.normalStrategy;
+    }
+    
+    createStrategy(context) {
+        if (context.inCrisisMode) {
+            return new CrisisModeFitness(this.penaltyRegistry);
+        }
+        return new NormalModeFitness(this.penaltyRegistry);
+    }
+    
+    // For A/B testing and comparison
+    compareStrategies(chromosome, context) {
+        const normalStrategy = new NormalModeFitness(this.penaltyRegistry);
+        const crisisStrategy = new CrisisModeFitness(this.penaltyRegistry);
+        
+        const normalFitness = normalStrategy.calculateFitness(chromosome, context);
+        const crisisFitness = crisisStrategy.calculateFitness(chromosome, context);
+        
+        console.log("=== STRATEGY COMPARISON ===");
+        console.log(`Normal Mode Fitness: ${normalFitness}`);
+        console.log(`Crisis Mode Fitness: ${crisisFitness}`);
+        console.log(`Selected: ${context.inCrisisMode ? 'Crisis' : 'Normal'}`);
+        
+        return context.inCrisisMode ? crisisFitness : normalFitness;
+    }
+}
+
+// Fitness Manager - Central coordination
+class FitnessManager {
+    constructor(options = {}) {
+        this.strategyFactory = new FitnessStrategyFactory();
+        this.logger = options.logger || new Logger();
+        this.debugMode = this.logger.debugEnabled;
+        this.evaluationCount = 0;
+        
+        // Validate evaluations that are a multiple of validationStride, validationsLeft of them
+        const validation = options.validation || 'sampled';
+        const mode = typeof validation === 'string' ? validation : validation.mode;
+        if (!(mode in VALIDATION_MODES)) {
+            throw new Error(`Unknown fitness validation mode: ${mode}`);
+        }
+        const n = validation.n || VALIDATION_MODES[mode];
+        this.validationStride = mode === 'sampled' ? n : 1;
+        this.validationsLeft = mode === 'off' ? 0 : mode === 'first' ? n : Infinity;
+    }
+    
+    evaluateChromosome(chromosome, context) {
+        const strategy = this.strategyFactory.getStrategy(context);
+        const fitness = strategy.calculateFitness(chromosome, context);
+        const count = this.evaluationCount++;
+        
+        // Validate fitness value
+        if (this.validationsLeft > 0 && count % this.validationStride === 0) {
+            this.validationsLeft--;
+            FitnessValidator.validate(fitness, strategy, context, this.logger);
+        }
+        
+        // Breakdown of every 100th evaluation - a counter, so it never touches the optimizer's random stream
+        if (this.debugMode && count % 100 === 0) {
+            this.logger.debug('fitness breakdown', {
+                strategy: strategy.getDescription(),
+                workDays: context.workDays,
+                balance: context.balance,
+                ...strategy.debugBreakdown(chromosome, context),
+                fitness
+            });
+        }
+        
+        return fitness;
+    }
+    
+    enableDebug() {
+        // Breakdowns are logged at debug level - raise the logger to it if needed
+        if (!this.logger.debugEnabled) {
+            this.logger = new Logger('debug', this.logger.sink);
+        }
+        this.debugMode = true;
+        return this;
+    }
+    
+    compareStrategies(chromosome, context) {
+        return this.strategyFactory.compareStrategies(chromosome, context);
+    }
+}
+
+// CommonJS export for Node; browsers and workers use the globals above
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = {
+        GENE,
+        GENE_COUNT,
+        GENE_NAMES,
+        SELECTION_MODES,
+        SeededRandom,
+        ConvergenceTelemetry,
+        Logger,
+        LOG_LEVELS,
+        FitnessCache,
+        BalanceTree,
+        ImprovedGeneticOptimizer,
+        ExactScheduleSolver,
+        RollingHorizonPlanner,
+        createOptimizer,
+        serializeResult,
+        buildCalendar,
+        PenaltyRegistry,
+        FitnessValidator,
+        FitnessStrategy,
+        NormalModeFitness,
+        CrisisModeFitness,
+        FitnessStrategyFactory,
+        FitnessManager
+    };
+}
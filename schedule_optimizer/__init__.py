@@ -0,0 +1,27 @@
+"""
+NumPy port of the schedule optimizer in optimizer.js.
+
+The browser engine scores one chromosome at a time. This package keeps the
+same model - shifts, bills, deposits, manual constraints, balance edits and
+the normal/crisis penalty weights - but holds the population as a
+(population, days + 1) gene matrix and scores every row in one pass.
+
+    from schedule_optimizer import optimize
+    result = optimize({"startingBalance": 90.50, "targetEndingBalance": 490.50})
+"""
+
+from .engine import VectorizedOptimizer, optimize
+from .fitness import PenaltyRegistry, evaluate_population, gap_statistics
+from .model import GENE_NAMES, ScheduleModel, build_calendar, encode_shifts
+
+__all__ = [
+    "GENE_NAMES",
+    "PenaltyRegistry",
+    "ScheduleModel",
+    "VectorizedOptimizer",
+    "build_calendar",
+    "encode_shifts",
+    "evaluate_population",
+    "gap_statistics",
+    "optimize",
+]
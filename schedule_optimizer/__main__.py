@@ -0,0 +1,44 @@
+"""
+python -m schedule_optimizer [config.json | -] [--seed N] [--progress] [--compact]
+
+Runs the NumPy engine on a config shaped like the one index.html builds
+(the same input optimize-cli.js takes) and prints the result as JSON.
+"""
+
+import argparse
+import json
+import sys
+
+from .engine import optimize
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m schedule_optimizer",
+                                     description="NumPy schedule optimizer")
+    parser.add_argument("config", nargs="?", help="config JSON file, or - for stdin")
+    parser.add_argument("--seed", type=int, help="random seed for a reproducible run")
+    parser.add_argument("--progress", action="store_true",
+                        help="stream progress reports to stderr as JSON lines")
+    parser.add_argument("--population", action="store_true",
+                        help="include finalPopulation in the output")
+    parser.add_argument("--compact", action="store_true", help="print the result as a single line")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        text = sys.stdin.read() if args.config == "-" else open(args.config).read()
+        config = json.loads(text) if text.strip() else {}
+
+    def report(progress):
+        sys.stderr.write(json.dumps({"type": "progress", **progress}) + "\n")
+
+    result = optimize(config, report if args.progress else None, seed=args.seed)
+    if not args.population:
+        del result["finalPopulation"]
+    json.dump(result, sys.stdout, indent=None if args.compact else 2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Benchmark suite for ImprovedGeneticOptimizer on the scenarios the test
+scripts check by hand: the $90.50 -> $490.50 month, and balance edits on
+top of it - day 17 to $10 (crisis regeneration), day 5 to $0 and day 10 to
+$750.
+
+    python -m schedule_optimizer.benchmark                 # run, compare with the baseline
+    python -m schedule_optimizer.benchmark --save          # run and make it the baseline
+    python -m schedule_optimizer.benchmark --compare run.json
+
+Edits lock the days up to the edited one to a reference schedule, as
+regenerateWithEdits() does in the browser. The reference is the exact
+engine's baseline plan, so every run edits the same month. Each scenario
+runs --runs times through optimize-cli.js, one process per run and one run
+at a time, with seed, seed + 1, ... in the config - the engine is seeded,
+so everything but time and memory repeats exactly. The medians of wall
+time, optimizer time, generations run (to convergence), evaluations per
+second, final fitness and peak memory, and the fraction of runs that
+reached a feasible schedule, are written to a JSON baseline; comparing
+flags every metric that got worse by more than --tolerance and exits 1
+if any did. Reports with different --runs are compared with a warning.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from .cache import ROOT_DIR, engine_version
+from .runner import CLI
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmark-baseline.json")
+FORMAT_VERSION = 2
+
+BASE_CONFIG = {"startingBalance": 90.50, "targetEndingBalance": 490.50, "minimumBalance": 0,
+               "populationSize": 100, "generations": 500}
+
+# name: (description, day edited, new balance for that day); day None means no edit
+SCENARIOS = {
+    "baseline": ("$90.50 -> $490.50 month", None, None),
+    "day17-ten": ("day 17 edited to $10 (crisis)", 17, 10),
+    "day5-zero": ("day 5 edited to $0", 5, 0),
+    "day10-750": ("day 10 edited to $750", 10, 750),
+}
+
+# metric: True if lower is better
+METRICS = {
+    "wallTime": True,
+    "computationTime": True,
+    "generations": True,
+    "evaluationsPerSecond": False,
+    "bestFitness": True,
+    "peakMemory": True,
+    "feasibleRate": False,
+}
+
+
+def run_cli(config):
+    """One optimize-cli.js run; returns (result, wall seconds)"""
+    start = time.perf_counter()
+    completed = subprocess.run(["node", CLI, "-", "--compact"], input=json.dumps(config),
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout), time.perf_counter() - start
+
+
+def reference_schedule():
+    """The exact engine's plan for the base month - deterministic, so edits always lock the same days"""
+    result, _ = run_cli({**BASE_CONFIG, "engine": "exact"})
+    return ["+".join(day["shifts"]) or None for day in result["formattedSchedule"]]
+
+
+def scenario_config(name, reference):
+    """The config for a scenario, days up to the edited one locked to reference"""
+    _, edit_day, balance = SCENARIOS[name]
+    config = copy.deepcopy(BASE_CONFIG)
+    if edit_day is not None:
+        constraints = {str(day): {"shifts": shifts} for day, shifts in enumerate(reference[:edit_day], 1)}
+        constraints["balanceEditDay"] = edit_day
+        constraints["newStartingBalance"] = balance
+        config["manualConstraints"] = constraints
+    return config
+
+
+def measure(config):
+    """Run config once and return its sample"""
+    result, wall_time = run_cli(config)
+    return {
+        "seed": config.get("seed"),
+        "wallTime": wall_time,
+        "computationTime": result["computationTime"],
+        "generations": result.get("generations"),
+        "firstFeasibleGeneration": result.get("firstFeasibleGeneration"),
+        "evaluations": result.get("evaluations"),
+        "evaluationsPerSecond": (result["evaluations"] / result["computationTime"]
+                                 if result.get("evaluations") and result["computationTime"] else None),
+        "bestFitness": result["bestFitness"],
+        "finalBalance": result["finalBalance"],
+        "violations": result["violations"],
+        "peakMemory": result.get("peakMemory"),
+    }
+
+
+def summarize(samples):
+    """Medians over the runs, and the fraction of runs that reached a feasible schedule"""
+    metrics = {}
+    for metric in METRICS:
+        values = [sample[metric] for sample in samples if sample.get(metric) is not None]
+        metrics[metric] = statistics.median(values) if values else None
+    feasible = sum(sample["firstFeasibleGeneration"] is not None for sample in samples)
+    metrics["feasibleRate"] = feasible / len(samples) if samples else None
+    return metrics
+
+
+def run_suite(names=None, runs=5, seed=1, overrides=None, progress=None):
+    """Run the named scenarios (all by default); returns the report that --save writes"""
+    reference = reference_schedule()
+    report = {
+        "formatVersion": FORMAT_VERSION,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "engineVersion": engine_version({}),
+        "host": {"platform": platform.platform(), "python": platform.python_version(),
+                 "node": subprocess.run(["node", "--version"], capture_output=True, text=True).stdout.strip(),
+                 "cpus": os.cpu_count()},
+        "runs": runs,
+        "seed": seed,
+        "scenarios": {},
+    }
+    for name in names or SCENARIOS:
+        config = {**scenario_config(name, reference), **(overrides or {})}
+        samples = []
+        for run in range(runs):
+            samples.append(measure({**config, "seed": seed + run}))
+            if progress:
+                progress(name, run + 1, runs)
+        report["scenarios"][name] = {"description": SCENARIOS[name][0], "config": config,
+                                     "metrics": summarize(samples), "samples": samples}
+    return report
+
+
+def compare(current, baseline, tolerance=0.20):
+    """
+    One row per scenario and metric both reports have:
+    (scenario, metric, baseline value, current value, relative change, verdict).
+    The verdict is 'regression' or 'improvement' past tolerance, else 'ok'.
+    """
+    rows = []
+    for name, scenario in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        for metric, lower_is_better in METRICS.items():
+            before, after = previous["metrics"].get(metric), scenario["metrics"].get(metric)
+            if before is None and after is None:
+                continue
+            if before is None or after is None:
+                # Reaching a feasible schedule at all, or no longer reaching one
+                verdict = "improvement" if after is not None else "regression"
+                rows.append((name, metric, before, after, None, verdict))
+                continue
+            change = (after - before) / max(abs(before), 1e-9)
+            worse = change > 0 if lower_is_better else change < 0
+            if metric == "feasibleRate":
+                verdict = "ok" if after == before else "regression" if worse else "improvement"
+            elif abs(change) <= tolerance:
+                verdict = "ok"
+            else:
+                verdict = "regression" if worse else "improvement"
+            rows.append((name, metric, before, after, change, verdict))
+    return rows
+
+
+def format_value(metric, value):
+    if value is None:
+        return "-"
+    if metric == "peakMemory":
+        return f"{value / (1 << 20):.1f} MB"
+    if metric == "feasibleRate":
+        return f"{value:.0%}"
+    if metric in ("wallTime", "computationTime"):
+        return f"{value * 1000:.0f} ms"
+    if metric == "evaluationsPerSecond":
+        return f"{value:,.0f}/s"
+    if isinstance(value, float) and not value.is_integer():
+        return f"{value:.2f}"
+    return f"{value:g}"
+
+
+def print_report(report, out=None):
+    out = out or sys.stdout
+    for name, scenario in report["scenarios"].items():
+        metrics = scenario["metrics"]
+        out.write(f"{name:<11} {scenario['description']}\n")
+        out.write("            " + ", ".join(f"{metric} {format_value(metric, metrics[metric])}"
+                                           for metric in METRICS) + "\n")
+
+
+def print_comparison(rows, out=None):
+    out = out or sys.stdout
+    marks = {"ok": " ", "regression": "!", "improvement": "+"}
+    for name, metric, before, after, change, verdict in rows:
+        delta = "" if change is None else f"{change:+.1%}"
+        out.write(f"{marks[verdict]} {name:<11} {metric:<24} {format_value(metric, before):>12} -> "
+                  f"{format_value(metric, after):<12} {delta:>8}  {verdict if verdict != 'ok' else ''}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m schedule_optimizer.benchmark",
+                                     description="Benchmark the genetic optimizer on fixed scenarios")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="run only this scenario (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="runs per scenario (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first run (default: 1)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline file (default: benchmark-baseline.json)")
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--output", "-o", help="also write this run's report here")
+    parser.add_argument("--compare", metavar="REPORT",
+                        help="compare a saved report with the baseline instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="relative change allowed before a metric counts as a regression (default: 0.20)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare) as f:
+            report = json.load(f)
+    else:
+        def progress(name, run, runs):
+            sys.stderr.write(f"\r{name}: run {run}/{runs}   ")
+            sys.stderr.flush()
+
+        report = run_suite(args.scenario, args.runs, args.seed, progress=progress)
+        sys.stderr.write("\n")
+        print_report(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+        if args.save:
+            with open(args.baseline, "w") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+            sys.stderr.write(f"Saved baseline {args.baseline}\n")
+            return 0
+
+    if not os.path.exists(args.baseline):
+        sys.stderr.write(f"No baseline at {args.baseline} - run with --save to create one\n")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("formatVersion") != FORMAT_VERSION:
+        sys.stdout.write(f"Baseline format {baseline.get('formatVersion')} is not {FORMAT_VERSION} - "
+                         f"re-create it with --save\n")
+    if baseline["runs"] != report["runs"]:
+        sys.stdout.write(f"Runs per scenario differ ({baseline['runs']} in the baseline, {report['runs']} here) - "
+                         f"medians are less comparable\n")
+    if baseline["engineVersion"] != report["engineVersion"]:
+        sys.stdout.write(f"Engine changed since the baseline ({baseline['engineVersion']} -> "
+                         f"{report['engineVersion']})\n")
+    rows = compare(report, baseline, args.tolerance)
+    print_comparison(rows)
+    regressions = sum(verdict == "regression" for *_, verdict in rows)
+    sys.stdout.write(f"{regressions} regression(s) against {args.baseline} "
+                     f"(tolerance {args.tolerance:.0%})\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
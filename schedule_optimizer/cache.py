@@ -0,0 +1,165 @@
+"""
+Persistent optimization result cache.
+
+A request is keyed by its canonical form: the config with keys sorted,
+manualConstraints keyed by day as strings, integral floats written as
+integers and the default engine spelled out, plus the seed and a version
+of the engine that would run it (a hash of its source files). Results are
+stored as the exact JSON bytes the API sends, in SQLite, and evicted least
+recently used once the stored bytes pass max_bytes.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(PACKAGE_DIR)
+
+ENGINE_SOURCES = {
+    "node": [os.path.join(ROOT_DIR, "optimizer.js"), os.path.join(ROOT_DIR, "optimize-cli.js")],
+    "numpy": [os.path.join(PACKAGE_DIR, name) for name in ("model.py", "fitness.py", "engine.py")],
+}
+
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def engine_version(config):
+    """Hash of the source files of the engine config runs on; rehashed when they change"""
+    sources = ENGINE_SOURCES["numpy" if config.get("engine") == "numpy" else "node"]
+    stamp = tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in sources)
+    with _versions_lock:
+        cached = _versions.get(tuple(sources))
+        if cached and cached[0] == stamp:
+            return cached[1]
+    digest = hashlib.sha256()
+    for path in sources:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    version = digest.hexdigest()[:16]
+    with _versions_lock:
+        _versions[tuple(sources)] = (stamp, version)
+    return version
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def request_key(config):
+    """Cache key of an optimization request"""
+    config = _canonical(config)
+    config.setdefault("engine", "genetic")
+    seed = config.pop("seed", None)
+    material = {"config": config, "seed": seed, "engineVersion": engine_version(config)}
+    text = json.dumps(material, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed map from request key to result JSON bytes"""
+
+    def __init__(self, path, max_bytes=64 << 20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created REAL NOT NULL,
+            last_used REAL NOT NULL)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.bytes, self.entries = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM results").fetchone()
+        self.hits = 0
+        self.misses = 0
+        # Hits only note the time here; it reaches the table with the next write
+        self.touched = {}
+
+    def get(self, key):
+        """Stored result bytes, or None"""
+        with self.lock:
+            row = self.db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.touched[key] = time.time()
+            return row[0]
+
+    def put(self, key, value):
+        """Store result bytes (or a JSON-serializable result) and evict down to max_bytes"""
+        if not isinstance(value, bytes):
+            value = json.dumps(value).encode()
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN")
+            try:
+                self._flush_touched()
+                old = self.db.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+                if old:
+                    self.bytes -= old[0]
+                    self.entries -= 1
+                self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                (key, value, len(value), now, now))
+                self.bytes += len(value)
+                self.entries += 1
+                self._evict()
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hitRatio": self.hits / lookups if lookups else 0.0,
+                    "entries": self.entries, "bytes": self.bytes, "maxBytes": self.max_bytes}
+
+    def describe(self):
+        """One-line summary for the server log"""
+        stats = self.stats()
+        return (f"hit ratio {stats['hitRatio']:.0%} ({stats['hits']}/{stats['hits'] + stats['misses']}), "
+                f"{stats['entries']} entries, {stats['bytes'] / 1024:.1f} KB stored")
+
+    def close(self):
+        with self.lock:
+            self._flush_touched()
+            self.db.close()
+
+    def _flush_touched(self):
+        # Caller holds self.lock
+        if self.touched:
+            self.db.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                                [(used, key) for key, used in self.touched.items()])
+            self.touched.clear()
+
+    def _evict(self):
+        # Caller holds self.lock, inside a transaction
+        while self.bytes > self.max_bytes:
+            rows = self.db.execute("SELECT key, size FROM results ORDER BY last_used LIMIT 32").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self.bytes <= self.max_bytes:
+                    break
+                self.db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.bytes -= size
+                self.entries -= 1
@@ -0,0 +1,236 @@
+"""
+Population-matrix genetic optimizer - the search of ImprovedGeneticOptimizer
+with every generation built and scored as one NumPy matrix instead of one
+chromosome at a time.
+"""
+
+import time
+
+import numpy as np
+
+from .fitness import PenaltyRegistry, evaluate_population
+from .model import (
+    GENE_COUNT, GENE_NAMES, LARGE, LARGE_LARGE, MEDIUM, MEDIUM_LARGE,
+    MEDIUM_MEDIUM, OFF, SMALL, ScheduleModel,
+)
+
+# Gene distributions of the JS operators, as (genes, cumulative probabilities)
+CRISIS_WORK = (np.array([LARGE_LARGE, MEDIUM_LARGE, MEDIUM_MEDIUM]), np.array([0.3, 0.7, 1.0]))
+NORMAL_SINGLE = (np.array([SMALL, MEDIUM, LARGE]), np.array([0.2, 0.7, 1.0]))
+NORMAL_MUTATION = (np.array([OFF, MEDIUM, MEDIUM_MEDIUM, LARGE]), np.array([0.2, 0.5, 0.7, 0.85]))
+CRISIS_FORCE_WORK = (np.array([LARGE_LARGE, MEDIUM_LARGE, MEDIUM_MEDIUM]), np.array([0.4, 0.8, 1.0]))
+CRISIS_UPGRADE = (np.array([OFF, LARGE_LARGE, MEDIUM_LARGE, MEDIUM_MEDIUM]),
+                  np.array([0.1, 0.3, 0.6, 0.8]))
+
+# Second shift added to a single small/medium shift: GENE_PAIRS in optimizer.js
+DOUBLE_WITH = np.zeros((GENE_COUNT, GENE_COUNT), dtype=np.int8)
+for _first, _second in ((SMALL, SMALL), (SMALL, MEDIUM), (MEDIUM, SMALL), (MEDIUM, MEDIUM)):
+    DOUBLE_WITH[_first, _second] = GENE_NAMES.index(
+        "+".join(sorted((GENE_NAMES[_first], GENE_NAMES[_second]), key=["small", "medium"].index)))
+
+
+def pick(rng, distribution, shape):
+    """Draw genes from a (genes, cumulative) table; draws past the last bound keep -1"""
+    genes, bounds = distribution
+    index = np.searchsorted(bounds, rng.random(shape), side="right")
+    return np.where(index < len(genes), genes[np.minimum(index, len(genes) - 1)], -1)
+
+
+class VectorizedOptimizer:
+    """Genetic optimizer over a (population, days + 1) gene matrix"""
+
+    engine = "numpy"
+
+    def __init__(self, config=None, seed=None):
+        config = config or {}
+        self.config = config
+        self.model = ScheduleModel(config)
+        self.penalties = PenaltyRegistry()
+        self.population_size = config.get("populationSize") or 200
+        self.generations = config.get("generations") or 1000
+        self.mutation_rate = 0.15
+        self.elite_size = min(self.population_size, max(30, self.population_size // 5))
+        self.tournament_size = 7
+        self.seed_population = config.get("seedPopulation")
+        self.rng = np.random.default_rng(seed if seed is not None else config.get("seed"))
+        self.evaluations = 0
+        self.cancel_requested = False
+
+    def evaluate(self, genes):
+        self.evaluations += len(genes)
+        return evaluate_population(self.model, genes, self.penalties)
+
+    def generate_population(self, count):
+        """Random chromosomes with the work/shift mix of generateChromosome()"""
+        model = self.model
+        rng = self.rng
+        days = model.days + 1
+        genes = np.zeros((count, days), dtype=np.int8)
+        mutable = model.mutable_mask
+
+        if model.in_crisis_mode:
+            works = rng.random((count, days)) < 0.95
+            shifts = pick(rng, CRISIS_WORK, (count, days))
+        else:
+            # Per-chromosome work probability for population diversity
+            probability = np.clip(
+                model.base_work_probability + (rng.random((count, 1)) - 0.5) * 0.3, 0.1, 0.95)
+            works = rng.random((count, days)) < probability
+            shifts = pick(rng, NORMAL_SINGLE, (count, days))
+            doubles = (rng.random((count, days)) < 0.3) & (shifts != LARGE)
+            second = np.where(rng.random((count, days)) < 0.5, SMALL, MEDIUM)
+            shifts = np.where(doubles, DOUBLE_WITH[shifts, second], shifts)
+        genes[:, mutable] = np.where(works, shifts, OFF)[:, mutable]
+
+        # Cover the minimum work days - turn random days off into work days
+        if model.in_crisis_mode:
+            genes = self.fill_work_days(genes)
+        return model.effective_genes(genes)
+
+    def fill_work_days(self, genes):
+        """Rows short of min_work_days_needed get work on random days off"""
+        model = self.model
+        mutable = model.mutable_mask
+        count = len(genes)
+        short = model.min_work_days_needed - (genes[:, model.start_day:] != OFF).sum(axis=1)
+        if not (short > 0).any():
+            return genes
+        # Random order of the days off in each row; the first `short` of them start working
+        priority = np.where((genes == OFF) & mutable, self.rng.random(genes.shape), np.inf)
+        rank = np.argsort(np.argsort(priority, axis=1), axis=1)
+        add = (rank < short[:, None]) & np.isfinite(priority)
+        return np.where(add, pick(self.rng, CRISIS_WORK, genes.shape), genes).astype(np.int8)
+
+    def select_parents(self, fitness, count):
+        """Tournament selection: count winners of tournament_size random entrants"""
+        entrants = self.rng.integers(0, len(fitness), size=(count, self.tournament_size))
+        return entrants[np.arange(count), np.argmin(fitness[entrants], axis=1)]
+
+    def crossover(self, parents1, parents2):
+        """Two-point crossover of each row pair"""
+        count, days = parents1.shape
+        points = np.sort(self.rng.integers(1, days, size=(count, 2)), axis=1)
+        columns = np.arange(days)
+        segment = (columns >= points[:, :1]) & (columns <= points[:, 1:])
+        return np.where(segment, parents2, parents1)
+
+    def mutate(self, genes):
+        """Per-day mutation with the mode's gene distribution; constrained days never change"""
+        model = self.model
+        rng = self.rng
+        shape = genes.shape
+        mutating = (rng.random(shape) < self.mutation_rate) & model.mutable_mask
+        if model.in_crisis_mode:
+            working = genes != OFF
+            need_more = ((genes[:, model.start_day:] != OFF).sum(axis=1)
+                         < model.min_work_days_needed)[:, None]
+            forced = pick(rng, CRISIS_FORCE_WORK, shape)
+            upgraded = pick(rng, CRISIS_UPGRADE, shape)
+            upgraded = np.where(upgraded < 0, genes, upgraded)
+            extra = np.where(rng.random(shape) < 0.3, MEDIUM_MEDIUM, OFF)
+            mutated = np.where(working, upgraded, np.where(need_more, forced, extra))
+        else:
+            mutated = pick(rng, NORMAL_MUTATION, shape)
+            mutated = np.where(mutated < 0, rng.integers(0, GENE_COUNT, size=shape), mutated)
+        return np.where(mutating, mutated, genes).astype(np.int8)
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def optimize(self, progress_callback=None):
+        model = self.model
+        population = np.zeros((0, model.days + 1), dtype=np.int8)
+
+        # Warm start: previous run's survivors under the current constraints
+        if self.seed_population is not None and len(self.seed_population):
+            seeds = np.array(self.seed_population[:self.population_size], dtype=np.int8)
+            population = model.effective_genes(seeds)
+        warm_started = len(population) > 0
+        population = np.concatenate(
+            [population, self.generate_population(self.population_size - len(population))])
+        scores = self.evaluate(population)
+
+        best_ever_fitness = np.inf
+        generations_without_improvement = 0
+        max_generations_without_improvement = 25 if warm_started else 150
+        min_generations = 30 if warm_started else 300
+        offspring = self.population_size - self.elite_size
+
+        for gen in range(self.generations):
+            best = int(np.argmin(scores["fitness"]))
+            best_fitness = float(scores["fitness"][best])
+
+            if progress_callback and gen % 50 == 0:
+                progress_callback({
+                    "generation": gen,
+                    "progress": gen / self.generations * 100,
+                    "bestFitness": best_fitness,
+                    "workDays": int(scores["workDays"][best]),
+                    "balance": float(scores["balance"][best]),
+                    "violations": int(scores["violations"][best]),
+                    "fitnessCache": None,
+                })
+
+            if self.cancel_requested:
+                break
+
+            if best_fitness < best_ever_fitness * 0.99:
+                best_ever_fitness = best_fitness
+                generations_without_improvement = 0
+            else:
+                generations_without_improvement += 1
+
+            # Early termination if converged with valid solution
+            if (gen > min_generations
+                    and generations_without_improvement > max_generations_without_improvement
+                    and scores["violations"][best] == 0
+                    and scores["balance"][best] >= model.target_ending_balance - 5):
+                break
+
+            # Elitism plus one matrix of children per generation
+            elite = np.argpartition(scores["fitness"], self.elite_size - 1)[:self.elite_size]
+            parents = self.select_parents(scores["fitness"], 2 * offspring)
+            children = self.mutate(self.crossover(population[parents[:offspring]],
+                                                  population[parents[offspring:]]))
+            child_scores = self.evaluate(children)
+            population = np.concatenate([population[elite], children])
+            scores = {key: np.concatenate([value[elite], child_scores[key]])
+                      for key, value in scores.items()}
+
+        order = np.argsort(scores["fitness"], kind="stable")
+        result = self.create_result(population[order[0]], {key: value[order[0]]
+                                                           for key, value in scores.items()})
+        result["finalPopulation"] = population[order[:self.elite_size]].tolist()
+        return result
+
+    def create_result(self, chromosome, score):
+        """Result in the shape of serializeResult() in optimizer.js"""
+        model = self.model
+        formatted = model.format_schedule(chromosome)
+        schedule = [None] + [GENE_NAMES[gene] for gene in chromosome[1:]]
+        return {
+            "engine": self.engine,
+            "schedule": schedule,
+            "genes": chromosome.tolist(),
+            "workDays": [day for day in range(1, model.days + 1) if formatted[day - 1]["shifts"]],
+            "totalEarnings": float(score["totalEarnings"]),
+            "finalBalance": float(score["balance"]),
+            "minBalance": float(score["minBalance"]),
+            "violations": int(score["violations"]),
+            "bestFitness": float(score["fitness"]),
+            "fitnessCache": None,
+            "selectionMode": "tournament",
+            "months": model.summarize_months(formatted),
+            "cancelled": self.cancel_requested,
+            "formattedSchedule": formatted,
+        }
+
+
+def optimize(config=None, progress_callback=None, seed=None):
+    """Run the vectorized optimizer on a config dict; returns the result dict"""
+    optimizer = VectorizedOptimizer(config, seed=seed)
+    start = time.perf_counter()
+    result = optimizer.optimize(progress_callback)
+    result["computationTime"] = time.perf_counter() - start
+    result["evaluations"] = optimizer.evaluations
+    return result
@@ -0,0 +1,147 @@
+"""
+Vectorized fitness - scores a whole population (one chromosome per row) at
+once with the same formulas as NormalModeFitness / CrisisModeFitness and
+evaluateFitness() in optimizer.js.
+"""
+
+import numpy as np
+
+from .model import GENE_NET_CENTS, OFF
+
+
+class PenaltyRegistry:
+    """Penalty weights per fitness mode (PenaltyRegistry in optimizer.js)"""
+
+    def __init__(self):
+        self.penalties = {
+            "normal": {
+                "balanceConstraint": 10000,
+                "workDay": 30,
+                "consecutive": 75,
+                "minBalance": 100,
+                "targetBalance": 20,
+                "gapVariance": 50,
+                "safetyViolations": 5000,
+            },
+            "crisis": {
+                "balanceConstraint": 0.01,  # Minimal in crisis
+                "workDay": 0,               # Don't penalize work
+                "belowTarget": 1000,        # Heavy penalty for shortfall
+                "aboveTarget": 0.1,         # Tiny penalty for overshoot
+                "earningsShortfall": 100,   # Must earn enough
+                "workDayDeficit": 1000,     # Must work enough days
+                "safetyViolations": 10000,  # Enhanced safety
+            },
+        }
+
+    def get(self, mode, penalty_type):
+        return self.penalties.get(mode, {}).get(penalty_type, 0)
+
+    def set(self, mode, penalty_type, value):
+        self.penalties.setdefault(mode, {})[penalty_type] = value
+
+
+def gap_statistics(work, first_day=1):
+    """
+    Per-row consecutive-day count and gap mean/variance between work days.
+
+    work is a (pop, days) boolean matrix; column j is day first_day + j.
+    Each work day's gap is its distance to the previous work day in the row,
+    found with a running maximum over the work-day positions.
+    """
+    pop, days = work.shape
+    positions = np.arange(first_day, first_day + days)
+    last_work = np.maximum.accumulate(np.where(work, positions, 0), axis=1)
+    previous = np.zeros_like(last_work)
+    previous[:, 1:] = last_work[:, :-1]
+    gaps = np.where(work & (previous > 0), positions - previous, 0)
+
+    has_gap = gaps > 0
+    gap_count = has_gap.sum(axis=1)
+    gap_sum = gaps.sum(axis=1)
+    gap_sum_squares = (gaps * gaps).sum(axis=1)
+    consecutive_days = (gaps == 1).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gap_mean = np.where(gap_count > 0, gap_sum / np.maximum(gap_count, 1), 0.0)
+        gap_variance = np.where(
+            gap_count > 0,
+            np.maximum(0.0, gap_sum_squares / np.maximum(gap_count, 1) - gap_mean * gap_mean),
+            0.0,
+        )
+    return consecutive_days, gap_mean, gap_variance
+
+
+def evaluate_population(model, genes, penalties=None):
+    """
+    Score every row of genes, a (pop, days + 1) matrix of gene codes laid
+    out like the JS chromosome (column 0 unused). Returns a dict of per-row
+    arrays: fitness, balance, workDays, violations, totalEarnings, minBalance.
+    """
+    penalties = penalties or PenaltyRegistry()
+    genes = np.asarray(genes)
+    prefix = model.locked_prefix
+    start = model.start_day
+    free = genes[:, start:]
+
+    # Balances of the free days: one cumulative sum per row, in cents
+    flow = GENE_NET_CENTS[free] + model.base_flow_cents[start:]
+    initial = prefix["balance_cents"]
+    balances = initial + np.cumsum(flow, axis=1)
+    final_cents = balances[:, -1]
+    min_cents = np.minimum(prefix["min_balance_cents"], balances.min(axis=1))
+    violations = prefix["violations"] + (balances < model.minimum_balance_cents).sum(axis=1)
+
+    working = free != OFF
+    earnings_cents = prefix["earnings_cents"] + np.where(working, GENE_NET_CENTS[free], 0).sum(axis=1)
+    work_days_after_edit = working.sum(axis=1)
+    work_days = prefix["work_days"] + work_days_after_edit
+
+    # Gap statistics run over the whole horizon - locked days count too
+    all_work = model.constraint_genes[1:start] != OFF
+    work = np.concatenate([np.broadcast_to(all_work, (len(genes), start - 1)), working], axis=1)
+    consecutive_days, _, gap_variance = gap_statistics(work)
+
+    balance_constraint_violations = np.full(len(genes), prefix["balance_constraint_violations"])
+    if len(model.fixed_balance_days):
+        day_balances = balances[:, model.fixed_balance_days - start] / 100
+        diff = np.abs(day_balances - model.fixed_balance_targets)
+        balance_constraint_violations += np.where(diff > 0.01, diff * 1000, 0).sum(axis=1)
+
+    balance = final_cents / 100
+    total_earnings = earnings_cents / 100
+    min_balance = min_cents / 100
+    target = model.target_ending_balance
+    minimum = model.minimum_balance
+
+    if model.in_crisis_mode:
+        fitness = (
+            violations * penalties.get("crisis", "safetyViolations")
+            + np.where(balance < target, (target - balance) * penalties.get("crisis", "belowTarget"), 0)
+            + np.where(balance > target, (balance - target) * penalties.get("crisis", "aboveTarget"), 0)
+            + np.maximum(0, model.required_flex_net - total_earnings)
+            * penalties.get("crisis", "earningsShortfall")
+            + np.maximum(0, model.min_work_days_needed - work_days_after_edit)
+            * penalties.get("crisis", "workDayDeficit")
+            + np.where(min_balance < minimum, np.abs(min_balance - minimum) * 200, 0)
+        )
+        constraint_penalty_multiplier = 0.01
+    else:
+        fitness = (
+            violations * penalties.get("normal", "safetyViolations")
+            + np.abs(balance - target) * penalties.get("normal", "targetBalance")
+            + work_days * penalties.get("normal", "workDay")
+            + consecutive_days * penalties.get("normal", "consecutive")
+            + np.sqrt(gap_variance) * penalties.get("normal", "gapVariance")
+            + np.where(min_balance < minimum,
+                       np.abs(min_balance - minimum) * penalties.get("normal", "minBalance"), 0)
+        )
+        constraint_penalty_multiplier = 10000
+
+    return {
+        "fitness": fitness + balance_constraint_violations * constraint_penalty_multiplier,
+        "balance": balance,
+        "workDays": work_days,
+        "violations": violations,
+        "totalEarnings": total_earnings,
+        "minBalance": min_balance,
+    }
@@ -0,0 +1,285 @@
+"""
+Optimization job queue - runs are submitted, polled and cancelled by id
+instead of holding a connection open. At most max_concurrent jobs run at
+a time and at most max_queued wait; past that, submit() raises QueueFull
+straight away so an overloaded server answers quickly instead of piling up
+work. Identical requests share one run while it is in flight, and with a
+ResultCache a request that was answered before finishes at submit()
+without running.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import request_key
+from .runner import OptimizationCancelled, OptimizationError, run_optimization
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class QueueFull(Exception):
+    """Every worker is busy and the queue is at max_queued"""
+
+
+class Job:
+    """One optimization request and its state"""
+
+    def __init__(self, config):
+        self.id = uuid.uuid4().hex[:12]
+        self.config = config
+        self.status = QUEUED
+        self.progress = None
+        self.result = None
+        self.result_bytes = None
+        self.key = None
+        self.cached = False
+        self.requesters = 1
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.future = None
+        # Bumped on every progress report and on finishing; watchers wait on it
+        self.sequence = 0
+        self.updated = threading.Condition()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; True if it did"""
+        return self.done_event.wait(timeout)
+
+    def publish(self, progress=None):
+        """Record a progress report (or just a status change) and wake the watchers"""
+        with self.updated:
+            if progress is not None:
+                self.progress = progress
+            self.sequence += 1
+            self.updated.notify_all()
+
+    def next_update(self, after, timeout=None):
+        """
+        Wait until the job has changed since sequence `after`; returns the
+        current sequence. Only the latest state is kept, so a watcher that
+        falls behind skips the reports in between instead of queueing them.
+        """
+        with self.updated:
+            self.updated.wait_for(lambda: self.sequence != after, timeout)
+            return self.sequence
+
+    def to_dict(self, include_result=True):
+        payload = {
+            "id": self.id,
+            "status": self.status,
+            "requesters": self.requesters,
+            "progress": self.progress,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+        if self.cached:
+            payload["cached"] = True
+        if self.error is not None:
+            payload["error"] = self.error
+        if include_result and self.result_json() is not None:
+            payload["result"] = self.result
+        return payload
+
+    def result_json(self):
+        """The result, decoding cached bytes on first use"""
+        if self.result is None and self.result_bytes is not None:
+            self.result = json.loads(self.result_bytes)
+        return self.result
+
+
+class JobQueue:
+    """Bounded executor for optimization jobs"""
+
+    def __init__(self, max_concurrent=None, max_queued=16, retain=100, log=None, cache=None):
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.max_queued = max_queued
+        self.retain = retain
+        self.cache = cache
+        self.log = log or (lambda message, level="INFO": None)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                           thread_name_prefix="optimizer")
+        self.jobs = OrderedDict()
+        self.inflight = {}  # request key -> queued or running job
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.coalesced = 0
+
+    def stats(self):
+        with self.lock:
+            return {"active": self.active, "queued": self.queued, "coalesced": self.coalesced,
+                    "maxConcurrent": self.max_concurrent, "maxQueued": self.max_queued}
+
+    def submit(self, config):
+        """
+        Queue an optimization; raises QueueFull when over capacity. A request
+        identical to a queued or running one joins that job instead - the
+        same id, progress and result - and a cached request comes back done.
+        """
+        job = Job(config)
+        try:
+            job.key = request_key(config)
+        except (OSError, TypeError, ValueError) as e:
+            self.log(f"Cannot key job {job.id} - it runs on its own: {e}", "WARNING")
+        if job.key is not None:
+            leader = self._join(job.key)
+            if leader:
+                return leader
+            if self.cache is not None and self._from_cache(job):
+                return job
+        with self.lock:
+            # Checked again under the lock - an identical request may have been queued meanwhile
+            leader = self._join_locked(job.key)
+            if leader is None:
+                if self.active + self.queued >= self.max_concurrent + self.max_queued:
+                    raise QueueFull(f"{self.active} jobs running and {self.queued} queued")
+                self.jobs[job.id] = job
+                if job.key is not None:
+                    self.inflight[job.key] = job
+                self.queued += 1
+                self._prune()
+                job.future = self.executor.submit(self._run, job)
+            active, queued = self.active, self.queued
+        if leader is not None:
+            self.log(f"Identical request joined job {leader.id} ({leader.requesters} requesters)")
+            return leader
+        self.log(f"Job {job.id} queued (active {active}, queue depth {queued})")
+        return job
+
+    def _join(self, key):
+        """Attach one more requester to the in-flight job for key, if there is one"""
+        with self.lock:
+            job = self._join_locked(key)
+        if job is not None:
+            self.log(f"Identical request joined job {job.id} ({job.requesters} requesters)")
+        return job
+
+    def _join_locked(self, key):
+        # Caller holds self.lock
+        job = self.inflight.get(key) if key is not None else None
+        if job is not None:
+            job.requesters += 1
+            self.coalesced += 1
+        return job
+
+    def _from_cache(self, job):
+        """Finish job from the cache; True if the cache had its result"""
+        try:
+            job.result_bytes = self.cache.get(job.key)
+        except sqlite3.Error as e:
+            self.log(f"Result cache lookup failed: {e}", "WARNING")
+            return False
+        if job.result_bytes is None:
+            self.log(f"Cache miss for job {job.id} - {self.cache.describe()}")
+            return False
+        job.cached = True
+        with self.lock:
+            self.jobs[job.id] = job
+            self._prune()
+            job.started_at = time.time()
+            self._finish(job, DONE)
+        self.log(f"Job {job.id} answered from cache - {self.cache.describe()}", "SUCCESS")
+        return True
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id, force=False):
+        """
+        Withdraw one requester from a queued or running job, cancelling it
+        when none are left (or straight away with force). Returns the job,
+        or None if unknown.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            job.requesters = 0 if force else max(0, job.requesters - 1)
+            remaining = job.requesters
+            if remaining == 0:
+                job.cancel_event.set()
+                if job.status == QUEUED and job.future.cancel():
+                    # Never started - _run() will not see it
+                    self.queued -= 1
+                    self._finish(job, CANCELLED)
+        if remaining:
+            self.log(f"Job {job_id} keeps running for {remaining} other requester(s)")
+        else:
+            self.log(f"Job {job_id} cancel requested", "WARNING")
+        return job
+
+    def shutdown(self):
+        """Cancel everything and stop the workers"""
+        with self.lock:
+            jobs = [job for job in self.jobs.values() if job.status not in FINISHED]
+        for job in jobs:
+            self.cancel(job.id, force=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        with self.lock:
+            self.queued -= 1
+            if job.cancel_event.is_set():
+                self._finish(job, CANCELLED)
+                return
+            self.active += 1
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        job.publish()
+        status = DONE
+        try:
+            job.result = run_optimization(job.config, job.publish, job.cancel_event)
+        except OptimizationCancelled:
+            status = CANCELLED
+        except OptimizationError as e:
+            job.error = str(e)
+            status = FAILED
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            status = FAILED
+        if status == DONE and self.cache is not None and job.key is not None:
+            try:
+                self.cache.put(job.key, job.result)
+            except sqlite3.Error as e:
+                self.log(f"Could not cache job {job.id}: {e}", "WARNING")
+        with self.lock:
+            self.active -= 1
+            self._finish(job, status)
+            active, queued = self.active, self.queued
+        elapsed = job.finished_at - job.started_at
+        level = {DONE: "SUCCESS", FAILED: "ERROR", CANCELLED: "WARNING"}[status]
+        self.log(f"Job {job.id} {status} after {elapsed:.2f}s for {job.requesters} requester(s) "
+                 f"(active {active}, queue depth {queued})", level)
+
+    def _finish(self, job, status):
+        # Caller holds self.lock
+        if job.key is not None and self.inflight.get(job.key) is job:
+            del self.inflight[job.key]
+        job.status = status
+        job.finished_at = time.time()
+        job.done_event.set()
+        job.publish()
+
+    def _prune(self):
+        # Caller holds self.lock - forget the oldest finished jobs past `retain`
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.retain)]:
+            del self.jobs[job_id]
@@ -0,0 +1,324 @@
+"""
+Schedule model - the data ImprovedGeneticOptimizer (optimizer.js) derives
+from its config, as NumPy tables: gene earnings, per-day cash flow in cents,
+manual constraints, the locked balance-edit prefix and the crisis plan.
+"""
+
+import calendar
+import math
+
+import numpy as np
+
+# Gene alphabet - same codes as GENE in optimizer.js (canonical, small < medium < large)
+GENE_NAMES = [
+    None,
+    "small",
+    "medium",
+    "large",
+    "small+small",
+    "small+medium",
+    "small+large",
+    "medium+medium",
+    "medium+large",
+    "large+large",
+]
+GENE_COUNT = len(GENE_NAMES)
+OFF, SMALL, MEDIUM, LARGE = 0, 1, 2, 3
+SMALL_SMALL, SMALL_MEDIUM, SMALL_LARGE = 4, 5, 6
+MEDIUM_MEDIUM, MEDIUM_LARGE, LARGE_LARGE = 7, 8, 9
+
+SHIFTS = {
+    "large": {"gross": 94.50, "net": 86.50},
+    "medium": {"gross": 75.50, "net": 67.50},
+    "small": {"gross": 64.00, "net": 56.00},
+}
+
+EXPENSES = [
+    (1, "Auto Insurance", 177),
+    (2, "YouTube Premium", 8),
+    (5, "Groceries", 112.50),
+    (5, "Weed", 20),
+    (8, "Paramount Plus", 12),
+    (8, "iPad AppleCare", 8.49),
+    (10, "Streaming Services", 230),
+    (11, "Cat Food", 40),
+    (12, "Groceries", 112.50),
+    (12, "Weed", 20),
+    (14, "iPad AppleCare", 8.49),
+    (16, "Cat Food", 40),
+    (17, "Car Payment", 463),
+    (19, "Groceries", 112.50),
+    (19, "Weed", 20),
+    (22, "Cell Phone", 177),
+    (23, "Cat Food", 40),
+    (24, "AI Subscription", 220),
+    (25, "Electric", 139),
+    (25, "Ring Subscription", 10),
+    (26, "Groceries", 112.50),
+    (26, "Weed", 20),
+    (28, "iPhone AppleCare", 13.49),
+    (29, "Internet", 30),
+    (29, "Cat Food", 40),
+    (30, "Rent", 1636),
+]
+
+MOM_DEPOSITS = [(11, 1356), (25, 1356)]
+
+GENE_SHIFTS = [name.split("+") if name else [] for name in GENE_NAMES]
+GENE_NET = np.array([sum(SHIFTS[s]["net"] for s in shifts) for shifts in GENE_SHIFTS])
+GENE_GROSS = np.array([sum(SHIFTS[s]["gross"] for s in shifts) for shifts in GENE_SHIFTS])
+
+
+def to_cents(amount):
+    """Math.round(amount * 100), as optimizer.js does"""
+    return int(math.floor(amount * 100 + 0.5))
+
+
+GENE_NET_CENTS = np.array([to_cents(net) for net in GENE_NET], dtype=np.int64)
+
+
+def encode_shifts(shifts):
+    """'medium+large', 'large+medium', 'Large' -> canonical gene code"""
+    if not shifts:
+        return OFF
+    parts = sorted(
+        (["small", "medium", "large"].index(s.strip().lower()) for s in shifts.split("+")),
+    )
+    if len(parts) > 2:
+        raise ValueError(f"Unsupported shift combination: {shifts}")
+    return GENE_NAMES.index("+".join(["small", "medium", "large"][p] for p in parts))
+
+
+def gene_for_earnings(earnings):
+    """Match fixed earnings to the shift combination that pays them"""
+    if earnings == 0:
+        return OFF
+    for gene, net in ((SMALL, 56), (MEDIUM, 67.5), (LARGE, 86.5), (SMALL_SMALL, 112),
+                      (SMALL_MEDIUM, 123.5), (MEDIUM_MEDIUM, 135)):
+        if abs(earnings - net) < 1:
+            return gene
+    return MEDIUM  # Custom earnings - default to medium
+
+
+def build_calendar(horizon):
+    """Months of config['horizon'] = {'start': 'YYYY-MM', 'months': n}; one 30-day month without"""
+    if not horizon:
+        return [{"label": None, "first_day": 1, "length": 30}]
+    try:
+        year, month = (int(part) for part in str(horizon["start"]).split("-"))
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid horizon start: {horizon.get('start')} (expected 'YYYY-MM')")
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid horizon start: {horizon['start']} (expected 'YYYY-MM')")
+    months = []
+    first_day = 1
+    for i in range(horizon.get("months") or 1):
+        y = year + (month - 1 + i) // 12
+        m = (month - 1 + i) % 12 + 1
+        length = calendar.monthrange(y, m)[1]
+        months.append({"label": f"{y}-{m:02d}", "first_day": first_day, "length": length})
+        first_day += length
+    return months
+
+
+def _default(value, fallback):
+    return fallback if value is None else value
+
+
+class ScheduleModel:
+    """Config -> the tables every scoring and search step reads"""
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.starting_balance = _default(config.get("startingBalance"), 90.50)
+        self.target_ending_balance = _default(config.get("targetEndingBalance"), 490.50)
+        self.minimum_balance = _default(config.get("minimumBalance"), 0)
+
+        self.months = build_calendar(config.get("horizon"))
+        self.days = self.months[-1]["first_day"] + self.months[-1]["length"] - 1
+        days = self.days
+
+        # Constraints are keyed by day number (as strings once they went through JSON)
+        raw = config.get("manualConstraints") or {}
+        self.constraints = {}
+        for key, value in raw.items():
+            if str(key).isdigit() and isinstance(value, dict) and 1 <= int(key) <= days:
+                self.constraints[int(key)] = dict(value)
+        self.balance_edit_day = raw.get("balanceEditDay") or None
+        self.new_starting_balance = raw.get("newStartingBalance") or 0
+        self.start_day = self.balance_edit_day + 1 if self.balance_edit_day else 1
+
+        # Bills and deposits repeat monthly, moved to the last day in shorter months
+        self.expenses_by_day = np.zeros(days + 1)
+        self.deposits_by_day = np.zeros(days + 1)
+        for month in self.months:
+            for day, _, amount in EXPENSES:
+                self.expenses_by_day[month["first_day"] + min(day, month["length"]) - 1] += amount
+            for day, amount in MOM_DEPOSITS:
+                self.deposits_by_day[month["first_day"] + min(day, month["length"]) - 1] = amount
+        for day, constraint in self.constraints.items():
+            if constraint.get("fixedExpenses") is not None:
+                self.expenses_by_day[day] = constraint["fixedExpenses"]
+
+        self._process_balance_constraints()
+
+        self.constraint_genes = np.zeros(days + 1, dtype=np.int8)
+        for day, constraint in self.constraints.items():
+            if constraint.get("shifts"):
+                self.constraint_genes[day] = encode_shifts(constraint["shifts"])
+
+        # Earnings the flexible days must produce
+        if self.balance_edit_day:
+            after = slice(self.balance_edit_day + 1, days + 1)
+            self.required_flex_net = max(0.0, float(
+                self.expenses_by_day[after].sum() + self.target_ending_balance
+                - self.new_starting_balance - self.deposits_by_day[after].sum()))
+        else:
+            self.required_flex_net = float(
+                self.expenses_by_day.sum() + self.target_ending_balance
+                - self.starting_balance - self.deposits_by_day.sum())
+
+        self._compile_plan()
+        self._compute_locked_prefix()
+
+    def _process_balance_constraints(self):
+        """Turn fixedBalance days into the shifts/earnings that reach them"""
+        targets = {day: c["fixedBalance"] for day, c in self.constraints.items()
+                   if c.get("fixedBalance") is not None}
+        if not targets:
+            return
+        balance = self.starting_balance
+        for day in range(1, max(targets) + 1):
+            constraint = self.constraints.get(day)
+            if day in targets:
+                required = (targets[day] - balance - self.deposits_by_day[day]
+                            + self.expenses_by_day[day])
+                if not constraint.get("shifts") and constraint.get("fixedEarnings") is None:
+                    if required <= 0:
+                        constraint["shifts"] = None
+                    else:
+                        for shifts, net in (("small", 56), ("medium", 67.5), ("large", 86.5),
+                                            ("small+small", 112), ("small+medium", 123.5),
+                                            ("medium+medium", 135)):
+                            if abs(required - net) < 5:
+                                constraint["shifts"] = shifts
+                                break
+                        else:
+                            constraint["fixedEarnings"] = required
+            if constraint and constraint.get("shifts"):
+                balance += GENE_NET[encode_shifts(constraint["shifts"])]
+            elif constraint and constraint.get("fixedEarnings") is not None:
+                balance += constraint["fixedEarnings"]
+            balance += self.deposits_by_day[day] - self.expenses_by_day[day]
+
+    def _compile_plan(self):
+        """Masks, crisis classification and work-day requirements (compilePlan() in JS)"""
+        days = self.days
+        self.available_days = days + 1 - self.start_day
+        self.preset_mask = np.zeros(days + 1, dtype=bool)
+        self.preset_genes = np.zeros(days + 1, dtype=np.int8)
+        self.mutable_mask = np.zeros(days + 1, dtype=bool)
+        for day in range(1, days + 1):
+            constraint = self.constraints.get(day)
+            if constraint is not None:
+                if "shifts" in constraint:
+                    self.preset_genes[day] = self.constraint_genes[day]
+                    self.preset_mask[day] = True
+                elif constraint.get("fixedEarnings") is not None:
+                    self.preset_genes[day] = gene_for_earnings(constraint["fixedEarnings"])
+                    self.preset_mask[day] = True
+            elif day >= self.start_day:
+                self.mutable_mask[day] = True
+
+        self.in_crisis_mode = self.required_flex_net > self.available_days * SHIFTS["large"]["net"]
+        avg_double = (GENE_NET[LARGE_LARGE] + GENE_NET[MEDIUM_LARGE] + GENE_NET[MEDIUM_MEDIUM]) / 3
+        if self.in_crisis_mode:
+            self.min_work_days_needed = min(self.available_days, max(
+                math.floor(self.available_days * 0.9), math.ceil(self.required_flex_net / avg_double)))
+        else:
+            self.min_work_days_needed = math.ceil(self.required_flex_net / SHIFTS["large"]["net"])
+        avg_single = sum(s["net"] for s in SHIFTS.values()) / 3
+        self.base_work_probability = min(
+            0.9, math.ceil(self.required_flex_net / avg_single) / self.available_days * 1.2)
+
+        # Cash flow of the free days, in cents
+        self.minimum_balance_cents = self.minimum_balance * 100
+        self.base_flow_cents = np.zeros(days + 1, dtype=np.int64)
+        for day in range(self.start_day, days + 1):
+            self.base_flow_cents[day] = (to_cents(self.deposits_by_day[day])
+                                         - to_cents(self.expenses_by_day[day]))
+        self.fixed_balance_days = np.array(
+            [day for day in range(self.start_day, days + 1)
+             if self.constraints.get(day, {}).get("fixedBalance") is not None], dtype=np.int64)
+        self.fixed_balance_targets = np.array(
+            [self.constraints[day]["fixedBalance"] for day in self.fixed_balance_days])
+
+    def _compute_locked_prefix(self):
+        """Days before start_day are fixed - fold them once (computeLockedPrefix() in JS)"""
+        balance = to_cents(self.starting_balance)
+        prefix = {"min_balance_cents": balance, "work_days": 0, "earnings_cents": 0,
+                  "violations": 0, "balance_constraint_violations": 0.0}
+        for day in range(1, self.start_day):
+            gene = int(self.constraint_genes[day])
+            if gene != OFF:
+                prefix["earnings_cents"] += int(GENE_NET_CENTS[gene])
+                prefix["work_days"] += 1
+            balance += (int(GENE_NET_CENTS[gene]) + to_cents(self.deposits_by_day[day])
+                        - to_cents(self.expenses_by_day[day]))
+            if self.balance_edit_day and day == self.balance_edit_day:
+                balance = to_cents(self.new_starting_balance)
+            target = self.constraints.get(day, {}).get("fixedBalance")
+            if target is not None:
+                diff = abs(balance / 100 - target)
+                if diff > 0.01:
+                    prefix["balance_constraint_violations"] += diff * 1000
+            if balance < self.minimum_balance_cents:
+                prefix["violations"] += 1
+            prefix["min_balance_cents"] = min(prefix["min_balance_cents"], balance)
+        prefix["balance_cents"] = balance
+        self.locked_prefix = prefix
+
+    def effective_genes(self, genes):
+        """(pop, days + 1) genes with locked days replaced by their constrained shifts"""
+        genes = np.array(genes, dtype=np.int8, copy=True)
+        genes[:, 1:self.start_day] = self.constraint_genes[1:self.start_day]
+        genes[:, self.preset_mask] = self.preset_genes[self.preset_mask]
+        return genes
+
+    def format_schedule(self, chromosome):
+        """Per-day rows in the shape of formatSchedule() in optimizer.js"""
+        schedule = []
+        balance = self.starting_balance
+        for day in range(1, self.days + 1):
+            gene = int(self.constraint_genes[day] if day <= (self.balance_edit_day or 0)
+                       else chromosome[day])
+            info = {
+                "day": day,
+                "shifts": list(GENE_SHIFTS[gene]),
+                "earnings": float(GENE_NET[gene]) if gene else 0,
+                "expenses": float(self.expenses_by_day[day]),
+                "deposit": float(self.deposits_by_day[day]),
+                "startBalance": balance,
+            }
+            balance += info["deposit"] + info["earnings"] - info["expenses"]
+            if self.balance_edit_day and day == self.balance_edit_day:
+                balance = self.new_starting_balance
+            info["endBalance"] = balance
+            schedule.append(info)
+        return schedule
+
+    def summarize_months(self, schedule):
+        """Per-month totals, as summarizeMonths() in optimizer.js"""
+        summary = []
+        for month in self.months:
+            rows = schedule[month["first_day"] - 1:month["first_day"] - 1 + month["length"]]
+            summary.append({
+                "month": month["label"],
+                "firstDay": month["first_day"],
+                "lastDay": month["first_day"] + month["length"] - 1,
+                "startingBalance": rows[0]["startBalance"],
+                "endingBalance": rows[-1]["endBalance"],
+                "workDays": sum(1 for row in rows if row["shifts"]),
+                "earnings": sum(row["earnings"] for row in rows),
+            })
+        return summary
@@ -0,0 +1,110 @@
+"""
+One optimization run with progress reports and cancellation, on either
+engine: optimizer.js through optimize-cli.js (engine 'genetic' or 'exact',
+the same code the browser runs) or the NumPy engine (engine 'numpy').
+"""
+
+import json
+import os
+import subprocess
+import threading
+
+from .engine import VectorizedOptimizer
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "optimize-cli.js")
+
+
+class OptimizationError(Exception):
+    """The config was rejected or the engine failed"""
+
+
+class OptimizationCancelled(Exception):
+    """The run was cancelled before it finished"""
+
+
+def run_optimization(config, progress=None, cancel_event=None):
+    """
+    Optimize config and return the serialized result (serializeResult()
+    shape, formattedSchedule included, finalPopulation left out).
+    progress(report) is called with each progress report; setting
+    cancel_event stops the run with OptimizationCancelled.
+    """
+    if not isinstance(config, dict):
+        raise OptimizationError("config must be a JSON object")
+    if config.get("engine") == "numpy":
+        return _run_numpy(config, progress, cancel_event)
+    return _run_node(config, progress, cancel_event)
+
+
+def _run_numpy(config, progress, cancel_event):
+    try:
+        optimizer = VectorizedOptimizer(config)
+    except (ValueError, TypeError) as e:
+        raise OptimizationError(str(e))
+
+    def report(update):
+        if cancel_event is not None and cancel_event.is_set():
+            optimizer.cancel()
+        if progress:
+            progress(update)
+
+    result = optimizer.optimize(report)
+    if result["cancelled"]:
+        raise OptimizationCancelled()
+    result.pop("finalPopulation", None)
+    return result
+
+
+def _run_node(config, progress, cancel_event):
+    command = ["node", CLI, "-", "--compact"]
+    if progress:
+        command.append("--progress")
+    try:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, text=True)
+    except OSError as e:
+        raise OptimizationError(f"Cannot start the optimizer: {e}")
+
+    # Both pipes are drained on their own threads so neither can fill up
+    output = []
+    errors = []
+
+    def read_stdout():
+        output.append(process.stdout.read())
+
+    def read_stderr():
+        for line in process.stderr:
+            if progress and line.startswith('{"type":"progress"'):
+                update = json.loads(line)
+                del update["type"]
+                progress(update)
+            else:
+                errors.append(line)
+
+    readers = [threading.Thread(target=read_stdout, daemon=True),
+               threading.Thread(target=read_stderr, daemon=True)]
+    for reader in readers:
+        reader.start()
+    try:
+        process.stdin.write(json.dumps(config))
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+
+    while True:
+        try:
+            process.wait(timeout=0.1)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_event is not None and cancel_event.is_set():
+                process.kill()
+                process.wait()
+                raise OptimizationCancelled()
+    for reader in readers:
+        reader.join()
+
+    if process.returncode != 0:
+        message = next((line for line in reversed(errors) if line.startswith("Error: ")),
+                       f"Optimizer exited with code {process.returncode}")
+        raise OptimizationError(message.strip().removeprefix("Error: "))
+    return json.loads(output[0])
@@ -0,0 +1,258 @@
+"""
+HTTP server for the schedule optimizer: the static files index.html needs
+plus a JSON API.
+
+    POST   /api/optimize     body: the config runOptimization() / regenerateWithEdits()
+                             builds, manualConstraints included
+                             200: the result with formattedSchedule; 400: {"error": ...}
+    POST   /api/jobs         same body; 202: {"id": ..., "status": "queued", ...}
+    GET    /api/jobs         queue stats and every known job (without results)
+    GET    /api/jobs/{id}    status, latest progress report, and the result once done
+    GET    /api/jobs/{id}/events
+                             Server-Sent Events: "status" and "progress" events while the
+                             job runs, then one "done", "failed" or "cancelled" event
+    DELETE /api/jobs/{id}    withdraw from a queued or running job; it is cancelled
+                             once every request that shares it has withdrawn
+
+Every request gets its own thread. Optimizations - synchronous or not -
+go through one JobQueue: at most max_concurrent run, at most max_queued
+wait, and anything past that gets 429 straight away. A request identical
+to one in flight joins it - same job id, progress stream and result. With a result cache
+(on by default from the command line), a repeated request is answered
+from SQLite without queueing - /api/optimize marks those X-Cache: HIT.
+Static files are served while long runs are in progress, over HTTP/1.1
+keep-alive from an in-memory cache with ETags and gzip (see static.py). An event stream
+sends the newest state each time it writes, so a slow reader skips
+intermediate progress reports rather than having them buffered for it.
+
+    python -m schedule_optimizer.server [--port 8080] [--workers N] [--max-queued N]
+                                        [--cache PATH | --no-cache] [--cache-mb N]
+"""
+
+import argparse
+import json
+import sys
+from http.server import ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from .cache import ResultCache
+from .jobs import CANCELLED, DONE, FINISHED, JobQueue, QueueFull
+from .static import StaticFileCache, StaticFileHandler
+
+MAX_BODY_BYTES = 1 << 20
+DEFAULT_CACHE_PATH = "optimizer-cache.sqlite3"
+KEEPALIVE_SECONDS = 15
+
+
+class OptimizationHandler(StaticFileHandler):
+    """Static files from the working directory, /api/* as JSON"""
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/api/jobs":
+            self.send_json(200, {**self.server.jobs.stats(),
+                                 "jobs": [job.to_dict(include_result=False)
+                                          for job in self.server.jobs.list()]})
+        elif path.startswith("/api/jobs/") and path.endswith("/events"):
+            job = self.find_job(path[:-len("/events")])
+            if job:
+                self.stream_events(job)
+        elif path.startswith("/api/jobs/"):
+            job = self.find_job(path)
+            if job:
+                self.send_json(200, job.to_dict())
+        elif path.startswith("/api/"):
+            self.send_json(404, {"error": f"Unknown endpoint: {path}"})
+        else:
+            super().do_GET()
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path == "/api/optimize":
+            self.handle_optimize()
+        elif path == "/api/jobs":
+            job = self.submit_job()
+            if job:
+                self.send_json(202, job.to_dict(), {"Location": f"/api/jobs/{job.id}"})
+        else:
+            # The body was never read - the connection cannot carry another request
+            self.send_json(404, {"error": f"Unknown endpoint: {path}"}, {"Connection": "close"})
+
+    def do_DELETE(self):
+        path = urlsplit(self.path).path
+        if not path.startswith("/api/jobs/"):
+            self.send_json(404, {"error": f"Unknown endpoint: {path}"})
+            return
+        job = self.find_job(path)
+        if job is None:
+            return
+        if job.status in FINISHED:
+            self.send_json(409, {"error": f"Job {job.id} already {job.status}", **job.to_dict(False)})
+            return
+        self.server.jobs.cancel(job.id)
+        self.send_json(202, job.to_dict(include_result=False))
+
+    def handle_optimize(self):
+        job = self.submit_job()
+        if job is None:
+            return
+        if job.cached:
+            # Stored as the bytes sent last time - no decoding or encoding
+            self.send_body(200, job.result_bytes, "application/json", {"X-Cache": "HIT"})
+            return
+        job.wait()
+        if job.status == DONE:
+            result = job.result
+            self.server.log(f"Optimized ({result['engine']}) in {result['computationTime']:.2f}s: "
+                            f"${result['finalBalance']:.2f}, {len(result['workDays'])} work days")
+            self.send_json(200, result, {"X-Cache": "MISS"} if self.server.cache else None)
+        elif job.status == CANCELLED:
+            self.send_json(409, {"error": "Optimization was cancelled"})
+        else:
+            self.send_json(400, {"error": job.error})
+
+    def stream_events(self, job):
+        """Follow a job as Server-Sent Events until it finishes or the client goes away"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("X-Accel-Buffering", "no")
+        # No Content-Length - the stream ends when the connection does
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        sequence = -1
+        sent_status = sent_progress = None
+        try:
+            while True:
+                latest = job.next_update(sequence, KEEPALIVE_SECONDS)
+                if latest == sequence:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+                sequence = latest
+                # Read the job once per wakeup - anything published meanwhile is folded in
+                status, progress = job.status, job.progress
+                if status in FINISHED:
+                    self.write_event(status, job.to_dict(), sequence)
+                    return
+                if status != sent_status:
+                    self.write_event("status", {"id": job.id, "status": status}, sequence)
+                    sent_status = status
+                if progress is not None and progress is not sent_progress:
+                    self.write_event("progress", progress, sequence)
+                    sent_progress = progress
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def write_event(self, event, payload, event_id):
+        self.wfile.write(f"id: {event_id}\nevent: {event}\ndata: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+    def submit_job(self):
+        """Queue the request body as a job; sends the error response and returns None on failure"""
+        config = self.read_json()
+        if config is None:
+            return None
+        if not isinstance(config, dict):
+            self.send_json(400, {"error": "config must be a JSON object"})
+            return None
+        try:
+            return self.server.jobs.submit(config)
+        except QueueFull as e:
+            self.server.log(f"Rejected optimization: {e}", "WARNING")
+            self.send_json(429, {"error": f"Server busy: {e}"}, {"Retry-After": "1"})
+            return None
+
+    def find_job(self, path):
+        """Job named by /api/jobs/{id}; sends 404 and returns None when there is none"""
+        job = self.server.jobs.get(path[len("/api/jobs/"):])
+        if job is None:
+            self.send_json(404, {"error": "Unknown job"})
+        return job
+
+    def read_json(self):
+        """Request body as JSON; sends the error response and returns None when it isn't"""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.send_json(413 if length > 0 else 400, {"error": "Invalid request body length"},
+                           {"Connection": "close"})
+            return None
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self.send_json(400, {"error": f"Invalid JSON: {e}"})
+            return None
+
+    def send_json(self, status, payload, headers=None):
+        self.send_body(status, json.dumps(payload).encode(), "application/json", headers)
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class OptimizationServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a static file cache and a bounded optimization job queue"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler=OptimizationHandler, workers=None, max_queued=16, log=None,
+                 cache_path=None, cache_bytes=64 << 20):
+        super().__init__(address, handler)
+        self.log = log or (lambda message, level="INFO": None)
+        self.static_cache = StaticFileCache()
+        self.cache = ResultCache(cache_path, cache_bytes) if cache_path else None
+        if self.cache:
+            self.log(f"Result cache {cache_path}: {self.cache.describe()}")
+        self.jobs = JobQueue(workers, max_queued, log=self.log, cache=self.cache)
+        self.workers = self.jobs.max_concurrent
+
+    def server_close(self):
+        super().server_close()
+        self.jobs.shutdown()
+        if self.cache:
+            self.cache.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m schedule_optimizer.server",
+                                     description="Static files and the optimization API")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, help="concurrent optimizations (default: CPU count)")
+    parser.add_argument("--max-queued", type=int, default=16,
+                        help="optimizations allowed to wait for a worker before 429s (default: 16)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                        help=f"SQLite result cache (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true", help="always run the optimizer")
+    parser.add_argument("--cache-mb", type=float, default=64, help="cache size limit in MB (default: 64)")
+    args = parser.parse_args(argv)
+
+    def log(message, level="INFO"):
+        sys.stderr.write(f"[{level}] {message}\n")
+
+    server = OptimizationServer(("", args.port), workers=args.workers, max_queued=args.max_queued, log=log,
+                                cache_path=None if args.no_cache else args.cache,
+                                cache_bytes=int(args.cache_mb * (1 << 20)))
+    log(f"Serving on http://localhost:{args.port} with {server.workers} optimization worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
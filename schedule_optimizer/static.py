@@ -0,0 +1,245 @@
+"""
+Static file serving for index.html and its scripts.
+
+SimpleHTTPRequestHandler reads every file from disk on every request and
+sends it uncompressed over a connection it then closes. StaticFileHandler
+speaks HTTP/1.1 keep-alive and serves from a StaticFileCache: file bytes
+kept in memory until the file's mtime or size changes, a gzip copy made
+once per version, and a strong ETag so revalidation is a 304 without a
+body. Files too large to cache go out with socket.sendfile().
+
+Query strings are ignored, so cache-busting ?v= URLs share one entry.
+"""
+
+import email.utils
+import gzip
+import hashlib
+import os
+import socket
+import threading
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_GZIP_BYTES = 1024
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Whether an Accept-Encoding header allows gzip: listed (or x-gzip) with
+    q > 0, or not listed and allowed by "*". "gzip;q=0" refuses it.
+    """
+    explicit = wildcard = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        if coding in ("gzip", "x-gzip"):
+            explicit = max(explicit or 0.0, quality)
+        elif coding == "*":
+            wildcard = quality
+    if explicit is not None:
+        return explicit > 0
+    return wildcard is not None and wildcard > 0
+
+
+class CachedFile:
+    """One version of a file, ready to send"""
+
+    __slots__ = ("mtime_ns", "size", "body", "gzip_body", "etag", "gzip_etag",
+                 "content_type", "last_modified")
+
+    def __init__(self, stat, body, content_type):
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.body = body
+        self.content_type = content_type
+        self.last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.gzip_body = None
+        self.gzip_etag = None
+        if len(body) >= MIN_GZIP_BYTES and content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+                self.gzip_etag = self.etag[:-1] + '-gzip"'
+
+
+class StaticFileCache:
+    """In-memory file cache, invalidated by mtime and size"""
+
+    def __init__(self, max_bytes=32 << 20, max_file_bytes=2 << 20):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.files = {}
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, path, stat, content_type):
+        """The cached file for path at stat, loading it if needed; None if it is too big to cache"""
+        if stat.st_size > self.max_file_bytes:
+            return None
+        with self.lock:
+            entry = self.files.get(path)
+        if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+        with open(path, "rb") as f:
+            body = f.read()
+        entry = CachedFile(stat, body, content_type)
+        cost = len(entry.body) + len(entry.gzip_body or b"")
+        with self.lock:
+            old = self.files.pop(path, None)
+            if old:
+                self.bytes -= len(old.body) + len(old.gzip_body or b"")
+            # Oldest entries first (dict order) until the new one fits
+            while self.files and self.bytes + cost > self.max_bytes:
+                evicted = self.files.pop(next(iter(self.files)))
+                self.bytes -= len(evicted.body) + len(evicted.gzip_body or b"")
+            if cost <= self.max_bytes:
+                self.files[path] = entry
+                self.bytes += cost
+        return entry
+
+
+_default_cache = StaticFileCache()
+
+
+class StaticFileHandler(SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler with keep-alive, caching, ETags, gzip and sendfile"""
+
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # Idle keep-alive connections give their thread back
+
+    def setup(self):
+        super().setup()
+        # Headers and body are separate writes; without this a kept-alive
+        # connection waits out the client's delayed ACK on every response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self.serve_file(head_only=False)
+
+    def do_HEAD(self):
+        self.serve_file(head_only=True)
+
+    def serve_file(self, head_only):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not self.path.split("?", 1)[0].endswith("/") or not os.path.isfile(index):
+                # Redirects and directory listings stay with SimpleHTTPRequestHandler
+                if head_only:
+                    super().do_HEAD()
+                else:
+                    super().do_GET()
+                return
+            path = index
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        content_type = self.guess_type(path)
+        cache = getattr(self.server, "static_cache", _default_cache)
+        try:
+            entry = cache.get(path, stat, content_type)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        if entry is None:
+            self.send_uncached(path, stat, content_type, head_only)
+            return
+
+        use_gzip = entry.gzip_body is not None and accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        etag = entry.gzip_etag if use_gzip else entry.etag
+        if self.not_modified(etag, entry.last_modified):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_validators(etag, entry.last_modified, entry.gzip_body is not None)
+            self.end_headers()
+            return
+        body = entry.gzip_body if use_gzip else entry.body
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_validators(etag, entry.last_modified, entry.gzip_body is not None)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def send_uncached(self, path, stat, content_type, head_only):
+        """Large files: validators from the file's identity, body with zero-copy sendfile"""
+        etag = f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        if self.not_modified(etag, last_modified):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_validators(etag, last_modified, False)
+            self.end_headers()
+            return
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        with f:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(stat.st_size))
+            self.send_validators(etag, last_modified, False)
+            self.end_headers()
+            if not head_only:
+                self.wfile.flush()
+                self.connection.sendfile(f, count=stat.st_size)
+
+    def not_modified(self, etag, last_modified):
+        """Conditional request that the current version satisfies"""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        return if_modified_since is not None and if_modified_since == last_modified
+
+    def send_validators(self, etag, last_modified, varies):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        # Revalidate every time - a 304 is cheap and edits show up on the next load
+        self.send_header("Cache-Control", "no-cache")
+        if varies:
+            self.send_header("Vary", "Accept-Encoding")
+
+
+class QuietStaticFileHandler(StaticFileHandler):
+    """StaticFileHandler without the per-request log line"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticFileServer(ThreadingHTTPServer):
+    """Threaded server for StaticFileHandler with its own file cache"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler=StaticFileHandler):
+        super().__init__(address, handler)
+        self.static_cache = StaticFileCache()
+
+
+def start_static_server(port, quiet=True):
+    """Serve the working directory on port from a background thread; returns the server"""
+    server = StaticFileServer(("", port), QuietStaticFileHandler if quiet else StaticFileHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
@@ -0,0 +1,226 @@
+"""
+Batch scenario sweeps - many optimizations in a pool of worker processes.
+
+    python -m schedule_optimizer.sweep --grid startingBalance=0:500:10 \\
+        --grid targetEndingBalance=300:800:50 --output sweep.jsonl
+
+    python -m schedule_optimizer.sweep --csv scenarios.csv --output sweep.csv
+
+Every scenario is a config in the shape index.html builds in
+runOptimization(): --base gives the shared part, then each grid point or
+CSV row overrides keys of it. Results are written as each scenario
+finishes (JSON lines, or CSV when the output ends in .csv) and progress
+with scenarios per second goes to stderr.
+"""
+
+import argparse
+import copy
+import csv
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .engine import optimize
+from .runner import CLI
+
+SUMMARY_FIELDS = ["finalBalance", "minBalance", "totalEarnings", "workDayCount", "violations",
+                  "bestFitness", "computationTime", "schedule"]
+
+
+def parse_value(text):
+    """CSV cells and --set values: JSON where it parses ('0', '{...}', 'null'), else the string"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_range(spec):
+    """'0:500:10' -> 0, 10, ... 500 (inclusive); '1,5,9' -> 1, 5, 9"""
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        if step <= 0:
+            raise ValueError(f"Grid step must be positive: {spec}")
+        count = int(round((stop - start) / step)) + 1
+        values = [round(start + i * step, 10) for i in range(count)]
+    else:
+        values = [parse_value(part) for part in spec.split(",")]
+    return [int(v) if isinstance(v, float) and v.is_integer() else v for v in values]
+
+
+def grid_scenarios(base, grid):
+    """Cartesian product of {key: [values]} over the base config"""
+    keys = list(grid)
+    for values in itertools.product(*(grid[key] for key in keys)):
+        scenario = copy.deepcopy(base)
+        scenario.update(zip(keys, values))
+        yield scenario
+
+
+def csv_scenarios(base, path):
+    """One scenario per CSV row; the header names config keys"""
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            scenario = copy.deepcopy(base)
+            scenario.update({key: parse_value(value) for key, value in row.items()
+                             if key and value not in (None, "")})
+            yield scenario
+
+
+def summarize(result):
+    """The per-scenario result fields written to the output"""
+    return {
+        "finalBalance": result["finalBalance"],
+        "minBalance": result["minBalance"],
+        "totalEarnings": result["totalEarnings"],
+        "workDays": result["workDays"],
+        "workDayCount": len(result["workDays"]),
+        "violations": result["violations"],
+        "bestFitness": result["bestFitness"],
+        "computationTime": result.get("computationTime"),
+        "schedule": result["schedule"][1:],
+    }
+
+
+def run_scenario(index, config, runner, seed):
+    """Worker process entry point - one optimization, never raises"""
+    start = time.perf_counter()
+    try:
+        if runner == "node":
+            completed = subprocess.run(["node", CLI, "-", "--compact"], input=json.dumps(config),
+                                       capture_output=True, text=True, check=True)
+            result = json.loads(completed.stdout)
+        else:
+            result = optimize(config, seed=None if seed is None else seed + index)
+        result["computationTime"] = time.perf_counter() - start
+        return {"scenario": index, "config": config, "result": summarize(result)}
+    except subprocess.CalledProcessError as e:
+        return {"scenario": index, "config": config, "error": e.stderr.strip()}
+    except Exception as e:
+        return {"scenario": index, "config": config, "error": f"{type(e).__name__}: {e}"}
+
+
+class ResultWriter:
+    """Streams finished scenarios to JSON lines or CSV"""
+
+    def __init__(self, f, fmt, varied_keys):
+        self.f = f
+        self.fmt = fmt
+        self.varied_keys = varied_keys
+        if fmt == "csv":
+            self.csv = csv.writer(f)
+            self.csv.writerow(["scenario", *varied_keys, *SUMMARY_FIELDS, "error"])
+
+    def write(self, record):
+        if self.fmt == "csv":
+            result = record.get("result", {})
+            row = [record["scenario"]]
+            row += [json.dumps(record["config"].get(key)) if isinstance(record["config"].get(key), (dict, list))
+                    else record["config"].get(key) for key in self.varied_keys]
+            row += ["|".join(shift or "off" for shift in result["schedule"]) if field == "schedule" and result
+                    else result.get(field) for field in SUMMARY_FIELDS]
+            row.append(record.get("error", ""))
+            self.csv.writerow(row)
+        else:
+            self.f.write(json.dumps(record) + "\n")
+        self.f.flush()
+
+
+def run_sweep(scenarios, writer, workers=None, runner="numpy", seed=None, progress=None):
+    """
+    Run every scenario in a process pool, handing each record to writer as it
+    finishes. At most 2 * workers scenarios are queued at a time, so the
+    scenario iterable is consumed lazily. Returns (completed, failed, seconds).
+    """
+    workers = workers or os.cpu_count() or 1
+    scenarios = iter(enumerate(scenarios))
+    completed = failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            for index, config in itertools.islice(scenarios, 2 * workers - len(pending)):
+                pending.add(pool.submit(run_scenario, index, config, runner, seed))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                writer.write(record)
+                completed += 1
+                failed += "error" in record
+                if progress:
+                    progress(completed, failed, time.perf_counter() - start)
+    return completed, failed, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m schedule_optimizer.sweep",
+                                     description="Run a grid or CSV of optimizer configs in parallel")
+    parser.add_argument("--base", help="JSON file with the config every scenario starts from")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override one base config key (repeatable)")
+    parser.add_argument("--grid", action="append", default=[], metavar="KEY=START:STOP:STEP",
+                        help="sweep a config key over a range or comma list (repeatable)")
+    parser.add_argument("--csv", help="CSV of scenarios, one config per row")
+    parser.add_argument("--output", "-o", help="results file (.csv for CSV, JSON lines otherwise); default stdout")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--runner", choices=["numpy", "node"], default="numpy",
+                        help="numpy engine in-process, or optimize-cli.js (honours config.engine)")
+    parser.add_argument("--seed", type=int, help="base seed; scenario i uses seed + i (numpy runner)")
+    args = parser.parse_args(argv)
+
+    if bool(args.grid) == bool(args.csv):
+        parser.error("give either --grid or --csv")
+
+    base = {}
+    if args.base:
+        with open(args.base) as f:
+            base = json.load(f)
+    for item in args.set:
+        key, _, value = item.partition("=")
+        base[key] = parse_value(value)
+
+    if args.grid:
+        grid = {}
+        for item in args.grid:
+            key, _, spec = item.partition("=")
+            grid[key] = parse_range(spec)
+        total = 1
+        for values in grid.values():
+            total *= len(values)
+        varied_keys = list(grid)
+        scenarios = grid_scenarios(base, grid)
+    else:
+        with open(args.csv, newline="") as f:
+            reader = csv.reader(f)
+            varied_keys = [key for key in next(reader, []) if key]
+            total = sum(1 for _ in reader)
+        scenarios = csv_scenarios(base, args.csv)
+
+    fmt = "csv" if args.output and args.output.endswith(".csv") else "jsonl"
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = ResultWriter(out, fmt, varied_keys)
+
+    def report(completed, failed, elapsed):
+        sys.stderr.write(f"\r{completed}/{total} scenarios, {failed} failed, "
+                         f"{completed / elapsed:.2f} scenarios/s")
+        sys.stderr.flush()
+
+    try:
+        completed, failed, elapsed = run_sweep(scenarios, writer, args.workers, args.runner,
+                                               args.seed, report)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    sys.stderr.write(f"\nFinished {completed} scenarios in {elapsed:.1f}s "
+                     f"({completed / elapsed if elapsed else 0:.2f} scenarios/s, {failed} failed)\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,9 +14,8 @@ import time
 import json
 import subprocess
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import socketserver
 import webbrowser
+from schedule_optimizer.server import DEFAULT_CACHE_PATH, OptimizationServer
 
 # Initialize Pygame
 pygame.init()
@@ -38,8 +37,11 @@ LIGHT_GRAY = (200, 200, 200)
 
 class ServerManager:
     """Manages the test server"""
-    def __init__(self, port=8080):
+    def __init__(self, port=8080, max_jobs=None, max_queued=16, cache_path=DEFAULT_CACHE_PATH):
         self.port = port
+        self.cache_path = cache_path
+        self.max_jobs = max_jobs
+        self.max_queued = max_queued
         self.server = None
         self.thread = None
         self.running = False
@@ -61,9 +63,10 @@ class ServerManager:
             return
             
         try:
-            handler = SimpleHTTPRequestHandler
-            self.server = socketserver.TCPServer(("", self.port), handler)
-            self.server.allow_reuse_address = True
+            # Threaded static files plus the optimization API and job queue
+            self.server = OptimizationServer(("", self.port), workers=self.max_jobs,
+                                             max_queued=self.max_queued, log=self.log,
+                                             cache_path=self.cache_path)
             
             def serve():
                 self.running = True
@@ -88,6 +91,12 @@ class ServerManager:
         else:
             self.log("Server not running", "WARNING")
             
+    def job_stats(self):
+        """Active and queued optimization jobs, or None while stopped"""
+        if self.server and self.running:
+            return self.server.jobs.stats()
+        return None
+        
     def restart(self):
         """Restart the server"""
         self.log("Restarting server...", "INFO")
@@ -336,6 +345,12 @@ class ServerManagerGUI:
         port_text = self.font.render(f"Port: {self.server_manager.port}", True, BLACK)
         self.screen.blit(port_text, (WINDOW_WIDTH - 200, 60))
         
+        # Optimization job queue
+        stats = self.server_manager.job_stats()
+        if stats:
+            jobs_text = self.font.render(f"Jobs: {stats['active']} active, {stats['queued']} queued", True, BLACK)
+            self.screen.blit(jobs_text, (WINDOW_WIDTH - 200, 85))
+        
     def run(self):
         """Main GUI loop"""
         self.server_manager.log("Server Manager Started", "SUCCESS")
@@ -22,7 +22,8 @@ def check_and_install_dependencies():
         'pygame': 'pygame',
         'pygame_gui': 'pygame-gui',
         'selenium': 'selenium',
-        'requests': 'requests'
+        'requests': 'requests',
+        'numpy': 'numpy'
     }
     
     for import_name, package_name in required_packages.items():
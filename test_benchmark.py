@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the benchmark suite - scenario configs, the metrics each run
+records, and regressions found by comparing against a baseline
+"""
+
+import contextlib
+import copy
+import io
+import json
+import os
+import sys
+import tempfile
+
+from schedule_optimizer import benchmark
+
+
+def main():
+    print("\n🧪 Testing benchmark suite")
+    print("=" * 50)
+    failures = 0
+
+    # Short runs - the numbers don't matter here, only that they are recorded
+    report = benchmark.run_suite(["baseline", "day17-ten"], runs=2, overrides={"generations": 100})
+    crisis = report["scenarios"]["day17-ten"]
+    constraints = crisis["config"]["manualConstraints"]
+    locked = [day for day in constraints if day.isdigit()]
+    print(f"✓ day17-ten locks days 1-{len(locked)}, edit to ${constraints['newStartingBalance']}")
+    if len(locked) != 17 or constraints["balanceEditDay"] != 17:
+        failures += 1
+    for name, scenario in report["scenarios"].items():
+        metrics = scenario["metrics"]
+        print(f"✓ {name}: {metrics['computationTime'] * 1000:.0f}ms, {metrics['generations']:g} generations, "
+              f"{metrics['evaluationsPerSecond']:,.0f} evaluations/s, "
+              f"{metrics['peakMemory'] / (1 << 20):.0f}MB peak")
+        missing = [metric for metric in ("wallTime", "computationTime", "generations", "evaluationsPerSecond",
+                                         "bestFitness", "peakMemory") if metrics[metric] is None]
+        if missing or [sample["seed"] for sample in scenario["samples"]] != [1, 2]:
+            print(f"❌ {name} is missing {missing} or has the wrong seeds")
+            failures += 1
+
+    # Against itself nothing changes; a slower, worse run is flagged
+    if any(verdict != "ok" for *_, verdict in benchmark.compare(report, report)):
+        print("❌ A report compared with itself should have no changes")
+        failures += 1
+    slower = copy.deepcopy(report)
+    metrics = slower["scenarios"]["baseline"]["metrics"]
+    metrics["computationTime"] *= 2
+    metrics["evaluationsPerSecond"] /= 2
+    metrics["bestFitness"] *= 0.5
+    verdicts = {metric: verdict for name, metric, *_, verdict in benchmark.compare(slower, report)
+                if name == "baseline"}
+    print(f"✓ Slower run: computationTime {verdicts['computationTime']}, "
+          f"evaluationsPerSecond {verdicts['evaluationsPerSecond']}, bestFitness {verdicts['bestFitness']}")
+    if (verdicts["computationTime"], verdicts["evaluationsPerSecond"], verdicts["bestFitness"]) != \
+            ("regression", "regression", "improvement"):
+        failures += 1
+
+    # Feasibility is a rate, so fewer runs are comparable (with a warning)
+    single = benchmark.run_suite(["baseline"], runs=1, overrides={"generations": 100})
+    rates = {metric: verdict for _, metric, *_, verdict in benchmark.compare(single, report)}
+    print(f"✓ 1 run vs 2: feasibleRate {single['scenarios']['baseline']['metrics']['feasibleRate']:.0%} vs "
+          f"{report['scenarios']['baseline']['metrics']['feasibleRate']:.0%}, {rates['feasibleRate']}")
+    if rates["feasibleRate"] != "ok" or "firstFeasibleGeneration" in rates:
+        failures += 1
+
+    # --compare exits 1 on a regression
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_path = os.path.join(tmp, "baseline.json")
+        run_path = os.path.join(tmp, "run.json")
+        with open(baseline_path, "w") as f:
+            json.dump(report, f)
+        with open(run_path, "w") as f:
+            json.dump(slower, f)
+        same = benchmark.main(["--compare", baseline_path, "--baseline", baseline_path])
+        worse = benchmark.main(["--compare", run_path, "--baseline", baseline_path])
+        single_path = os.path.join(tmp, "single.json")
+        with open(single_path, "w") as f:
+            json.dump(single, f)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            benchmark.main(["--compare", single_path, "--baseline", baseline_path])
+        if "Runs per scenario differ" not in output.getvalue():
+            print("❌ Comparing 1 run against 2 should warn")
+            failures += 1
+    print(f"✓ Exit codes: unchanged {same}, regressed {worse}")
+    if (same, worse) != (0, 1):
+        failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All benchmark checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test convergence telemetry - best/median/worst fitness, diversity,
+evaluations and cache hits per generation, exported as NDJSON by
+optimize-cli.js --telemetry, downsampled to a fixed size on long runs,
+and off unless asked for
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from schedule_optimizer.runner import CLI
+
+FIELDS = ["generation", "best", "median", "worst", "diversity", "evaluations", "cacheHits"]
+CONFIG = {"startingBalance": 90.50, "targetEndingBalance": 490.50, "minimumBalance": 0,
+          "populationSize": 100, "generations": 500, "seed": 5}
+
+
+def run_cli(config, tmp, name):
+    """Run config; returns (result printed on stdout, telemetry records from the NDJSON file)"""
+    path = os.path.join(tmp, name)
+    completed = subprocess.run(["node", CLI, "-", "--compact", "--telemetry", path], input=json.dumps(config),
+                               capture_output=True, text=True, check=True)
+    with open(path) as f:
+        lines = f.read().splitlines()
+    return json.loads(completed.stdout), [json.loads(line) for line in lines]
+
+
+def check_records(label, records):
+    """Number of problems with the records of one run"""
+    problems = []
+    if not records or any(list(record) != FIELDS for record in records):
+        return 1
+    generations = [record["generation"] for record in records]
+    steps = {b - a for a, b in zip(generations, generations[1:])}
+    if generations[0] != 0 or len(steps) > 1:
+        problems.append(f"generations not evenly spaced from 0: {sorted(steps)}")
+    if any(not record["best"] <= record["median"] <= record["worst"] for record in records):
+        problems.append("best <= median <= worst")
+    if any(not 0 <= record["diversity"] <= 1 for record in records):
+        problems.append("diversity outside [0, 1]")
+    evaluations = [record["evaluations"] for record in records]
+    if evaluations != sorted(evaluations):
+        problems.append("evaluations should only grow")
+    for problem in problems:
+        print(f"❌ {label}: {problem}")
+    return len(problems)
+
+
+def main():
+    print("\n🧪 Testing convergence telemetry")
+    print("=" * 50)
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result, records = run_cli(CONFIG, tmp, "run.ndjson")
+        first, last = records[0], records[-1]
+        print(f"✓ {len(records)} records over {result['generations']} generations; generation 0: "
+              f"best {first['best']:.0f}, median {first['median']:.0f}, diversity {first['diversity']:.2f}; "
+              f"generation {last['generation']}: best {last['best']:.0f}, diversity {last['diversity']:.2f}")
+        failures += check_records("default run", records)
+        if "telemetry" in result or last["best"] >= first["best"] or last["diversity"] >= first["diversity"]:
+            print("❌ Telemetry belongs in the file only, and should show the run converging")
+            failures += 1
+        if last["cacheHits"] is None or last["evaluations"] > result["evaluations"]:
+            failures += 1
+
+        # Same seed, same telemetry; no fitness cache, no cache hits
+        _, again = run_cli(CONFIG, tmp, "again.ndjson")
+        _, uncached = run_cli({**CONFIG, "fitnessCacheSize": 0}, tmp, "uncached.ndjson")
+        print(f"✓ Seeded rerun identical: {again == records}; uncached cacheHits: {uncached[-1]['cacheHits']}")
+        if again != records or any(record["cacheHits"] is not None for record in uncached):
+            failures += 1
+
+        # A 10,000-generation run (the target is out of reach, so it never converges) stays in 100 slots
+        long_config = {**CONFIG, "targetEndingBalance": 5000, "populationSize": 30, "generations": 10000,
+                       "telemetrySize": 100}
+        long_result, long_records = run_cli(long_config, tmp, "long.ndjson")
+        stride = long_records[1]["generation"] - long_records[0]["generation"]
+        print(f"✓ {long_result['generations']} generations -> {len(long_records)} records, every {stride} "
+              f"generations, last {long_records[-1]['generation']}")
+        failures += check_records("long run", long_records)
+        if long_result["generations"] != 10000 or not 50 <= len(long_records) <= 100 or \
+                long_records[-1]["generation"] + stride < 10000:
+            failures += 1
+
+        # Off unless asked for; --telemetry turns it on, and it leaves the run unchanged
+        script = """
+            const { createOptimizer } = require(process.argv[1]);
+            createOptimizer({ populationSize: 50, generations: 50, seed: 1 }).optimize()
+                .then(result => console.log(JSON.stringify(result.telemetry === undefined)));
+        """
+        completed = subprocess.run(["node", "-e", script, CLI.replace("optimize-cli.js", "optimizer.js")],
+                                   capture_output=True, text=True, check=True)
+        print(f"✓ No telemetry by default: {json.loads(completed.stdout)}")
+        if not json.loads(completed.stdout):
+            failures += 1
+        off_result, off_records = run_cli({**CONFIG, "telemetrySize": 0}, tmp, "off.ndjson")
+        same = {key: value for key, value in off_result.items() if key not in ("computationTime", "peakMemory")} == \
+            {key: value for key, value in result.items() if key not in ("computationTime", "peakMemory")}
+        print(f"✓ telemetrySize 0: {len(off_records)} records, same schedule: {same}")
+        if off_records or not same:
+            failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All convergence telemetry checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
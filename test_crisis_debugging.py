@@ -6,21 +6,13 @@ Test with enhanced crisis mode debugging
 import subprocess
 import sys
 import time
-import threading
-import socketserver
-from http.server import SimpleHTTPRequestHandler
+
+from schedule_optimizer.static import start_static_server
 
 PORT = 8095
 
 def start_server():
-    handler = SimpleHTTPRequestHandler
-    handler.log_message = lambda *args: None
-    httpd = socketserver.TCPServer(("", PORT), handler)
-    httpd.allow_reuse_address = True
-    thread = threading.Thread(target=httpd.serve_forever)
-    thread.daemon = True
-    thread.start()
-    return httpd
+    return start_static_server(PORT)
 
 def main():
     print("\n🧪 Testing Crisis Mode with Enhanced Debugging")
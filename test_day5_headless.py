@@ -6,21 +6,13 @@ Test editing day 5 balance to $0 - Headless version
 import subprocess
 import sys
 import time
-import threading
-import socketserver
-from http.server import SimpleHTTPRequestHandler
+
+from schedule_optimizer.static import start_static_server
 
 PORT = 8089
 
 def start_server():
-    handler = SimpleHTTPRequestHandler
-    handler.log_message = lambda *args: None
-    httpd = socketserver.TCPServer(("", PORT), handler)
-    httpd.allow_reuse_address = True
-    thread = threading.Thread(target=httpd.serve_forever)
-    thread.daemon = True
-    thread.start()
-    return httpd
+    return start_static_server(PORT)
 
 def main():
     print("\n🧪 Testing Day 5 Balance Edit to $0")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the optimizer headlessly through optimize-cli.js - no server, no browser
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "optimize-cli.js")
+
+
+def run_cli(config):
+    """Run one optimization and return the parsed JSON result"""
+    completed = subprocess.run(
+        ["node", CLI, "-", "--compact"],
+        input=json.dumps(config),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def locked_schedule(result, through_day):
+    """manualConstraints that lock days 1..through_day to a previous result"""
+    constraints = {}
+    for day in result["formattedSchedule"][:through_day]:
+        constraints[str(day["day"])] = {"shifts": "+".join(day["shifts"]) or None}
+    return constraints
+
+
+def main():
+    print("\n🧪 Testing headless optimizer CLI")
+    print("=" * 50)
+    failures = 0
+
+    # Baseline month: $90.50 -> $490.50
+    start = time.time()
+    result = run_cli({"startingBalance": 90.50, "targetEndingBalance": 490.50,
+                      "minimumBalance": 0, "populationSize": 100, "generations": 500})
+    print(f"✓ Baseline optimized in {time.time() - start:.2f}s: "
+          f"${result['finalBalance']:.2f}, {len(result['workDays'])} work days, "
+          f"{result['violations']} violations")
+    if result["violations"] != 0 or abs(result["finalBalance"] - 490.50) > 10:
+        print("❌ Baseline should hit the target without violations")
+        failures += 1
+    if len(result["formattedSchedule"]) != 30:
+        print("❌ Formatted schedule should cover 30 days")
+        failures += 1
+
+    # Day 17 balance edited to $10 - crisis regeneration
+    constraints = locked_schedule(result, 17)
+    constraints["balanceEditDay"] = 17
+    constraints["newStartingBalance"] = 10
+    start = time.time()
+    crisis = run_cli({"startingBalance": 90.50, "targetEndingBalance": 490.50,
+                      "minimumBalance": 0, "populationSize": 100, "generations": 500,
+                      "manualConstraints": constraints})
+    day17 = crisis["formattedSchedule"][16]
+    print(f"✓ Day 17 -> $10 regenerated in {time.time() - start:.2f}s: "
+          f"day 17 ends at ${day17['endBalance']:.2f}, final ${crisis['finalBalance']:.2f}")
+    if abs(day17["endBalance"] - 10) > 0.01:
+        print("❌ Day 17 should end at the edited balance")
+        failures += 1
+    for day in crisis["formattedSchedule"][:17]:
+        expected = constraints[str(day["day"])]["shifts"]
+        if ("+".join(day["shifts"]) or None) != expected:
+            print(f"❌ Day {day['day']} should keep its locked shifts")
+            failures += 1
+            break
+
+    # Exact engine on the same baseline
+    start = time.time()
+    exact = run_cli({"engine": "exact"})
+    print(f"✓ Exact engine in {time.time() - start:.2f}s: fitness {exact['bestFitness']:.0f} "
+          f"vs genetic {result['bestFitness']:.0f}")
+    if exact["violations"] != 0 or abs(exact["finalBalance"] - 490.50) > 10:
+        print("❌ Exact engine should hit the target without violations")
+        failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All headless checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the optimization job API (/api/jobs) - submit, poll, cancel, and 429s
+once the concurrency limit and queue depth are used up
+"""
+
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from schedule_optimizer.server import OptimizationServer
+
+PORT = 8094
+BASE_URL = f"http://localhost:{PORT}"
+
+LONG_RUN = {"populationSize": 500, "generations": 2000, "targetEndingBalance": 900}
+
+
+def request(method, path, payload=None):
+    """Returns (status, parsed body)"""
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(BASE_URL + path, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def wait_for(job_id, statuses, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status, job = request("GET", f"/api/jobs/{job_id}")
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.1)
+    return job
+
+
+def main():
+    print("\n🧪 Testing optimization job queue")
+    print("=" * 50)
+    failures = 0
+
+    server = OptimizationServer(("", PORT), workers=1, max_queued=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # One running, one queued, the third is turned away
+        status1, running = request("POST", "/api/jobs", LONG_RUN)
+        status2, queued = request("POST", "/api/jobs", {"generations": 300})
+        start = time.time()
+        status3, rejected = request("POST", "/api/jobs", {})
+        reject_time = time.time() - start
+        print(f"✓ Submitted: {status1}, {status2}, then {status3} in {reject_time * 1000:.0f}ms")
+        if (status1, status2, status3) != (202, 202, 429) or reject_time > 0.5:
+            print(f"❌ Expected 202, 202 and a fast 429: {rejected}")
+            failures += 1
+
+        status, listing = request("GET", "/api/jobs")
+        print(f"✓ Queue: {listing['active']} active, {listing['queued']} queued")
+        if (listing["active"], listing["queued"]) != (1, 1):
+            failures += 1
+
+        # Progress shows up while the long run goes
+        job = running
+        for _ in range(50):
+            job = request("GET", f"/api/jobs/{running['id']}")[1]
+            if job["progress"]:
+                break
+            time.sleep(0.1)
+        print(f"✓ Running job progress: {job['progress'] and job['progress']['generation']}")
+        if not job["progress"]:
+            print("❌ Running job should report progress")
+            failures += 1
+
+        # Cancelling the long run lets the queued job through
+        status, cancelled = request("DELETE", f"/api/jobs/{running['id']}")
+        job = wait_for(running["id"], ("cancelled", "done", "failed"))
+        print(f"✓ DELETE -> {status}, job {job['status']}")
+        if status != 202 or job["status"] != "cancelled":
+            failures += 1
+
+        job = wait_for(queued["id"], ("done", "failed", "cancelled"))
+        print(f"✓ Queued job {job['status']}: ${job.get('result', {}).get('finalBalance', 0):.2f}")
+        if job["status"] != "done" or len(job["result"]["formattedSchedule"]) != 30:
+            failures += 1
+
+        status, _ = request("DELETE", f"/api/jobs/{queued['id']}")
+        status_missing, _ = request("GET", "/api/jobs/nope")
+        print(f"✓ DELETE finished job -> {status}, unknown job -> {status_missing}")
+        if (status, status_missing) != (409, 404):
+            failures += 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All job queue checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test log levels and fitness validation modes - a regeneration run is quiet
+unless debug is asked for, debug records are structured, validation runs
+on every, every nth, the first n or no evaluations, and none of it changes
+the schedule
+"""
+
+import json
+import subprocess
+import sys
+
+from schedule_optimizer.benchmark import reference_schedule, scenario_config
+from schedule_optimizer.runner import CLI
+
+OPTIMIZER = CLI.replace("optimize-cli.js", "optimizer.js")
+
+# Runs config with a logSink that collects the records, counting validator calls
+SCRIPT = """
+    const { createOptimizer, FitnessValidator } = require(process.argv[1]);
+    const config = JSON.parse(process.argv[2]);
+    const records = [];
+    let validations = 0;
+    const validate = FitnessValidator.validate;
+    FitnessValidator.validate = (...args) => { validations++; return validate(...args); };
+    config.logSink = (level, event, fields) => records.push({ level, event, fields });
+    const optimizer = createOptimizer(config);
+    optimizer.optimize().then(result => console.log(JSON.stringify({
+        records, validations, evaluations: optimizer.fitnessManager.evaluationCount,
+        genes: Array.from(result.genes), bestFitness: result.bestFitness
+    })));
+"""
+
+
+def run(config):
+    completed = subprocess.run(["node", "-e", SCRIPT, OPTIMIZER, json.dumps(config)],
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def main():
+    print("\n🧪 Testing log levels and fitness validation")
+    print("=" * 50)
+    failures = 0
+
+    crisis = {**scenario_config("day17-ten", reference_schedule()), "generations": 300, "seed": 3}
+
+    # A balance edit alone no longer turns on debug output
+    quiet = run(crisis)
+    print(f"✓ Default level: {len(quiet['records'])} records")
+    if quiet["records"]:
+        failures += 1
+    completed = subprocess.run(["node", CLI, "-", "--compact"], input=json.dumps(crisis),
+                               capture_output=True, text=True, check=True)
+    print(f"✓ CLI stderr at the default level: {len(completed.stderr)} bytes")
+    if completed.stderr:
+        failures += 1
+
+    # Debug: structured records, and the same schedule
+    debug = run({**crisis, "logLevel": "debug"})
+    events = {}
+    for record in debug["records"]:
+        events[record["event"]] = events.get(record["event"], 0) + 1
+    print(f"✓ Debug level: {events}")
+    generation = next(record["fields"] for record in debug["records"] if record["event"] == "generation best")
+    if set(events) != {"initial population", "seeded high-work chromosomes", "generation best",
+                       "fitness breakdown"} or generation["generation"] != 0 or \
+            list(generation["schedule"])[0] != "18" or any(r["level"] != "debug" for r in debug["records"]):
+        failures += 1
+    legacy = run({**crisis, "debugFitness": True})
+    if len(legacy["records"]) != len(debug["records"]):
+        print("❌ debugFitness should still mean debug")
+        failures += 1
+
+    # Validation modes
+    expected = {
+        "all": lambda n: n,
+        "sampled": lambda n: (n + 99) // 100,
+        "first": lambda n: min(n, 1000),
+        "off": lambda n: 0,
+    }
+    for mode, count in expected.items():
+        result = run({**crisis, "fitnessValidation": mode})
+        same = result["genes"] == quiet["genes"] and result["bestFitness"] == quiet["bestFitness"]
+        print(f"✓ {mode:<8} validated {result['validations']:>6} of {result['evaluations']} evaluations; "
+              f"same schedule: {same}")
+        if result["validations"] != count(result["evaluations"]) or not same:
+            failures += 1
+    custom = run({**crisis, "fitnessValidation": {"mode": "first", "n": 25}})
+    if custom["validations"] != 25:
+        failures += 1
+
+    # Unknown levels and modes are rejected up front
+    for config in ({"logLevel": "verbose"}, {"fitnessValidation": "never"}):
+        completed = subprocess.run(["node", CLI, "-"], input=json.dumps(config), capture_output=True, text=True)
+        print(f"✓ {config} rejected: {completed.stderr.strip()}")
+        if completed.returncode == 0:
+            failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All logging checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
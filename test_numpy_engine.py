@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the NumPy engine (schedule_optimizer) against optimizer.js - the same
+chromosomes must score the same in both, and the engine must solve the
+baseline and balance-edit scenarios
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from schedule_optimizer import ScheduleModel, evaluate_population, optimize
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Scores each chromosome with ImprovedGeneticOptimizer.evaluateFitness()
+JS_EVALUATE = """
+const { ImprovedGeneticOptimizer } = require(process.argv[1]);
+console.log = () => {};
+const { config, genes } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const optimizer = new ImprovedGeneticOptimizer(config);
+const scores = genes.map(g => optimizer.evaluateFitness(Uint8Array.from(g)));
+process.stdout.write(JSON.stringify(scores.map(s => [s.fitness, s.balance, s.workDays, s.violations, s.minBalance])));
+"""
+
+SCENARIOS = {
+    "baseline": {"startingBalance": 90.50, "targetEndingBalance": 490.50, "minimumBalance": 0},
+    "day 17 -> $10": {
+        "manualConstraints": {
+            **{str(day): {"shifts": "large" if day % 3 == 0 else None} for day in range(1, 18)},
+            "balanceEditDay": 17,
+            "newStartingBalance": 10,
+        },
+    },
+    "fixed balance + earnings": {
+        "minimumBalance": 100,
+        "manualConstraints": {"5": {"fixedBalance": 400}, "12": {"fixedEarnings": 123.5},
+                              "20": {"shifts": "medium+large"}, "30": {"fixedExpenses": 1500}},
+    },
+    "two months": {"horizon": {"start": "2025-02", "months": 2}},
+}
+
+
+def js_scores(config, genes):
+    completed = subprocess.run(
+        ["node", "-e", JS_EVALUATE, os.path.join(ROOT, "optimizer.js")],
+        input=json.dumps({"config": config, "genes": genes.tolist()}),
+        capture_output=True, text=True, check=True,
+    )
+    return np.array(json.loads(completed.stdout))
+
+
+def main():
+    print("\n🧪 Testing NumPy engine")
+    print("=" * 50)
+    failures = 0
+    rng = np.random.default_rng(7)
+
+    for name, config in SCENARIOS.items():
+        model = ScheduleModel(json.loads(json.dumps(config)))
+        genes = model.effective_genes(rng.integers(0, 10, size=(200, model.days + 1)))
+        scores = evaluate_population(model, genes)
+        ours = np.column_stack([scores[key] for key in
+                                ("fitness", "balance", "workDays", "violations", "minBalance")])
+        theirs = js_scores(config, genes)
+        error = np.abs(ours - theirs).max()
+        print(f"{'✓' if error < 1e-6 else '❌'} {name}: 200 chromosomes, max difference {error:.2e}"
+              f" ({'crisis' if model.in_crisis_mode else 'normal'} mode)")
+        if error >= 1e-6:
+            failures += 1
+
+    start = time.time()
+    result = optimize(SCENARIOS["baseline"], seed=1)
+    print(f"✓ Baseline optimized in {time.time() - start:.2f}s: ${result['finalBalance']:.2f}, "
+          f"{len(result['workDays'])} work days, {result['violations']} violations, "
+          f"{result['evaluations'] / result['computationTime']:.0f} evaluations/s")
+    if result["violations"] != 0 or abs(result["finalBalance"] - 490.50) > 10:
+        print("❌ Baseline should hit the target without violations")
+        failures += 1
+
+    config = json.loads(json.dumps(SCENARIOS["day 17 -> $10"]))
+    result = optimize(config, seed=1)
+    day17 = result["formattedSchedule"][16]
+    # The locked days run below $0 before the edit - only days 18-30 must stay solvent
+    short_days = [day["day"] for day in result["formattedSchedule"][17:] if day["endBalance"] < 0]
+    print(f"✓ Day 17 -> $10: day 17 ends at ${day17['endBalance']:.2f}, "
+          f"final ${result['finalBalance']:.2f}, {len(short_days)} days below $0 after the edit")
+    if abs(day17["endBalance"] - 10) > 0.01 or short_days:
+        print("❌ Day 17 should end at $10 and the rest of the month stay solvent")
+        failures += 1
+
+    if optimize(SCENARIOS["baseline"], seed=3)["genes"] != optimize(SCENARIOS["baseline"], seed=3)["genes"]:
+        print("❌ The same seed should give the same schedule")
+        failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All NumPy engine checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test the optimization HTTP API (POST /api/optimize) - results, error
+handling, and static files staying responsive while optimizations run
+"""
+
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from schedule_optimizer.server import OptimizationServer
+
+PORT = 8093
+BASE_URL = f"http://localhost:{PORT}"
+
+
+def post_json(path, payload):
+    """POST payload as JSON; returns (status, parsed body)"""
+    request = urllib.request.Request(BASE_URL + path, data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def main():
+    print("\n🧪 Testing optimization API")
+    print("=" * 50)
+    failures = 0
+
+    server = OptimizationServer(("", PORT), workers=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # The regenerateWithEdits() payload: day 17 edited to $10
+        constraints = {str(day): {"shifts": "large" if day % 2 else None} for day in range(1, 18)}
+        constraints.update(balanceEditDay=17, newStartingBalance=10)
+        config = {"startingBalance": 90.50, "targetEndingBalance": 490.50, "minimumBalance": 0,
+                  "populationSize": 100, "generations": 500, "manualConstraints": constraints}
+        start = time.time()
+        status, result = post_json("/api/optimize", config)
+        print(f"✓ POST /api/optimize -> {status} in {time.time() - start:.2f}s")
+        if status != 200 or len(result.get("formattedSchedule", [])) != 30:
+            print(f"❌ Expected a 30-day formatted schedule, got {status}: {str(result)[:200]}")
+            failures += 1
+        elif abs(result["formattedSchedule"][16]["endBalance"] - 10) > 0.01:
+            print("❌ Day 17 should end at the edited balance")
+            failures += 1
+
+        # Static files while two optimizations run
+        results = []
+        runs = [threading.Thread(target=lambda: results.append(post_json("/api/optimize", {"generations": 2000})))
+                for _ in range(2)]
+        for run in runs:
+            run.start()
+        time.sleep(0.3)
+        start = time.time()
+        with urllib.request.urlopen(BASE_URL + "/index.html") as response:
+            page = response.read()
+        static_time = time.time() - start
+        print(f"✓ GET /index.html during optimizations: {len(page)} bytes in {static_time * 1000:.0f}ms")
+        if static_time > 0.5:
+            print("❌ Static files should not wait for optimizations")
+            failures += 1
+        for run in runs:
+            run.join()
+        if [status for status, _ in results] != [200, 200]:
+            print(f"❌ Concurrent optimizations should both succeed: {results}")
+            failures += 1
+
+        # Errors come back as JSON
+        status, body = post_json("/api/optimize", {"manualConstraints": {"5": {"shifts": "huge"}}})
+        print(f"✓ Invalid shift -> {status}: {body.get('error')}")
+        if status != 400:
+            failures += 1
+        request = urllib.request.Request(BASE_URL + "/api/optimize", data=b"{not json")
+        try:
+            urllib.request.urlopen(request)
+            status = 200
+        except urllib.error.HTTPError as e:
+            status = e.code
+        print(f"✓ Malformed JSON -> {status}")
+        if status != 400:
+            failures += 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All API checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test per-phase profiling - calls, total and mean time for each phase of
+the evolution loop, in the progress reports and the result, without
+changing the run
+"""
+
+import sys
+
+from schedule_optimizer.runner import run_optimization
+
+PHASES = ["init", "sort", "selection", "crossover", "mutation", "evaluateFitness", "strategy", "progress"]
+CONFIG = {"startingBalance": 90.50, "targetEndingBalance": 490.50, "minimumBalance": 0,
+          "populationSize": 100, "generations": 300, "seed": 11}
+
+
+def main():
+    print("\n🧪 Testing phase profiling")
+    print("=" * 50)
+    failures = 0
+
+    reports = []
+    profiled = run_optimization({**CONFIG, "profile": True}, reports.append)
+    plain = run_optimization(CONFIG)
+
+    profile = profiled.get("profile")
+    if not profile or list(profile) != PHASES:
+        print(f"❌ result.profile should list {PHASES}, got {profile and list(profile)}")
+        return 1
+    for phase, stats in profile.items():
+        print(f"✓ {phase:<16} {stats['calls']:>7} calls {stats['totalMs']:>9.1f}ms total "
+              f"{stats['meanMs'] * 1000:>9.2f}µs mean")
+        if stats["calls"] == 0 or abs(stats["meanMs"] * stats["calls"] - stats["totalMs"]) > 1e-6:
+            failures += 1
+    if profile["init"]["calls"] != 1 or profile["crossover"]["calls"] != profile["mutation"]["calls"]:
+        print("❌ One init, and one mutation per crossover")
+        failures += 1
+
+    # Progress reports carry the profile so far
+    with_profile = [report for report in reports if "profile" in report]
+    print(f"✓ {len(with_profile)}/{len(reports)} progress reports carry a profile")
+    if not reports or len(with_profile) != len(reports):
+        failures += 1
+    elif reports[-1]["profile"]["crossover"]["calls"] <= reports[0]["profile"]["crossover"]["calls"]:
+        print("❌ Later reports should have counted more work")
+        failures += 1
+
+    # Off by default, and timing a run does not change it
+    measured = ("profile", "computationTime", "peakMemory")
+    same = {key: value for key, value in profiled.items() if key not in measured} == \
+        {key: value for key, value in plain.items() if key not in measured}
+    print(f"✓ Unprofiled run has no profile: {'profile' not in plain}; same schedule: {same}")
+    if "profile" in plain or not same:
+        failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All profiling checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test live optimization progress over Server-Sent Events
+(/api/jobs/{id}/events) - several followers per job, and slow followers
+skip intermediate reports instead of buffering them
+"""
+
+import json
+import sys
+import threading
+import time
+import urllib.request
+
+from schedule_optimizer.jobs import Job
+from schedule_optimizer.server import OptimizationServer
+
+PORT = 8095
+BASE_URL = f"http://localhost:{PORT}"
+
+
+def submit(config):
+    request = urllib.request.Request(BASE_URL + "/api/jobs", data=json.dumps(config).encode())
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def follow(job_id, events, delay=0):
+    """Read the event stream into events as (event, id, data) until it ends"""
+    with urllib.request.urlopen(f"{BASE_URL}/api/jobs/{job_id}/events") as stream:
+        event = {}
+        for raw in stream:
+            line = raw.decode().rstrip("\n")
+            if not line:
+                if event:
+                    events.append((event.get("event"), int(event["id"]), json.loads(event["data"])))
+                    event = {}
+                    time.sleep(delay)
+                continue
+            if line.startswith(":"):
+                continue
+            key, _, value = line.partition(": ")
+            event[key] = value
+
+
+def main():
+    print("\n🧪 Testing progress event streams")
+    print("=" * 50)
+    failures = 0
+
+    # Latest-value semantics: a watcher that falls behind gets the newest report only
+    job = Job({})
+    seen = job.next_update(-1, timeout=0)
+    for generation in range(0, 500, 50):
+        job.publish({"generation": generation})
+    latest = job.next_update(seen, timeout=0)
+    print(f"✓ Watcher behind by {latest - seen} reports sees generation {job.progress['generation']}")
+    if job.progress["generation"] != 450 or job.next_update(latest, timeout=0.05) != latest:
+        print("❌ Only the latest report should be pending")
+        failures += 1
+
+    server = OptimizationServer(("", PORT), workers=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        job = submit({"populationSize": 300, "generations": 1500, "targetEndingBalance": 900})
+        fast, slow = [], []
+        followers = [threading.Thread(target=follow, args=(job["id"], fast)),
+                     threading.Thread(target=follow, args=(job["id"], slow, 0.5))]
+        for follower in followers:
+            follower.start()
+        for follower in followers:
+            follower.join(timeout=120)
+
+        progress = [data["generation"] for event, _, data in fast if event == "progress"]
+        print(f"✓ Fast follower: {len(fast)} events, generations {progress[:3]}...{progress[-1:]}")
+        if not progress or progress != sorted(progress):
+            print("❌ Progress events should arrive in generation order")
+            failures += 1
+        for name, events in (("fast", fast), ("slow", slow)):
+            if not events or events[-1][0] != "done" or "formattedSchedule" not in events[-1][2]["result"]:
+                print(f"❌ The {name} follower should end with the done event and the result")
+                failures += 1
+        ids = [event_id for _, event_id, _ in slow]
+        print(f"✓ Slow follower: {len(slow)} events, ids {ids[:5]}...")
+        if ids != sorted(ids) or len(slow) > len(fast):
+            print("❌ The slow follower should get a subset of the events, in order")
+            failures += 1
+
+        # A finished job replays its final event straight away
+        late = []
+        follow(job["id"], late)
+        if [event for event, _, _ in late] != ["done"]:
+            print(f"❌ Following a finished job should give only its final event: {late}")
+            failures += 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All progress event checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test request coalescing - identical concurrent optimizations share one
+run, its progress stream and its result
+"""
+
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from schedule_optimizer.server import OptimizationServer
+
+PORT = 8097
+BASE_URL = f"http://localhost:{PORT}"
+
+
+def request(method, path, payload=None):
+    """Returns (status, body bytes)"""
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(BASE_URL + path, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def main():
+    print("\n🧪 Testing request coalescing")
+    print("=" * 50)
+    failures = 0
+
+    server = OptimizationServer(("", PORT), workers=4)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # Five clients ask for the baseline at once - one run answers all of them
+        config = {"startingBalance": 90.50, "targetEndingBalance": 490.50, "generations": 600}
+        responses = []
+        clients = [threading.Thread(target=lambda: responses.append(request("POST", "/api/optimize", config)))
+                   for _ in range(5)]
+        start = time.time()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        stats = server.jobs.stats()
+        runs = len(server.jobs.list())
+        print(f"✓ 5 concurrent requests in {time.time() - start:.2f}s: {runs} run(s), "
+              f"{stats['coalesced']} coalesced")
+        if runs != 1 or stats["coalesced"] != 4:
+            print("❌ Identical concurrent requests should share one run")
+            failures += 1
+        if {status for status, _ in responses} != {200} or len({body for _, body in responses}) != 1:
+            print("❌ Every request should get the same result")
+            failures += 1
+
+        # Different requests still run separately
+        request("POST", "/api/optimize", {**config, "targetEndingBalance": 600})
+        if len(server.jobs.list()) != 2:
+            print("❌ A different config should get its own run")
+            failures += 1
+
+        # Job API: same id for both submitters; the run stops only when both withdraw
+        long_run = {"populationSize": 500, "generations": 2000, "targetEndingBalance": 900}
+        _, first = request("POST", "/api/jobs", long_run)
+        _, second = request("POST", "/api/jobs", long_run)
+        first, second = json.loads(first), json.loads(second)
+        print(f"✓ Job ids: {first['id']} / {second['id']}, requesters {second['requesters']}")
+        if first["id"] != second["id"] or second["requesters"] != 2:
+            failures += 1
+        _, body = request("DELETE", f"/api/jobs/{first['id']}")
+        after_one = json.loads(body)["status"]
+        request("DELETE", f"/api/jobs/{first['id']}")
+        job = server.jobs.get(first["id"])
+        job.wait(timeout=10)
+        print(f"✓ After one DELETE: {after_one}; after both: {job.status}")
+        if after_one not in ("queued", "running") or job.status != "cancelled":
+            failures += 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All coalescing checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
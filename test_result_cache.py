@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite result cache - canonical request keys, eviction,
+persistence, and repeat /api/optimize requests answered from the cache
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from schedule_optimizer.cache import ResultCache, request_key
+from schedule_optimizer.server import OptimizationServer
+
+PORT = 8096
+BASE_URL = f"http://localhost:{PORT}"
+BASELINE = {"startingBalance": 90.50, "targetEndingBalance": 490.50, "minimumBalance": 0,
+            "populationSize": 100, "generations": 500}
+
+
+def post(config):
+    """Returns (X-Cache header, body bytes, seconds)"""
+    request = urllib.request.Request(BASE_URL + "/api/optimize", data=json.dumps(config).encode())
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        body = response.read()
+        return response.headers.get("X-Cache"), body, time.perf_counter() - start
+
+
+def main():
+    print("\n🧪 Testing result cache")
+    print("=" * 50)
+    failures = 0
+
+    # Canonical keys
+    a = {"startingBalance": 90.5, "manualConstraints": {"5": {"shifts": "large"}, "12": {"fixedEarnings": 100}}}
+    b = {"manualConstraints": {"12": {"fixedEarnings": 100.0}, 5: {"shifts": "large"}}, "startingBalance": 90.50}
+    same = request_key(a) == request_key(b)
+    seeded = request_key({**a, "seed": 1}) != request_key({**a, "seed": 2})
+    engines = request_key(a) != request_key({**a, "engine": "numpy"})
+    print(f"✓ Reordered/retyped config -> same key: {same}; seeds differ: {seeded}; engines differ: {engines}")
+    if not (same and seeded and engines):
+        failures += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Size-based eviction, least recently used first, and persistence
+        path = os.path.join(tmp, "cache.sqlite3")
+        cache = ResultCache(path, max_bytes=3000)
+        for i in range(3):
+            cache.put(f"k{i}", b"x" * 1000)
+        cache.get("k0")
+        cache.put("k3", b"x" * 1000)
+        kept = [key for key in ("k0", "k1", "k2", "k3") if cache.get(key) is not None]
+        print(f"✓ Eviction kept {kept}, {cache.stats()['bytes']} bytes")
+        if kept != ["k0", "k2", "k3"]:
+            print("❌ The least recently used entry (k1) should be evicted")
+            failures += 1
+        cache.close()
+        reopened = ResultCache(path, max_bytes=3000)
+        if reopened.stats()["entries"] != 3 or reopened.get("k3") != b"x" * 1000:
+            print("❌ Entries should survive reopening the cache")
+            failures += 1
+        start = time.perf_counter()
+        for _ in range(1000):
+            reopened.get("k3")
+        lookup_us = (time.perf_counter() - start) * 1000
+        print(f"✓ Cache lookup: {lookup_us:.1f}µs")
+        reopened.close()
+
+        # Repeat API requests
+        server = OptimizationServer(("", PORT), cache_path=os.path.join(tmp, "api.sqlite3"))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            first_status, first, first_time = post(BASELINE)
+            # Same request, keys in another order and 490.5 spelled differently
+            reordered = dict(reversed(list({**BASELINE, "targetEndingBalance": 490.500}.items())))
+            second_status, second, second_time = post(reordered)
+            print(f"✓ First request: {first_status} in {first_time * 1000:.0f}ms; "
+                  f"repeat: {second_status} in {second_time * 1000:.1f}ms")
+            if (first_status, second_status) != ("MISS", "HIT") or first != second:
+                print("❌ The repeat request should be answered from the cache with the same result")
+                failures += 1
+            print(f"✓ Server cache: {server.cache.describe()}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All result cache checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
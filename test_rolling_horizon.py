@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the rolling multi-month planner - closing a month carries its ending
+balance into the next plan, renumbers the remaining constraints to the new
+horizon's days, and appends a month that gets scheduled and is feasible
+"""
+
+import json
+import subprocess
+import sys
+
+from schedule_optimizer.runner import CLI
+
+OPTIMIZER = CLI.replace("optimize-cli.js", "optimizer.js")
+BALANCE_TOLERANCE = 5
+
+SCRIPT = """
+    const { RollingHorizonPlanner, serializeResult } = require(process.argv[1]);
+    const config = JSON.parse(process.argv[2]);
+    (async () => {
+        const planner = new RollingHorizonPlanner(config);
+        const first = serializeResult(await planner.plan());
+        planner.closeMonth(first.months[0].endingBalance);
+        const rolled = { horizon: planner.config.horizon, startingBalance: planner.config.startingBalance,
+                         manualConstraints: planner.config.manualConstraints };
+        const second = serializeResult(await planner.plan());
+
+        // Renumbering with a balance edit, and running out of months
+        const edited = planner.shiftConstraints({ 40: { shifts: 'small' }, 10: { shifts: 'large' },
+                                                  balanceEditDay: 40, newStartingBalance: 25 }, 28);
+        planner.closeMonth(second.months[0].endingBalance, { extend: false });
+        let exhausted = null;
+        try {
+            planner.closeMonth(0, { extend: false });
+        } catch (error) {
+            exhausted = error.message;
+        }
+        console.log(JSON.stringify({ first, rolled, second, edited, exhausted, left: planner.config.horizon }));
+    })();
+"""
+
+CONFIG = {"horizon": {"start": "2026-01", "months": 2}, "startingBalance": 90.50, "targetEndingBalance": 490.50,
+          "minimumBalance": 0, "populationSize": 100, "generations": 500, "seed": 1,
+          "manualConstraints": {"5": {"shifts": "small"}, "35": {"shifts": "large"}}}
+
+
+def main():
+    print("\n🧪 Testing rolling horizon planner")
+    print("=" * 50)
+    failures = 0
+
+    completed = subprocess.run(["node", "-e", SCRIPT, OPTIMIZER, json.dumps(CONFIG)],
+                               capture_output=True, text=True, check=True)
+    run = json.loads(completed.stdout)
+    first, rolled, second = run["first"], run["rolled"], run["second"]
+
+    # January closes; February opens from its closing balance
+    january = first["months"][0]
+    february = second["months"][0]
+    print(f"✓ {january['month']} closed at ${january['endingBalance']:.2f}; next plan {rolled['horizon']} "
+          f"starts at ${february['startingBalance']:.2f}")
+    if rolled["horizon"] != {"start": "2026-02", "months": 2} or february["month"] != "2026-02" or \
+            rolled["startingBalance"] != january["endingBalance"] or \
+            february["startingBalance"] != january["endingBalance"]:
+        failures += 1
+
+    # Day 35 (February 4) is day 4 of the new horizon; January's day 5 is gone
+    print(f"✓ Constraints after closing: {rolled['manualConstraints']}; "
+          f"day 4 scheduled {second['formattedSchedule'][3]['shifts']}")
+    if rolled["manualConstraints"] != {"4": {"shifts": "large"}} or \
+            second["formattedSchedule"][3]["shifts"] != ["large"]:
+        failures += 1
+    edited = run["edited"]
+    print(f"✓ Balance edit on day 40 renumbered: {edited}")
+    if edited != {"12": {"shifts": "small"}, "balanceEditDay": 12, "newStartingBalance": 25}:
+        failures += 1
+
+    # March is appended, scheduled, and the plan reaches the target without violations
+    march = second["months"][1]
+    feasible = second["violations"] == 0 and \
+        second["finalBalance"] >= CONFIG["targetEndingBalance"] - BALANCE_TOLERANCE
+    print(f"✓ Appended {march['month']} (days {march['firstDay']}-{march['lastDay']}): "
+          f"{march['workDays']} work days, ${march['earnings']:.2f}; final balance "
+          f"${second['finalBalance']:.2f}, {second['violations']} violations")
+    if march["month"] != "2026-03" or march["lastDay"] - march["firstDay"] != 30 or \
+            march["workDays"] == 0 or not feasible:
+        failures += 1
+
+    # Without extend the window shrinks, until there is nothing left to plan
+    print(f"✓ After closing February without extending: {run['left']}; then: {run['exhausted']}")
+    if run["left"] != {"start": "2026-03", "months": 1} or run["exhausted"] != "No months left to plan":
+        failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All rolling horizon checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test batch scenario sweeps (python -m schedule_optimizer.sweep) - grid and
+CSV input, JSON lines and CSV output
+"""
+
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def run_sweep(*args):
+    return subprocess.run([sys.executable, "-m", "schedule_optimizer.sweep", *args],
+                          cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True)
+
+
+def main():
+    print("\n🧪 Testing scenario sweeps")
+    print("=" * 50)
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Grid -> JSON lines
+        output = os.path.join(tmp, "grid.jsonl")
+        completed = run_sweep("--grid", "startingBalance=0:100:50", "--grid", "targetEndingBalance=400,500",
+                              "--set", "populationSize=60", "--seed", "1", "--workers", "2", "-o", output)
+        records = [json.loads(line) for line in open(output)] if completed.returncode == 0 else []
+        print(f"✓ Grid sweep: {len(records)} scenarios - {completed.stderr.strip().splitlines()[-1]}")
+        if len(records) != 6 or any("error" in r for r in records):
+            print(f"❌ Expected 6 successful scenarios\n{completed.stderr}")
+            failures += 1
+        starts = sorted({r["config"]["startingBalance"] for r in records})
+        if starts != [0, 50, 100]:
+            print(f"❌ Grid should cover starting balances 0, 50, 100 - got {starts}")
+            failures += 1
+        for record in records:
+            if abs(record["result"]["finalBalance"] - record["config"]["targetEndingBalance"]) > 25:
+                print(f"❌ Scenario {record['scenario']} missed its target: {record['result']['finalBalance']}")
+                failures += 1
+                break
+
+        # CSV -> CSV, one scenario with a bad value
+        scenarios = os.path.join(tmp, "scenarios.csv")
+        with open(scenarios, "w") as f:
+            f.write('startingBalance,targetEndingBalance,manualConstraints\n'
+                    '200,600,\n'
+                    '200,600,"{""5"": {""shifts"": ""large""}}"\n'
+                    '200,600,"{""5"": {""shifts"": ""huge""}}"\n')
+        output = os.path.join(tmp, "out.csv")
+        completed = run_sweep("--csv", scenarios, "--set", "populationSize=60", "--workers", "2", "-o", output)
+        rows = list(csv.DictReader(open(output)))
+        print(f"✓ CSV sweep: {len(rows)} rows, exit code {completed.returncode}")
+        if len(rows) != 3 or completed.returncode != 1:
+            print("❌ Expected 3 rows and a failing exit code for the bad scenario")
+            failures += 1
+        by_scenario = {int(row["scenario"]): row for row in rows}
+        if by_scenario.get(1, {}).get("schedule", "").split("|")[4:5] != ["large"]:
+            print("❌ Scenario 1 should keep its day 5 constraint")
+            failures += 1
+        if "huge" not in by_scenario.get(2, {}).get("error", ""):
+            print("❌ Scenario 2 should report its invalid shift")
+            failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All sweep checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,9 +12,8 @@ import subprocess
 import threading
 import queue
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import socketserver
 import webbrowser
+from schedule_optimizer.server import DEFAULT_CACHE_PATH, OptimizationHandler, OptimizationServer
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -25,7 +24,7 @@ from selenium.common.exceptions import TimeoutException
 PORT = 8080
 HOST = 'localhost'
 
-class TestHTTPHandler(SimpleHTTPRequestHandler):
+class TestHTTPHandler(OptimizationHandler):
     """Custom HTTP handler for our test server"""
     def log_message(self, format, *args):
         # Suppress console output
@@ -45,8 +44,7 @@ class TestServer:
             return
             
         handler = TestHTTPHandler
-        self.server = socketserver.TCPServer(("", self.port), handler)
-        self.server.allow_reuse_address = True
+        self.server = OptimizationServer(("", self.port), handler, cache_path=DEFAULT_CACHE_PATH)
         
         def serve():
             self.running = True
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test static file serving - keep-alive, ETag/304 revalidation, gzip,
+mtime invalidation and sendfile for files too large to cache
+"""
+
+import gzip
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from schedule_optimizer.server import OptimizationHandler, OptimizationServer
+from schedule_optimizer.static import StaticFileCache
+
+PORT = 8098
+
+
+class QuietHandler(OptimizationHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    print("\n🧪 Testing static file serving")
+    print("=" * 50)
+    failures = 0
+
+    with open("index.html", "rb") as f:
+        index = f.read()
+
+    server = OptimizationServer(("", PORT), QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        conn = http.client.HTTPConnection("localhost", PORT)
+
+        # Plain and gzip bodies, over one connection
+        conn.request("GET", "/index.html?v=1")
+        response = conn.getresponse()
+        plain, etag = response.read(), response.getheader("ETag")
+        sock = conn.sock
+        conn.request("GET", "/index.html?v=2", headers={"Accept-Encoding": "gzip, deflate"})
+        response = conn.getresponse()
+        zipped, gzip_etag = response.read(), response.getheader("ETag")
+        print(f"✓ index.html: {len(plain)} bytes, {len(zipped)} gzipped, ETag {etag}")
+        if plain != index or response.getheader("Content-Encoding") != "gzip" or gzip.decompress(zipped) != index:
+            print("❌ Bodies should match index.html, gzipped on request")
+            failures += 1
+        if etag == gzip_etag or response.getheader("Vary") != "Accept-Encoding":
+            print("❌ The gzip body needs its own ETag and Vary: Accept-Encoding")
+            failures += 1
+        if conn.sock is not sock:
+            print("❌ The connection should be kept alive between requests")
+            failures += 1
+
+        # Revalidation
+        conn.request("GET", "/index.html", headers={"If-None-Match": etag})
+        response = conn.getresponse()
+        body = response.read()
+        print(f"✓ Revalidation: {response.status}, {len(body)} body bytes")
+        if response.status != 304 or body:
+            failures += 1
+
+        # Accept-Encoding q-values: q=0 refuses gzip, * allows it
+        encodings = {}
+        for accept in ("gzip;q=0", "gzip;q=0.5, identity", "deflate, *;q=0.1", "*, gzip;q=0", "br"):
+            conn.request("GET", "/index.html", headers={"Accept-Encoding": accept})
+            response = conn.getresponse()
+            response.read()
+            encodings[accept] = response.getheader("Content-Encoding")
+        print(f"✓ Content-Encoding by Accept-Encoding: {encodings}")
+        if encodings != {"gzip;q=0": None, "gzip;q=0.5, identity": "gzip", "deflate, *;q=0.1": "gzip",
+                         "*, gzip;q=0": None, "br": None}:
+            failures += 1
+
+        # Repeat requests come from memory
+        start = time.perf_counter()
+        for _ in range(200):
+            conn.request("GET", "/optimizer.js", headers={"Accept-Encoding": "gzip"})
+            conn.getresponse().read()
+        per_request = (time.perf_counter() - start) / 200 * 1000
+        print(f"✓ optimizer.js on a kept-alive connection: {per_request:.2f}ms per request")
+
+        # API responses share the connection too
+        conn.request("GET", "/api/jobs")
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200 or conn.sock is not sock:
+            print("❌ API requests should work on the same connection")
+            failures += 1
+        conn.close()
+
+        with tempfile.TemporaryDirectory(dir=".") as tmp:
+            name = os.path.basename(tmp)
+
+            # A changed file is reloaded
+            path = os.path.join(tmp, "page.html")
+            with open(path, "w") as f:
+                f.write("<p>first</p>")
+            conn = http.client.HTTPConnection("localhost", PORT)
+            conn.request("GET", f"/{name}/page.html")
+            first = conn.getresponse().read()
+            with open(path, "w") as f:
+                f.write("<p>second version</p>")
+            conn.request("GET", f"/{name}/page.html")
+            second = conn.getresponse().read()
+            print(f"✓ Edited file: {first!r} -> {second!r}")
+            if second != b"<p>second version</p>":
+                failures += 1
+
+            # Too large to cache - sent straight from the file
+            big = os.urandom(StaticFileCache().max_file_bytes + 1)
+            with open(os.path.join(tmp, "big.bin"), "wb") as f:
+                f.write(big)
+            conn.request("GET", f"/{name}/big.bin")
+            response = conn.getresponse()
+            body, big_etag = response.read(), response.getheader("ETag")
+            conn.request("GET", f"/{name}/big.bin", headers={"If-None-Match": big_etag})
+            response = conn.getresponse()
+            response.read()
+            print(f"✓ Uncached {len(body)} byte file, then {response.status}")
+            if body != big or response.status != 304:
+                failures += 1
+            conn.request("HEAD", f"/{name}/big.bin")
+            response = conn.getresponse()
+            response.read()
+            if int(response.getheader("Content-Length")) != len(big):
+                print("❌ HEAD should report the file size")
+                failures += 1
+            conn.close()
+        print(f"✓ Static cache: {len(server.static_cache.files)} files, {server.static_cache.bytes} bytes")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All static serving checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test warm-start regeneration - a balance edit seeded with the previous
+run's final population, where only the worked days before the edit are
+locked (as regenerateWithEdits() does): genes, schedule and
+formattedSchedule must agree on every locked day
+"""
+
+import json
+import subprocess
+import sys
+
+from schedule_optimizer.runner import CLI
+
+EDIT_DAY = 10
+BASE = {"startingBalance": 90.50, "targetEndingBalance": 490.50, "minimumBalance": 0,
+        "populationSize": 100, "generations": 300, "seed": 2}
+
+
+def run_cli(config):
+    completed = subprocess.run(["node", CLI, "-", "--compact", "--population"], input=json.dumps(config),
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def main():
+    print("\n🧪 Testing warm-start regeneration")
+    print("=" * 50)
+    failures = 0
+
+    previous = run_cli(BASE)
+
+    # Lock only the worked days up to the edit; every seed works every locked day,
+    # so days off in the locked schedule must be repaired rather than kept
+    constraints = {str(day["day"]): {"shifts": "+".join(day["shifts"])}
+                   for day in previous["formattedSchedule"][:EDIT_DAY] if day["shifts"]}
+    constraints["balanceEditDay"] = EDIT_DAY
+    constraints["newStartingBalance"] = 150
+    seeds = [[genes[0]] + [genes[day] or 7 for day in range(1, EDIT_DAY + 1)] + genes[EDIT_DAY + 1:]
+             for genes in previous["finalPopulation"]]
+    off_days = [day for day in range(1, EDIT_DAY + 1) if str(day) not in constraints]
+    print(f"✓ Locked {len(constraints) - 2} worked days; days off before the edit: {off_days}")
+    if not off_days:
+        print("❌ The scenario needs a day off before the edit")
+        return 1
+
+    result = run_cli({**BASE, "seed": 3, "manualConstraints": constraints, "seedPopulation": seeds})
+    mismatched = []
+    for day in range(1, EDIT_DAY + 1):
+        formatted = "+".join(result["formattedSchedule"][day - 1]["shifts"]) or None
+        locked = constraints.get(str(day), {}).get("shifts")
+        if result["schedule"][day] != formatted or formatted != locked or \
+                (result["genes"][day] == 0) != (locked is None):
+            mismatched.append(day)
+    print(f"✓ Locked days where genes/schedule/formattedSchedule disagree: {mismatched}")
+    if mismatched:
+        failures += 1
+    worked = [day for day in result["workDays"] if day <= EDIT_DAY]
+    if worked != [int(day) for day in constraints if day.isdigit()]:
+        print(f"❌ workDays before the edit {worked} should be the locked ones")
+        failures += 1
+
+    # Every chromosome kept for the next warm start is repaired too
+    stray = sum(1 for genes in result["finalPopulation"] for day in off_days if genes[day] != 0)
+    print(f"✓ Final population genes working a locked day off: {stray}")
+    if stray:
+        failures += 1
+
+    print("=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All warm-start checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())